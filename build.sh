@@ -1 +1 @@
-python3 src/main.py "https://mr-rafael.github.io/static-site-generator/"
\ No newline at end of file
+python3 src/main.py "https://mr-rafael.github.io/static-site-generator/" --sitemap --listing blog
\ No newline at end of file
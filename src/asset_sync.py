@@ -0,0 +1,124 @@
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+from manifest import hash_file, is_output_path, remove_output
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+FICLONE = 0x40049409
+LINK_MODES = ["auto", "copy", "hardlink", "reflink"]
+DEFAULT_ASSET_WORKERS = 8
+reflink_unsupported_devices = set()
+
+def find_assets(source_directory, destination_directory):
+    assets = []
+    directories = [source_directory]
+    while directories:
+        directory = directories.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    directories.append(entry.path)
+                elif entry.is_file():
+                    destination_path = os.path.join(destination_directory, os.path.relpath(entry.path, source_directory))
+                    assets.append((entry.path, destination_path, entry.stat()))
+    return sorted(assets, key=lambda asset: asset[0])
+
+def is_asset_current(source_path, destination_path, source_stat, compare_hash=False):
+    try:
+        destination_stat = os.stat(destination_path)
+    except FileNotFoundError:
+        return False
+    if source_stat.st_ino == destination_stat.st_ino and source_stat.st_dev == destination_stat.st_dev:
+        return True
+    if source_stat.st_size != destination_stat.st_size:
+        return False
+    if source_stat.st_mtime_ns == destination_stat.st_mtime_ns:
+        return True
+    if compare_hash and hash_file(source_path) == hash_file(destination_path):
+        os.utime(destination_path, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+        return True
+    return False
+
+def reflink_file(source_path, destination_path):
+    if fcntl is None:
+        raise OSError("reflinks are not supported on this platform")
+    with(open(source_path, 'rb') as source_file):
+        with(open(destination_path, 'wb') as destination_file):
+            fcntl.ioctl(destination_file.fileno(), FICLONE, source_file.fileno())
+
+def copy_file_range_file(source_path, destination_path):
+    if not hasattr(os, "copy_file_range"):
+        shutil.copyfile(source_path, destination_path)
+        return
+    with(open(source_path, 'rb') as source_file):
+        with(open(destination_path, 'wb') as destination_file):
+            remaining = os.fstat(source_file.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(source_file.fileno(), destination_file.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+
+def copy_asset(source_path, destination_path, link_mode="auto"):
+    os.makedirs(os.path.dirname(destination_path) or ".", exist_ok=True)
+    temporary_path = f"{destination_path}.{os.getpid()}.tmp"
+    if link_mode == "hardlink":
+        try:
+            os.link(source_path, temporary_path)
+            os.replace(temporary_path, destination_path)
+            return "hardlink"
+        except OSError:
+            remove_temporary_file(temporary_path)
+    method = "copy"
+    destination_device = os.stat(os.path.dirname(destination_path) or ".").st_dev
+    if link_mode in ("auto", "reflink") and destination_device not in reflink_unsupported_devices:
+        try:
+            reflink_file(source_path, temporary_path)
+            method = "reflink"
+        except OSError:
+            reflink_unsupported_devices.add(destination_device)
+            remove_temporary_file(temporary_path)
+    if method == "copy":
+        try:
+            copy_file_range_file(source_path, temporary_path)
+        except OSError:
+            remove_temporary_file(temporary_path)
+            shutil.copyfile(source_path, temporary_path)
+    shutil.copystat(source_path, temporary_path)
+    os.replace(temporary_path, destination_path)
+    return method
+
+def remove_temporary_file(path):
+    if os.path.lexists(path):
+        os.remove(path)
+
+def sync_asset(asset, link_mode, compare_hash):
+    source_path, destination_path, source_stat = asset
+    if is_asset_current(source_path, destination_path, source_stat, compare_hash):
+        return None
+    return copy_asset(source_path, destination_path, link_mode)
+
+def sync_assets(source_directory, destination_directory, previous_outputs=(), link_mode="auto", workers=DEFAULT_ASSET_WORKERS, compare_hash=False, destinations=None):
+    assets = find_assets(source_directory, destination_directory)
+    if destinations is not None:
+        assets = [(source_path, destinations[source_path], source_stat) for source_path, _, source_stat in assets if source_path in destinations]
+    outputs = {}
+    copied = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(lambda asset: sync_asset(asset, link_mode, compare_hash), assets)
+        for asset, method in zip(assets, results):
+            outputs[asset[0]] = asset[1]
+            if method is not None:
+                copied.append((asset[0], asset[1], method))
+    current_outputs = set(outputs.values())
+    removed = []
+    for output_path in sorted(set(previous_outputs)):
+        if output_path not in current_outputs and is_output_path(output_path, destination_directory) and os.path.isfile(output_path):
+            remove_output(output_path, destination_directory)
+            removed.append(output_path)
+    return outputs, copied, removed
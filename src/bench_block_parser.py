@@ -0,0 +1,39 @@
+import argparse
+import random
+import timeit
+
+from benchmark import generate_markdown_page
+from markdown_parser import block_to_block_type, block_to_block_type_legacy, markdown_to_blocks, markdown_to_blocks_legacy
+
+SETTINGS = {
+    "pages": 1000,
+    "link_density": 0.05,
+    "image_density": 0.01,
+    "list_length": 8,
+    "code_lines": 12,
+}
+
+def split_and_classify(markdown_content):
+    return [(block, block_to_block_type(block)) for block in markdown_to_blocks(markdown_content)]
+
+def split_and_classify_legacy(markdown_content):
+    return [(block, block_to_block_type_legacy(block)) for block in markdown_to_blocks_legacy(markdown_content)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the block splitter and classifier with the legacy implementation.")
+    parser.add_argument("--blocks", type=int, nargs="+", default=[1000, 5000, 20000], help="blocks per document")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=3)
+    arguments = parser.parse_args()
+
+    print(f"{'blocks':>8} {'KB':>8} {'legacy (ms)':>12} {'linear (ms)':>12} {'speedup':>8}")
+    for block_count in arguments.blocks:
+        markdown_content = generate_markdown_page(random.Random(1), dict(SETTINGS, blocks=block_count), 0)
+        if split_and_classify(markdown_content) != split_and_classify_legacy(markdown_content):
+            raise ValueError(f"Block parsers disagree on a document with {block_count} blocks.")
+        legacy = min(timeit.repeat(lambda: split_and_classify_legacy(markdown_content), repeat=arguments.repeat, number=arguments.number)) / arguments.number
+        linear = min(timeit.repeat(lambda: split_and_classify(markdown_content), repeat=arguments.repeat, number=arguments.number)) / arguments.number
+        print(f"{block_count:>8} {len(markdown_content) / 1024:>8.0f} {legacy * 1000:>12.2f} {linear * 1000:>12.2f} {legacy / linear:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
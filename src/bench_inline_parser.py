@@ -0,0 +1,40 @@
+import argparse
+import timeit
+from markdown_parser import INLINE_PARSERS
+
+def build_link_dense_paragraph(link_count):
+    parts = []
+    for i in range(0, link_count):
+        parts.append(f"Some **bold {i}** text with a [link number {i}](/pages/{i}) and ")
+        if i % 4 == 0:
+            parts.append(f"an ![image {i}](/images/{i}.png) plus `code {i}` and ")
+    parts.append("a closing _italic_ sentence.")
+    return "".join(parts)
+
+def benchmark_parsers(text, repeat, number):
+    results = {name: None for name in INLINE_PARSERS}
+    for _ in range(0, repeat):
+        for name, parser in INLINE_PARSERS.items():
+            timing = timeit.timeit(lambda: parser(text), number=number) / number
+            if results[name] is None or timing < results[name]:
+                results[name] = timing
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the inline markdown parsers on link-dense paragraphs.")
+    parser.add_argument("--links", type=int, nargs="+", default=[10, 100, 1000, 5000], help="links per paragraph")
+    parser.add_argument("--repeat", type=int, default=9)
+    parser.add_argument("--number", type=int, default=3)
+    arguments = parser.parse_args()
+
+    print(f"{'links':>8} {'chars':>9} {'legacy (ms)':>12} {'scanner (ms)':>13} {'speedup':>8}")
+    for link_count in arguments.links:
+        text = build_link_dense_paragraph(link_count)
+        if INLINE_PARSERS["scanner"](text) != INLINE_PARSERS["legacy"](text):
+            raise ValueError(f"Inline parsers disagree on a paragraph with {link_count} links.")
+        results = benchmark_parsers(text, arguments.repeat, arguments.number)
+        speedup = results["legacy"] / results["scanner"]
+        print(f"{link_count:>8} {len(text):>9} {results['legacy'] * 1000:>12.3f} {results['scanner'] * 1000:>13.3f} {speedup:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
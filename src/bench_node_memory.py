@@ -0,0 +1,72 @@
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from benchmark import generate_markdown_page
+from htmlnode import LeafNode, ParentNode
+from markdown_parser import markdown_to_html_node, parse_inline_markdown_text
+from textnode import TextNode, TextType
+
+SETTINGS = {
+    "pages": 1000,
+    "blocks": 2000,
+    "link_density": 0.05,
+    "image_density": 0.01,
+    "list_length": 6,
+    "code_lines": 12,
+}
+
+def measure_allocations(build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    duration = time.perf_counter() - start
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    statistics = snapshot.statistics("filename")
+    allocated_bytes = sum(statistic.size for statistic in statistics)
+    allocated_blocks = sum(statistic.count for statistic in statistics)
+    return result, allocated_bytes, allocated_blocks, duration
+
+def count_nodes(node):
+    if node.children is None:
+        return 1
+    return 1 + sum(count_nodes(child) for child in node.children)
+
+def measure_per_node(name, build, count):
+    nodes, allocated_bytes, allocated_blocks, _ = measure_allocations(lambda: [build(i) for i in range(0, count)])
+    print(f"{name:<12} {allocated_bytes / count:>10.1f} bytes/node {allocated_blocks / count:>8.2f} blocks/node")
+    return nodes
+
+def measure_gc(nodes):
+    start = time.perf_counter()
+    gc.collect()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure node footprint and allocations when parsing a large document.")
+    parser.add_argument("--blocks", type=int, default=SETTINGS["blocks"], help="blocks in the generated document")
+    parser.add_argument("--nodes", type=int, default=100000, help="nodes created per class for the footprint table")
+    arguments = parser.parse_args()
+
+    print("Per-node footprint (including attribute storage, excluding shared strings):")
+    measure_per_node("TextNode", lambda i: TextNode("text", TextType.TEXT), arguments.nodes)
+    measure_per_node("LeafNode", lambda i: LeafNode(tag="b", value="text"), arguments.nodes)
+    leaf_node = LeafNode(value="text")
+    measure_per_node("ParentNode", lambda i: ParentNode(tag="p", children=[leaf_node]), arguments.nodes)
+
+    settings = dict(SETTINGS, blocks=arguments.blocks)
+    markdown_content = generate_markdown_page(random.Random(1), settings, 0)
+    root_node, allocated_bytes, allocated_blocks, duration = measure_allocations(lambda: markdown_to_html_node(markdown_content))
+    node_count = count_nodes(root_node)
+    print(f"Document of {len(markdown_content) / 1024:.0f} KB: {node_count} HTML nodes, "
+        f"{allocated_bytes / (1024 * 1024):.2f} MB and {allocated_blocks} blocks retained, parsed in {duration * 1000:.1f} ms")
+    _, inline_bytes, inline_blocks, _ = measure_allocations(lambda: [parse_inline_markdown_text(line) for line in markdown_content.split("\n") if line and not line.startswith("```")])
+    print(f"Inline TextNodes for every line: {inline_bytes / (1024 * 1024):.2f} MB in {inline_blocks} blocks")
+    print(f"Full gc.collect() with the tree alive: {measure_gc(root_node) * 1000:.2f} ms")
+
+if __name__ == "__main__":
+    main()
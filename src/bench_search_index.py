@@ -0,0 +1,99 @@
+import argparse
+import gzip
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from benchmark import generate_corpus
+from manifest import hash_file
+from markdown_parser import markdown_to_html_node
+from search_index import SEARCH_DIRECTORY, build_search_index
+
+SETTINGS = {
+    "seed": 1,
+    "blocks": 40,
+    "link_density": 0.05,
+    "image_density": 0.01,
+    "list_length": 8,
+    "code_lines": 12,
+}
+SYLLABLES = ["an", "bel", "cor", "dur", "el", "fin", "gal", "hir", "ith", "lor", "mir", "nen", "or", "ras", "sil", "tur", "ul", "val", "wen", "yar"]
+
+def create_vocabulary(size):
+    return ["".join(SYLLABLES[(index // len(SYLLABLES) ** power) % len(SYLLABLES)] for power in range(0, 3)) for index in range(0, size)]
+
+def add_vocabulary(page_paths, vocabulary, words_per_page, seed):
+    rng = random.Random(seed)
+    for page_path in page_paths:
+        words = [vocabulary[min(int(rng.paretovariate(1.0)) - 1, len(vocabulary) - 1)] for _ in range(0, words_per_page)]
+        with(open(page_path, 'a') as page_file):
+            page_file.write("\n" + " ".join(words) + ".\n")
+
+def hash_pages(page_paths, content_directory, output_directory):
+    page_sources = {}
+    for page_path in page_paths:
+        destination_path = os.path.join(output_directory, os.path.relpath(page_path, content_directory)).replace(".md", ".html")
+        page_sources[page_path] = (hash_file(page_path), destination_path)
+    return page_sources
+
+def measure_index(search_directory):
+    total_size = 0
+    compressed_size = 0
+    largest_size = 0
+    for name in os.listdir(search_directory):
+        with(open(os.path.join(search_directory, name), 'rb') as index_file):
+            data = index_file.read()
+        total_size += len(data)
+        compressed_size += len(gzip.compress(data))
+        if name.startswith("index-"):
+            largest_size = max(largest_size, len(data))
+    return total_size, compressed_size, largest_size
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the size of the search index and the time it adds to a build.")
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--vocabulary", type=int, default=5000, help="synthetic words added to the benchmark corpus")
+    parser.add_argument("--words", type=int, default=200, help="synthetic words added to every page")
+    parser.add_argument("--changed", type=int, default=10, help="pages edited before the incremental update")
+    parser.add_argument("--shards", type=int, nargs="+", default=[16, 64, 256])
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        page_paths, _ = generate_corpus(directory, dict(SETTINGS, pages=arguments.pages))
+        add_vocabulary(page_paths, create_vocabulary(arguments.vocabulary), arguments.words, SETTINGS["seed"])
+        content_directory = os.path.join(directory, "content")
+        output_directory = os.path.join(directory, "docs")
+        state_path = os.path.join(directory, "search.json")
+
+        start = time.perf_counter()
+        for page_path in page_paths:
+            with(open(page_path, 'r') as page_file):
+                markdown_to_html_node(page_file.read()).to_html()
+        render_time = time.perf_counter() - start
+        print(f"{arguments.pages} pages rendered to HTML in {render_time * 1000:.0f} ms")
+
+        print(f"{'shards':>7} {'KB':>8} {'gzip KB':>8} {'max shard KB':>13} {'B/page':>7} {'cold (ms)':>10} {'overhead':>9} {'update (ms)':>12} {'files':>6}")
+        for shards in arguments.shards:
+            shutil.rmtree(output_directory, ignore_errors=True)
+            if os.path.exists(state_path):
+                os.remove(state_path)
+            page_sources = hash_pages(page_paths, content_directory, output_directory)
+            start = time.perf_counter()
+            build_search_index(page_sources, output_directory, state_path, shards)
+            cold_time = time.perf_counter() - start
+            total_size, compressed_size, largest_size = measure_index(os.path.join(output_directory, SEARCH_DIRECTORY))
+
+            for page_path in random.Random(shards).sample(page_paths, min(arguments.changed, len(page_paths))):
+                with(open(page_path, 'a') as page_file):
+                    page_file.write(f"\nEdited for the {shards} shard run.\n")
+            page_sources = hash_pages(page_paths, content_directory, output_directory)
+            start = time.perf_counter()
+            _, written, _, _ = build_search_index(page_sources, output_directory, state_path, shards)
+            update_time = time.perf_counter() - start
+            print(f"{shards:>7} {total_size / 1024:>8.0f} {compressed_size / 1024:>8.0f} {largest_size / 1024:>13.1f} {total_size / arguments.pages:>7.0f} "
+                f"{cold_time * 1000:>10.0f} {cold_time / render_time:>8.0%} {update_time * 1000:>12.1f} {len(written):>6}")
+
+if __name__ == "__main__":
+    main()
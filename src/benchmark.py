@@ -0,0 +1,248 @@
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from htmlnode import ParentNode
+from markdown_parser import (INLINE_PARSERS, BlockType, block_to_block_type, clear_memos, create_html_node, extract_title, get_inline_parser,
+    markdown_to_blocks, parse_inline_markdown_text, remove_empty_strings, set_inline_parser)
+from patterns import ORDERED_LIST_ITEM_PATTERN
+from template import Template
+
+STAGES = ["read", "markdown_to_blocks", "block_to_block_type", "inline_parsing", "html_tree", "to_html", "template", "write"]
+TEMPLATE = """<!doctype html>
+<html>
+  <head>
+    <title>{{ Title }}</title>
+    <link href="/index.css" rel="stylesheet" />
+  </head>
+  <body>
+    <article>{{ Content }}</article>
+  </body>
+</html>"""
+WORDS = ["tolkien", "hobbit", "ring", "shire", "elven", "mountain", "river", "journey", "ancient", "song",
+    "shadow", "light", "forest", "tower", "council", "dwarf", "wizard", "road", "gate", "star"]
+
+def generate_sentence(rng, settings):
+    parts = []
+    for _ in range(0, rng.randint(8, 20)):
+        roll = rng.random()
+        word = rng.choice(WORDS)
+        if roll < settings["link_density"]:
+            parts.append(f"[{word} page](/pages/{rng.randint(0, settings['pages'])})")
+        elif roll < settings["link_density"] + settings["image_density"]:
+            parts.append(f"![{word} image](/images/{word}.png)")
+        elif roll < 0.9:
+            parts.append(word)
+        elif roll < 0.94:
+            parts.append(f"**{word}**")
+        elif roll < 0.97:
+            parts.append(f"_{word}_")
+        else:
+            parts.append(f"`{word}`")
+    return " ".join(parts).capitalize() + "."
+
+def generate_block(rng, settings, block_type):
+    match block_type:
+        case BlockType.HEADING:
+            return f"{'#' * rng.randint(2, 4)} {generate_sentence(rng, settings)}"
+        case BlockType.PARAGRAPH:
+            return "\n".join(generate_sentence(rng, settings) for _ in range(0, rng.randint(1, 4)))
+        case BlockType.QUOTE:
+            return "\n".join(f"> {generate_sentence(rng, settings)}" for _ in range(0, rng.randint(1, 3)))
+        case BlockType.UNORDERED_LIST:
+            return "\n".join(f"- {generate_sentence(rng, settings)}" for _ in range(0, settings["list_length"]))
+        case BlockType.ORDERED_LIST:
+            return "\n".join(f"{i + 1}. {generate_sentence(rng, settings)}" for i in range(0, settings["list_length"]))
+        case BlockType.CODE:
+            code_lines = [f"    {rng.choice(WORDS)} = {rng.choice(WORDS)}({i})" for i in range(0, settings["code_lines"])]
+            return "```\n" + "\n".join(code_lines) + "\n```"
+
+def generate_markdown_page(rng, settings, page_number):
+    blocks = [f"# Page {page_number}: {rng.choice(WORDS).capitalize()}"]
+    block_types = [BlockType.PARAGRAPH] * 5 + [BlockType.HEADING] * 2 + [BlockType.QUOTE, BlockType.UNORDERED_LIST, BlockType.ORDERED_LIST, BlockType.CODE]
+    for _ in range(0, settings["blocks"]):
+        blocks.append(generate_block(rng, settings, rng.choice(block_types)))
+    return "\n\n".join(blocks) + "\n"
+
+def generate_corpus(directory, settings):
+    rng = random.Random(settings["seed"])
+    content_directory = os.path.join(directory, "content")
+    page_paths = []
+    for page_number in range(0, settings["pages"]):
+        page_path = os.path.join(content_directory, "pages", str(page_number), "index.md")
+        os.makedirs(os.path.dirname(page_path), exist_ok=True)
+        with(open(page_path, 'w') as page_file):
+            page_file.write(generate_markdown_page(rng, settings, page_number))
+        page_paths.append(page_path)
+    template_path = os.path.join(directory, "template.html")
+    with(open(template_path, 'w') as template_file):
+        template_file.write(TEMPLATE)
+    return page_paths, template_path
+
+def get_inline_texts(block, block_type):
+    if block_type == BlockType.PARAGRAPH:
+        return [block]
+    if block_type == BlockType.UNORDERED_LIST:
+        return block[2:].split("\n- ")
+    if block_type == BlockType.ORDERED_LIST:
+        return remove_empty_strings(ORDERED_LIST_ITEM_PATTERN.split(block))
+    return []
+
+def benchmark_page(page_path, output_path, template, base_path, timings):
+    start = time.perf_counter()
+    with(open(page_path, 'r') as page_file):
+        markdown_content = page_file.read()
+    timings["read"] += time.perf_counter() - start
+
+    start = time.perf_counter()
+    blocks = markdown_to_blocks(markdown_content)
+    timings["markdown_to_blocks"] += time.perf_counter() - start
+
+    start = time.perf_counter()
+    block_types = [block_to_block_type(block) for block in blocks]
+    timings["block_to_block_type"] += time.perf_counter() - start
+
+    clear_memos()
+    start = time.perf_counter()
+    for block, block_type in zip(blocks, block_types):
+        for text in get_inline_texts(block, block_type):
+            parse_inline_markdown_text(text)
+    timings["inline_parsing"] += time.perf_counter() - start
+
+    clear_memos()
+    start = time.perf_counter()
+    html_node = ParentNode(tag="div", children=[create_html_node(block, block_type) for block, block_type in zip(blocks, block_types)])
+    timings["html_tree"] += time.perf_counter() - start
+
+    start = time.perf_counter()
+    html_string = html_node.to_html()
+    timings["to_html"] += time.perf_counter() - start
+
+    start = time.perf_counter()
+    page_buffer = io.StringIO()
+    template.render(page_buffer, {"Title": extract_title(markdown_content), "Content": html_string}, base_path)
+    page_string = page_buffer.getvalue()
+    timings["template"] += time.perf_counter() - start
+
+    start = time.perf_counter()
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with(open(output_path, 'w') as output_file):
+        output_file.write(page_string)
+    timings["write"] += time.perf_counter() - start
+    return len(markdown_content)
+
+def run_benchmark(settings, corpus_directory):
+    page_paths, template_path = generate_corpus(corpus_directory, settings)
+    with(open(template_path, 'r') as template_file):
+        template = Template(template_file.read())
+    output_directory = os.path.join(corpus_directory, "docs")
+    best_timings = None
+    total_bytes = 0
+    for _ in range(0, settings["repeat"]):
+        timings = {stage: 0.0 for stage in STAGES}
+        total_bytes = 0
+        for page_path in page_paths:
+            output_path = os.path.join(output_directory, os.path.relpath(page_path, os.path.join(corpus_directory, "content"))).replace(".md", ".html")
+            total_bytes += benchmark_page(page_path, output_path, template, settings["base_path"], timings)
+        if best_timings is None or sum(timings.values()) < sum(best_timings.values()):
+            best_timings = timings
+    return {
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "inline_parser": get_inline_parser(),
+        "settings": settings,
+        "markdown_bytes": total_bytes,
+        "total_seconds": sum(best_timings.values()),
+        "stages": {stage: {"seconds": best_timings[stage], "ms_per_page": best_timings[stage] * 1000 / settings["pages"]} for stage in STAGES},
+    }
+
+def get_commit():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+def compare_results(results, baseline, threshold):
+    regressions = []
+    print(f"{'stage':<22} {'baseline (s)':>13} {'current (s)':>12} {'change':>8}")
+    for stage in STAGES + ["total"]:
+        if stage == "total":
+            before, after = baseline["total_seconds"], results["total_seconds"]
+        elif stage in baseline["stages"]:
+            before, after = baseline["stages"][stage]["seconds"], results["stages"][stage]["seconds"]
+        else:
+            continue
+        change = (after - before) / before if before > 0 else 0.0
+        print(f"{stage:<22} {before:>13.4f} {after:>12.4f} {change:>+7.1%}")
+        if change > threshold:
+            regressions.append(stage)
+    return regressions
+
+def print_results(results):
+    print(f"{results['settings']['pages']} pages, {results['markdown_bytes'] / 1024:.0f} KB of markdown, commit {results['commit']}")
+    print(f"{'stage':<22} {'seconds':>9} {'ms/page':>9} {'share':>7}")
+    for stage in STAGES:
+        stage_result = results["stages"][stage]
+        share = stage_result["seconds"] / results["total_seconds"] if results["total_seconds"] > 0 else 0.0
+        print(f"{stage:<22} {stage_result['seconds']:>9.4f} {stage_result['ms_per_page']:>9.3f} {share:>7.1%}")
+    print(f"{'total':<22} {results['total_seconds']:>9.4f}")
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description="Benchmark each build stage on a synthetic markdown corpus.")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--blocks", type=int, default=30, help="blocks per page")
+    parser.add_argument("--link-density", type=float, default=0.05, help="fraction of inline tokens that are links")
+    parser.add_argument("--image-density", type=float, default=0.01, help="fraction of inline tokens that are images")
+    parser.add_argument("--list-length", type=int, default=6)
+    parser.add_argument("--code-lines", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3, help="keep the fastest of this many runs")
+    parser.add_argument("--base-path", default="/")
+    parser.add_argument("--inline-parser", choices=sorted(INLINE_PARSERS), default="scanner")
+    parser.add_argument("--corpus", help="generate the corpus here and keep it instead of using a temporary directory")
+    parser.add_argument("--json", help="write machine-readable results to this file")
+    parser.add_argument("--compare", help="compare against results previously written with --json")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative slowdown reported as a regression by --compare")
+    return parser.parse_args(argv)
+
+def main():
+    arguments = parse_arguments(sys.argv[1:])
+    set_inline_parser(arguments.inline_parser)
+    settings = {
+        "pages": arguments.pages,
+        "blocks": arguments.blocks,
+        "link_density": arguments.link_density,
+        "image_density": arguments.image_density,
+        "list_length": arguments.list_length,
+        "code_lines": arguments.code_lines,
+        "seed": arguments.seed,
+        "repeat": arguments.repeat,
+        "base_path": arguments.base_path,
+    }
+    if arguments.corpus is not None:
+        results = run_benchmark(settings, arguments.corpus)
+    else:
+        with tempfile.TemporaryDirectory() as corpus_directory:
+            results = run_benchmark(settings, corpus_directory)
+    print_results(results)
+    if arguments.json is not None:
+        with(open(arguments.json, 'w') as json_file):
+            json.dump(results, json_file, indent=2)
+    if arguments.compare is not None:
+        with(open(arguments.compare, 'r') as baseline_file):
+            baseline = json.load(baseline_file)
+        regressions = compare_results(results, baseline, arguments.threshold)
+        if regressions:
+            print(f"Regressions above {arguments.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
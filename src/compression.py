@@ -0,0 +1,93 @@
+import gzip
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from manifest import hash_file, is_output_path, remove_output
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (".html", ".htm", ".css", ".js", ".mjs", ".json", ".xml", ".svg", ".txt", ".map", ".webmanifest", ".ico")
+DEFAULT_COMPRESSION_THRESHOLD = 1024
+DEFAULT_COMPRESSION_WORKERS = os.cpu_count() or 1
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+def get_compression_formats():
+    if brotli is None:
+        return [".gz"]
+    return [".gz", ".br"]
+
+def get_compression_settings():
+    return f"gzip-{GZIP_LEVEL}" if brotli is None else f"gzip-{GZIP_LEVEL},brotli-{BROTLI_QUALITY}"
+
+def compress_data(data, extension):
+    if extension == ".gz":
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    return brotli.compress(data, quality=BROTLI_QUALITY)
+
+def is_compressible(path, threshold=DEFAULT_COMPRESSION_THRESHOLD):
+    if os.path.splitext(path)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+        return False
+    try:
+        return os.path.getsize(path) >= threshold
+    except FileNotFoundError:
+        return False
+
+def get_compressed_paths(path):
+    return [f"{path}{extension}" for extension in get_compression_formats()]
+
+def write_compressed_file(path, data):
+    try:
+        with(open(path, 'rb') as compressed_file):
+            if compressed_file.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with(open(temporary_path, 'wb') as compressed_file):
+        compressed_file.write(data)
+    os.replace(temporary_path, path)
+    return True
+
+def compress_output(path, previous_hash=None):
+    source_hash = hash_file(path)
+    compressed_paths = get_compressed_paths(path)
+    if source_hash == previous_hash and all(os.path.isfile(compressed_path) for compressed_path in compressed_paths):
+        return source_hash, []
+    with(open(path, 'rb') as source_file):
+        data = source_file.read()
+    written = []
+    for compressed_path in compressed_paths:
+        if write_compressed_file(compressed_path, compress_data(data, os.path.splitext(compressed_path)[1])):
+            written.append(compressed_path)
+    return source_hash, written
+
+def compress_outputs(paths, output_directory, previous_record=None, threshold=DEFAULT_COMPRESSION_THRESHOLD, workers=DEFAULT_COMPRESSION_WORKERS):
+    previous_record = previous_record or {"settings": None, "files": {}}
+    previous_files = previous_record["files"] if previous_record["settings"] == get_compression_settings() else {}
+    paths = sorted(set(path for path in paths if is_compressible(path, threshold)))
+    record = {"settings": get_compression_settings(), "files": {}}
+    written = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for path, (source_hash, compressed_paths) in zip(paths, executor.map(lambda path: compress_output(path, previous_files.get(path)), paths)):
+            record["files"][path] = source_hash
+            written.extend(compressed_paths)
+    removed = []
+    for path in sorted(previous_record["files"]):
+        for extension in (".gz", ".br"):
+            compressed_path = f"{path}{extension}"
+            if path in record["files"] and extension in get_compression_formats():
+                continue
+            if is_output_path(compressed_path, output_directory) and os.path.isfile(compressed_path):
+                remove_output(compressed_path, output_directory)
+                removed.append(compressed_path)
+    return record, written, removed
+
+def find_compressed_outputs(record):
+    compressed_outputs = []
+    for path in record["files"]:
+        compressed_outputs.extend(get_compressed_paths(path))
+    return compressed_outputs
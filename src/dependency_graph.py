@@ -0,0 +1,118 @@
+import json
+import os
+import posixpath
+
+from markdown_parser import extract_markdown_images, extract_markdown_links
+
+GRAPH_VERSION = 1
+EXTERNAL_PREFIXES = ("//", "#", "mailto:", "tel:", "data:", "javascript:")
+
+def new_dependency_graph():
+    return {"version": GRAPH_VERSION, "template": None, "pages": {}, "assets": {}}
+
+def load_dependency_graph(path):
+    if not os.path.isfile(path):
+        return new_dependency_graph()
+    try:
+        with(open(path, 'r') as graph_file):
+            graph = json.load(graph_file)
+    except (OSError, ValueError):
+        return new_dependency_graph()
+    if not isinstance(graph, dict) or graph.get("version") != GRAPH_VERSION:
+        return new_dependency_graph()
+    return graph
+
+def save_dependency_graph(path, graph):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temporary_path = f"{path}.tmp"
+    with(open(temporary_path, 'w') as graph_file):
+        json.dump(graph, graph_file, indent=1, sort_keys=True)
+    os.replace(temporary_path, path)
+
+def extract_page_references(markdown_content):
+    references = set()
+    for _, url in extract_markdown_links(markdown_content):
+        references.add(("link", url))
+    for _, url in extract_markdown_images(markdown_content):
+        references.add(("image", url))
+    return sorted(references)
+
+def get_internal_url_path(url):
+    url = url.strip()
+    if len(url) == 0 or url.startswith(EXTERNAL_PREFIXES) or "://" in url:
+        return None
+    return url.split("#", 1)[0].split("?", 1)[0]
+
+def resolve_reference(url, page_output, output_directory, outputs):
+    url_path = get_internal_url_path(url)
+    if url_path is None:
+        return None
+    if url_path.startswith("/"):
+        relative_path = url_path.lstrip("/")
+    else:
+        page_directory = posixpath.dirname(os.path.relpath(page_output, output_directory).replace(os.sep, "/"))
+        relative_path = posixpath.join(page_directory, url_path)
+    relative_path = posixpath.normpath(relative_path) if relative_path else "."
+    candidates = [relative_path, f"{relative_path}.html", posixpath.join(relative_path, "index.html")]
+    for candidate in candidates:
+        output_path = os.path.normpath(os.path.join(output_directory, candidate))
+        if output_path in outputs:
+            return outputs[output_path]
+    return ""
+
+def update_dependency_graph(graph, page_sources, asset_outputs, template_path, output_directory, generated_outputs=()):
+    updated_graph = new_dependency_graph()
+    updated_graph["template"] = template_path
+    updated_graph["assets"] = dict(asset_outputs)
+    outputs = {os.path.normpath(output_path): output_path for output_path in generated_outputs}
+    for asset_path, destination_path in asset_outputs.items():
+        outputs[os.path.normpath(destination_path)] = asset_path
+    for page_path, (_, destination_path) in page_sources.items():
+        outputs[os.path.normpath(destination_path)] = page_path
+    for page_path, (source_hash, destination_path) in sorted(page_sources.items()):
+        previous_entry = graph["pages"].get(page_path)
+        if previous_entry is not None and previous_entry["hash"] == source_hash:
+            references = [(kind, url) for kind, url, _ in previous_entry["references"]]
+        else:
+            with(open(page_path, 'r') as markdown_file):
+                references = extract_page_references(markdown_file.read())
+        updated_graph["pages"][page_path] = {
+            "hash": source_hash,
+            "output": destination_path,
+            "references": [[kind, url, resolve_reference(url, destination_path, output_directory, outputs)] for kind, url in references],
+        }
+    return updated_graph
+
+def find_dependencies(graph, page_path):
+    entry = graph["pages"].get(page_path)
+    if entry is None:
+        return []
+    dependencies = set(target for _, _, target in entry["references"] if target)
+    if graph["template"] is not None:
+        dependencies.add(graph["template"])
+    return sorted(dependencies)
+
+def find_dependents(graph, path):
+    path = os.path.normpath(path)
+    for source_path, output_path in list(graph["assets"].items()) + [(page_path, entry["output"]) for page_path, entry in graph["pages"].items()]:
+        if os.path.normpath(output_path) == path:
+            path = os.path.normpath(source_path)
+    if graph["template"] is not None and os.path.normpath(graph["template"]) == path:
+        return sorted(graph["pages"])
+    dependents = []
+    for page_path, entry in sorted(graph["pages"].items()):
+        if any(target and os.path.normpath(target) == path for _, _, target in entry["references"]):
+            dependents.append(page_path)
+    return dependents
+
+def find_referencing_pages(graph, urls):
+    urls = set(urls)
+    return sorted(page_path for page_path, entry in graph["pages"].items() if any(url in urls for _, url, _ in entry["references"]))
+
+def find_broken_links(graph):
+    broken_links = []
+    for page_path, entry in sorted(graph["pages"].items()):
+        for kind, url, target in entry["references"]:
+            if target == "":
+                broken_links.append((page_path, kind, url))
+    return broken_links
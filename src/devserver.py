@@ -0,0 +1,91 @@
+import functools
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+LIVE_RELOAD_PATH = "/__livereload"
+LIVE_RELOAD_SCRIPT = f'<script>new EventSource("{LIVE_RELOAD_PATH}").onmessage = function() {{ location.reload(); }};</script>'
+KEEPALIVE_SECONDS = 15
+
+class LiveReloadState:
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.version = 0
+
+    def notify_reload(self):
+        with self.condition:
+            self.version += 1
+            self.condition.notify_all()
+
+    def wait_for_reload(self, version, timeout):
+        with self.condition:
+            self.condition.wait_for(lambda: self.version != version, timeout=timeout)
+            return self.version
+
+class DevRequestHandler(SimpleHTTPRequestHandler):
+    def __init__(self, *args, live_reload_state=None, **kwargs):
+        self.live_reload_state = live_reload_state
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        if self.path == LIVE_RELOAD_PATH and self.live_reload_state is not None:
+            self.stream_reload_events()
+            return
+        html_path = self.find_html_path()
+        if html_path is None or self.live_reload_state is None:
+            super().do_GET()
+            return
+        with(open(html_path, 'rb') as html_file):
+            html_bytes = inject_live_reload(html_file.read())
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(html_bytes)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(html_bytes)
+
+    def find_html_path(self):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            if not self.path.split("?", 1)[0].endswith("/"):
+                return None
+            path = os.path.join(path, "index.html")
+        if path.endswith(".html") and os.path.isfile(path):
+            return path
+        return None
+
+    def stream_reload_events(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        version = self.live_reload_state.version
+        try:
+            while True:
+                new_version = self.live_reload_state.wait_for_reload(version, KEEPALIVE_SECONDS)
+                if new_version != version:
+                    self.wfile.write(b"data: reload\n\n")
+                    version = new_version
+                else:
+                    self.wfile.write(b": keepalive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+    def log_message(self, format, *args):
+        pass
+
+def inject_live_reload(html_bytes):
+    script_bytes = LIVE_RELOAD_SCRIPT.encode("utf-8")
+    closing_index = html_bytes.rfind(b"</body>")
+    if closing_index == -1:
+        return html_bytes + script_bytes
+    return html_bytes[:closing_index] + script_bytes + html_bytes[closing_index:]
+
+def start_server(directory, host, port, live_reload_state=None):
+    handler = functools.partial(DevRequestHandler, directory=directory, live_reload_state=live_reload_state)
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+    return server
@@ -0,0 +1,83 @@
+import fnmatch
+import os
+
+IGNORE_FILE = ".ssgignore"
+
+def load_ignore_patterns(content_directory):
+    ignore_path = os.path.join(content_directory, IGNORE_FILE)
+    if not os.path.isfile(ignore_path):
+        return []
+    patterns = []
+    with(open(ignore_path, 'r') as ignore_file):
+        for line in ignore_file:
+            pattern = line.strip()
+            if len(pattern) == 0 or pattern.startswith("#"):
+                continue
+            patterns.append(parse_ignore_pattern(pattern))
+    return patterns
+
+def parse_ignore_pattern(pattern):
+    negated = pattern.startswith("!")
+    if negated:
+        pattern = pattern[1:]
+    directory_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    anchored = "/" in pattern
+    return (pattern.lstrip("/"), negated, directory_only, anchored)
+
+def is_ignored(relative_path, is_directory, patterns):
+    ignored = False
+    name = relative_path.rsplit("/", 1)[-1]
+    for pattern, negated, directory_only, anchored in patterns:
+        if directory_only and not is_directory:
+            continue
+        if fnmatch.fnmatchcase(relative_path if anchored else name, pattern):
+            ignored = not negated
+    return ignored
+
+def is_page_ignored(source_path, content_directory, patterns):
+    relative_path = os.path.relpath(source_path, content_directory).replace(os.sep, "/")
+    parts = relative_path.split("/")
+    for i in range(1, len(parts)):
+        if is_ignored("/".join(parts[:i]), True, patterns):
+            return True
+    return is_ignored(relative_path, False, patterns)
+
+def get_page_destination(source_path, content_directory, destination_directory):
+    relative_path = os.path.relpath(source_path, content_directory)
+    return os.path.join(destination_directory, f"{relative_path[:-len('.md')]}.html")
+
+def get_page_url(destination_path, destination_directory):
+    url = "/" + os.path.relpath(destination_path, destination_directory).replace(os.sep, "/")
+    if url.endswith("/index.html"):
+        return url[:-len("index.html")]
+    return url
+
+def discover_pages(content_directory, destination_directory, patterns=None):
+    if patterns is None:
+        patterns = load_ignore_patterns(content_directory)
+    pages = {}
+    visited_directories = set()
+    directories = [(content_directory, "")]
+    while directories:
+        directory, relative_directory = directories.pop()
+        directory_stat = os.stat(directory)
+        directory_key = (directory_stat.st_dev, directory_stat.st_ino)
+        if directory_key in visited_directories:
+            continue
+        visited_directories.add(directory_key)
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                relative_path = f"{relative_directory}{entry.name}"
+                if entry.is_dir():
+                    if not is_ignored(relative_path, True, patterns):
+                        directories.append((entry.path, f"{relative_path}/"))
+                elif entry.is_file() and entry.name.endswith(".md"):
+                    if not is_ignored(relative_path, False, patterns):
+                        pages[entry.path] = get_page_destination(entry.path, content_directory, destination_directory)
+    return sorted(pages.items())
+
+def create_output_directories(pages):
+    for directory in sorted(set(os.path.dirname(destination_path) for _, destination_path in pages)):
+        if directory:
+            os.makedirs(directory, mode=0o777, exist_ok=True)
@@ -0,0 +1,123 @@
+import hashlib
+import os
+import shutil
+
+from markdown_parser import PARSER_VERSION, get_image_attributes_key, get_inline_parser
+
+CACHE_DIRECTORY = ".ssg-cache"
+DEFAULT_CACHE_SIZE = 256 * 1024 * 1024
+FRAGMENT_CHUNK_SIZE = 1 << 16
+
+class CachedFragment:
+    def __init__(self, path):
+        self.path = path
+
+    def iter_html(self):
+        with(open(self.path, 'r') as fragment_file):
+            pending = ""
+            for chunk in iter(lambda: fragment_file.read(FRAGMENT_CHUNK_SIZE), ""):
+                chunk = pending + chunk
+                end = chunk.rfind(">") + 1
+                pending = chunk[end:]
+                if end > 0:
+                    yield chunk[:end]
+            if pending:
+                yield pending
+
+    def to_html(self):
+        with(open(self.path, 'r') as fragment_file):
+            return fragment_file.read()
+
+class DocumentCache:
+    def __init__(self, directory, max_bytes=DEFAULT_CACHE_SIZE):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def get_key(self, markdown_content):
+        digest = hashlib.sha256()
+        digest.update(f"{PARSER_VERSION}:{get_inline_parser()}:{get_image_attributes_key()}:".encode("utf-8"))
+        digest.update(markdown_content.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get_path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.html")
+
+    def get(self, key):
+        path = self.get_path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return CachedFragment(path)
+
+    def store(self, key, html_node):
+        path = self.get_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with(open(temporary_path, 'w') as fragment_file):
+            html_node.write_html(fragment_file)
+        os.replace(temporary_path, path)
+        return CachedFragment(path)
+
+    def get_or_render(self, markdown_content, render):
+        key = self.get_key(markdown_content)
+        fragment = self.get(key)
+        if fragment is None:
+            fragment = self.store(key, render(markdown_content))
+        return fragment
+
+    def list_entries(self):
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for prefix_entry in os.scandir(self.directory):
+            if not prefix_entry.is_dir():
+                continue
+            for entry in os.scandir(prefix_entry.path):
+                if entry.name.endswith(".html"):
+                    try:
+                        entry_stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((entry_stat.st_mtime_ns, entry_stat.st_size, entry.path))
+        return entries
+
+    def get_stats(self):
+        entries = self.list_entries()
+        return len(entries), sum(entry[1] for entry in entries)
+
+    def evict(self):
+        entries = sorted(self.list_entries())
+        total_bytes = sum(entry[1] for entry in entries)
+        evicted = 0
+        for _, size, path in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+            evicted += 1
+        return evicted
+
+    def clear(self):
+        if os.path.isdir(self.directory):
+            shutil.rmtree(self.directory)
+
+document_cache = None
+
+def configure_document_cache(directory, max_bytes=DEFAULT_CACHE_SIZE):
+    global document_cache
+    if directory is None:
+        document_cache = None
+    else:
+        document_cache = DocumentCache(directory, max_bytes)
+
+def get_document_cache():
+    return document_cache
+
+def get_document_cache_settings():
+    if document_cache is None:
+        return (None, DEFAULT_CACHE_SIZE)
+    return (document_cache.directory, document_cache.max_bytes)
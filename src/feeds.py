@@ -0,0 +1,96 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from xml.sax.saxutils import escape, quoteattr
+
+from front_matter import parse_date
+
+SITEMAP_NAME = "sitemap.xml"
+ATOM_FEED_NAME = "atom.xml"
+RSS_FEED_NAME = "rss.xml"
+DEFAULT_FEED_SIZE = 20
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+def get_absolute_url(site_url, url):
+    return site_url.rstrip("/") + url
+
+def get_updated(entry):
+    value = entry.get("updated") or entry.get("date")
+    return parse_date(value) if value else None
+
+def format_timestamp(date):
+    return date.astimezone(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+def find_feed_entries(entries, feed_size=DEFAULT_FEED_SIZE):
+    dated_entries = sorted((entry for entry in entries if entry.get("date")), key=lambda entry: entry["url"])
+    return sorted(dated_entries, key=lambda entry: parse_date(entry["date"]), reverse=True)[:feed_size]
+
+def find_site_title(entries, site_url):
+    for entry in entries:
+        if entry["url"] == "/":
+            return entry["title"]
+    return site_url
+
+def create_sitemap(entries, site_url):
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+    for entry in sorted(entries, key=lambda entry: entry["url"]):
+        updated = get_updated(entry)
+        lastmod = "" if updated is None else f"<lastmod>{format_timestamp(updated)}</lastmod>"
+        lines.append(f"  <url><loc>{escape(get_absolute_url(site_url, entry['url']))}</loc>{lastmod}</url>")
+    lines.append("</urlset>")
+    return "\n".join(lines) + "\n"
+
+def create_atom_feed(entries, site_url, feed_size=DEFAULT_FEED_SIZE):
+    feed_entries = find_feed_entries(entries, feed_size)
+    updated = max([get_updated(entry) for entry in feed_entries], default=EPOCH)
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<feed xmlns="http://www.w3.org/2005/Atom">',
+        f"  <title>{escape(find_site_title(entries, site_url))}</title>",
+        f"  <id>{escape(get_absolute_url(site_url, '/'))}</id>",
+        f"  <link href={quoteattr(get_absolute_url(site_url, '/'))} />",
+        f"  <link rel=\"self\" href={quoteattr(get_absolute_url(site_url, '/' + ATOM_FEED_NAME))} />",
+        f"  <updated>{format_timestamp(updated)}</updated>",
+    ]
+    for entry in feed_entries:
+        url = get_absolute_url(site_url, entry["url"])
+        lines.append("  <entry>")
+        lines.append(f"    <title>{escape(entry['title'])}</title>")
+        lines.append(f"    <id>{escape(url)}</id>")
+        lines.append(f"    <link href={quoteattr(url)} />")
+        lines.append(f"    <published>{format_timestamp(parse_date(entry['date']))}</published>")
+        lines.append(f"    <updated>{format_timestamp(get_updated(entry))}</updated>")
+        if entry.get("summary"):
+            lines.append(f"    <summary>{escape(entry['summary'])}</summary>")
+        for tag in entry.get("tags", []):
+            lines.append(f"    <category term={quoteattr(tag)} />")
+        lines.append("  </entry>")
+    lines.append("</feed>")
+    return "\n".join(lines) + "\n"
+
+def create_rss_feed(entries, site_url, feed_size=DEFAULT_FEED_SIZE):
+    feed_entries = find_feed_entries(entries, feed_size)
+    title = find_site_title(entries, site_url)
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<rss version="2.0">',
+        "  <channel>",
+        f"    <title>{escape(title)}</title>",
+        f"    <link>{escape(get_absolute_url(site_url, '/'))}</link>",
+        f"    <description>{escape(title)}</description>",
+    ]
+    if feed_entries:
+        lines.append(f"    <lastBuildDate>{format_datetime(max(get_updated(entry) for entry in feed_entries))}</lastBuildDate>")
+    for entry in feed_entries:
+        url = get_absolute_url(site_url, entry["url"])
+        lines.append("    <item>")
+        lines.append(f"      <title>{escape(entry['title'])}</title>")
+        lines.append(f"      <link>{escape(url)}</link>")
+        lines.append(f"      <guid>{escape(url)}</guid>")
+        lines.append(f"      <pubDate>{format_datetime(parse_date(entry['date']))}</pubDate>")
+        if entry.get("summary"):
+            lines.append(f"      <description>{escape(entry['summary'])}</description>")
+        for tag in entry.get("tags", []):
+            lines.append(f"      <category>{escape(tag)}</category>")
+        lines.append("    </item>")
+    lines.extend(["  </channel>", "</rss>"])
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,18 @@
+import os
+import tempfile
+import unittest
+
+class TemporaryDirectoryTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_file(self, name, content):
+        path = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with(open(path, 'wb' if isinstance(content, bytes) else 'w') as test_file):
+            test_file.write(content)
+        return path
@@ -0,0 +1,63 @@
+from datetime import datetime, timezone
+
+from patterns import FRONT_MATTER_LINE_PATTERN, FRONT_MATTER_PATTERN
+
+FRONT_MATTER_DELIMITER = "---"
+DATE_KEYS = ("date", "updated")
+
+def split_front_matter(markdown):
+    match = FRONT_MATTER_PATTERN.match(markdown)
+    if match is None:
+        return {}, markdown
+    return parse_front_matter(match.group(1)), markdown[match.end():]
+
+def read_front_matter(markdown_stream):
+    position = markdown_stream.tell()
+    if markdown_stream.readline().rstrip() != FRONT_MATTER_DELIMITER:
+        markdown_stream.seek(position)
+        return {}
+    lines = []
+    for line in iter(markdown_stream.readline, ""):
+        if line.rstrip() == FRONT_MATTER_DELIMITER:
+            return parse_front_matter("".join(lines))
+        lines.append(line)
+    markdown_stream.seek(position)
+    return {}
+
+def parse_front_matter(text):
+    metadata = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if len(line) == 0 or line.startswith("#"):
+            continue
+        match = FRONT_MATTER_LINE_PATTERN.fullmatch(line)
+        if match is None:
+            raise ValueError(f"Invalid front matter line {line!r}, expected key: value.")
+        metadata[match.group(1).lower()] = parse_front_matter_value(match.group(2))
+    if "tags" in metadata:
+        tags = metadata["tags"] if isinstance(metadata["tags"], list) else metadata["tags"].split(",")
+        metadata["tags"] = [tag.strip() for tag in tags if len(tag.strip()) > 0]
+    for key in DATE_KEYS:
+        if key in metadata:
+            parse_date(metadata[key])
+    return metadata
+
+def parse_front_matter_value(value):
+    value = value.strip()
+    if value.startswith("[") and value.endswith("]"):
+        return [unquote(item.strip()) for item in value[1:-1].split(",") if len(item.strip()) > 0]
+    return unquote(value)
+
+def unquote(value):
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+def parse_date(value):
+    try:
+        date = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid front matter date {value!r}, expected an ISO 8601 date such as 2024-05-01.")
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return date
@@ -1,4 +1,5 @@
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "props")
 
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
@@ -7,14 +8,18 @@ class HTMLNode:
         self.props = props
 
     def to_html(self):
+        return "".join(self.iter_html())
+
+    def iter_html(self):
         raise NotImplementedError()
 
+    def write_html(self, html_file):
+        html_file.writelines(self.iter_html())
+
     def props_to_html(self):
-        string_attributes = ""
-        if self.props is not None: 
-            for attribute in self.props:
-                string_attributes += (f' {attribute}="{self.props[attribute]}"')
-        return string_attributes
+        if self.props is None:
+            return ""
+        return "".join([f' {attribute}="{self.props[attribute]}"' for attribute in self.props])
 
     def __repr__(self):
         string_list = []
@@ -39,6 +44,8 @@ class HTMLNode:
             return ""
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag=None, props=None, *, value):
         super().__init__(tag=tag, props=props, value=value)
 
@@ -47,21 +54,23 @@ class LeafNode(HTMLNode):
             raise ValueError("All leaf nodes must have a value.")
         if self.tag is None:
             return self.value
-        open_tag = f"<{self.tag}{self.props_to_html()}>"
-        close_tag = f"</{self.tag}>"
-        return f"{open_tag}{self.value}{close_tag}"
+        return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+
+    def iter_html(self):
+        yield self.to_html()
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, props=None, *, tag, children):
         super().__init__(tag=tag, children=children, props=props)
     
-    def to_html(self):
+    def iter_html(self):
         if self.tag is None:
             raise ValueError("All parent nodes must have a tag.")
         if self.children is None or len(self.children) < 1:
             raise ValueError("All parent nodes must have at least one child node.")
-        open_tag = f"<{self.tag}{self.props_to_html()}>"
-        close_tag = f"</{self.tag}>"
-        children_string_list = list(map(lambda x : x.to_html(), self.children))
-        full_children_string = "".join(children_string_list)
-        return f"{open_tag}{full_children_string}{close_tag}"
\ No newline at end of file
+        yield f"<{self.tag}{self.props_to_html()}>"
+        for child in self.children:
+            yield from child.iter_html()
+        yield f"</{self.tag}>"
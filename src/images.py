@@ -0,0 +1,187 @@
+import os
+import posixpath
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+from asset_sync import DEFAULT_ASSET_WORKERS, copy_asset, find_assets
+from document_cache import CACHE_DIRECTORY
+from manifest import hash_file
+from optimizer import hash_asset
+from output_writer import files_equal
+
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = None
+    features = None
+
+IMAGE_CACHE_DIRECTORY = os.path.join(CACHE_DIRECTORY, "images")
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".webp")
+RESIZABLE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+VARIANT_FORMATS = {".png": "PNG", ".jpg": "JPEG", ".jpeg": "JPEG", ".webp": "WEBP"}
+VARIANT_TYPES = {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".webp": "image/webp"}
+DEFAULT_IMAGE_WIDTHS = (480, 960, 1440)
+VARIANT_QUALITY = 80
+JPEG_FRAME_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+JPEG_STANDALONE_MARKERS = set(range(0xD0, 0xDA)) | {0x01}
+
+def is_image_path(path):
+    return os.path.splitext(path)[1].lower() in IMAGE_EXTENSIONS
+
+def supports_variants():
+    return Image is not None
+
+def read_image_size(path):
+    with(open(path, 'rb') as image_file):
+        header = image_file.read(32)
+        if header.startswith(b"\x89PNG\r\n\x1a\n") and header[12:16] == b"IHDR":
+            return struct.unpack(">II", header[16:24])
+        if header[:6] in (b"GIF87a", b"GIF89a"):
+            return struct.unpack("<HH", header[6:10])
+        if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+            return read_webp_size(header)
+        if header[:2] == b"\xff\xd8":
+            image_file.seek(2)
+            return read_jpeg_size(image_file)
+    return None
+
+def read_webp_size(header):
+    chunk = header[12:16]
+    if chunk == b"VP8 " and header[23:26] == b"\x9d\x01\x2a":
+        width, height = struct.unpack("<HH", header[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L" and header[20] == 0x2F:
+        bits = struct.unpack("<I", header[21:25])[0]
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        return int.from_bytes(header[24:27], "little") + 1, int.from_bytes(header[27:30], "little") + 1
+    return None
+
+def read_jpeg_size(image_file):
+    while True:
+        marker = image_file.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        while marker[1] == 0xFF:
+            marker = marker[1:] + image_file.read(1)
+            if len(marker) < 2:
+                return None
+        if marker[1] in JPEG_STANDALONE_MARKERS:
+            continue
+        length_bytes = image_file.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack(">H", length_bytes)[0]
+        if marker[1] in JPEG_FRAME_MARKERS:
+            frame = image_file.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack(">xHH", frame)
+            return width, height
+        image_file.seek(length - 2, os.SEEK_CUR)
+
+def get_variant_extension(extension):
+    if features is not None and features.check("webp"):
+        return ".webp"
+    return extension
+
+def plan_image_variants(source_path, destination_path, size, widths):
+    extension = os.path.splitext(source_path)[1].lower()
+    if not supports_variants() or extension not in RESIZABLE_EXTENSIONS:
+        return []
+    variant_extension = get_variant_extension(extension)
+    stem = os.path.splitext(destination_path)[0]
+    variants = [(width, f"{stem}-{width}w{variant_extension}") for width in sorted(set(widths)) if width < size[0]]
+    if variant_extension != extension:
+        variants.append((size[0], f"{stem}{variant_extension}"))
+    return variants
+
+def create_image_attributes(url_path, size, variants):
+    width, height = size
+    attributes = {"width": str(width), "height": str(height)}
+    if variants:
+        candidates = [f"{posixpath.join(posixpath.dirname(url_path), os.path.basename(variant_path))} {variant_width}w" for variant_width, variant_path in variants]
+        if variants[-1][0] != width:
+            candidates.append(f"{url_path} {width}w")
+        attributes["srcset"] = ", ".join(candidates)
+        attributes["sizes"] = f"(max-width: {width}px) 100vw, {width}px"
+        variant_extension = os.path.splitext(variants[0][1])[1].lower()
+        if variant_extension != posixpath.splitext(url_path)[1].lower():
+            attributes["type"] = VARIANT_TYPES[variant_extension]
+    return attributes
+
+def get_cached_variant_path(cache_directory, source_hash, width, extension):
+    return os.path.join(cache_directory, source_hash[:2], f"{source_hash}-{width}w-q{VARIANT_QUALITY}{extension}")
+
+def create_variant(source_path, variant_path, width):
+    os.makedirs(os.path.dirname(variant_path), exist_ok=True)
+    extension = os.path.splitext(variant_path)[1]
+    image_format = VARIANT_FORMATS[extension]
+    temporary_path = f"{variant_path}.{os.getpid()}.tmp"
+    with Image.open(source_path) as source_image:
+        image = source_image
+        if image_format == "WEBP" and image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA")
+        elif image_format == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        if width < image.width:
+            image = image.resize((width, max(1, round(image.height * width / image.width))), Image.Resampling.LANCZOS)
+        image.save(temporary_path, format=image_format, quality=VARIANT_QUALITY)
+    os.replace(temporary_path, variant_path)
+
+def write_image_variants(source_path, variants, cache_directory, link_mode="auto", source_hash=None):
+    written = []
+    if not variants:
+        return written
+    if source_hash is None:
+        source_hash = hash_file(source_path)
+    for width, variant_path in variants:
+        cached_path = get_cached_variant_path(cache_directory, source_hash, width, os.path.splitext(variant_path)[1])
+        if not os.path.isfile(cached_path):
+            create_variant(source_path, cached_path, width)
+        if not files_equal(cached_path, variant_path):
+            copy_asset(cached_path, variant_path, link_mode)
+            written.append(variant_path)
+    return written
+
+def process_image(image, widths, cache_directory, write_variants, link_mode, previous_entry=None):
+    source_path, destination_path, url_path, source_stat = image
+    source_entry = None
+    written = []
+    try:
+        size = read_image_size(source_path)
+        if size is None:
+            return None, [], [], None
+        variants = plan_image_variants(source_path, destination_path, size, widths)
+        if write_variants and variants:
+            source_entry = {"hash": hash_asset(source_path, source_stat, previous_entry), "size": source_stat.st_size, "mtime_ns": source_stat.st_mtime_ns}
+            written = write_image_variants(source_path, variants, cache_directory, link_mode, source_entry["hash"])
+    except Exception as exception:
+        raise ValueError(f"Failed to process image {source_path}: {exception}") from exception
+    return create_image_attributes(url_path, size, variants), [variant_path for _, variant_path in variants], written, source_entry
+
+def process_images(static_directory, output_directory, widths=DEFAULT_IMAGE_WIDTHS, cache_directory=IMAGE_CACHE_DIRECTORY, write_variants=True,
+        link_mode="auto", workers=DEFAULT_ASSET_WORKERS, destinations=None, previous_entries=None):
+    previous_entries = previous_entries or {}
+    images = []
+    if os.path.isdir(static_directory):
+        for source_path, destination_path, source_stat in find_assets(static_directory, output_directory):
+            if is_image_path(source_path):
+                if destinations is not None:
+                    destination_path = destinations.get(source_path, destination_path)
+                images.append((source_path, destination_path, "/" + os.path.relpath(source_path, static_directory).replace(os.sep, "/"), source_stat))
+    attributes = {}
+    variant_outputs = []
+    written = []
+    source_entries = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(lambda image: process_image(image, widths, cache_directory, write_variants, link_mode, previous_entries.get(image[0])), images)
+        for image, (image_attributes, image_variants, image_written, source_entry) in zip(images, results):
+            if image_attributes is not None:
+                attributes[image[2]] = image_attributes
+            if write_variants:
+                variant_outputs.extend(image_variants)
+            if source_entry is not None:
+                source_entries[image[0]] = source_entry
+            written.extend(image_written)
+    return attributes, variant_outputs, written, source_entries
@@ -0,0 +1,53 @@
+from front_matter import parse_date
+from patterns import INLINE_MARKUP_PATTERN
+
+DEFAULT_LISTING_PAGE_SIZE = 10
+
+def get_listing_url(section, page_number):
+    if page_number == 1:
+        return f"/{section}/"
+    return f"/{section}/page/{page_number}/"
+
+def get_section_title(section):
+    return section.rsplit("/", 1)[-1].replace("-", " ").replace("_", " ").title()
+
+def find_section_entries(entries, section):
+    prefix = f"/{section}/"
+    section_entries = sorted((entry for entry in entries if entry["url"].startswith(prefix) and entry["url"] != prefix), key=lambda entry: entry["url"])
+    return sorted(section_entries, key=lambda entry: parse_date(entry["date"]).timestamp() if entry.get("date") else float("-inf"), reverse=True)
+
+def create_listing_item(entry):
+    item = f"- [{INLINE_MARKUP_PATTERN.sub('', entry['title'])}]({entry['url']})"
+    if entry.get("date"):
+        item += f" ({parse_date(entry['date']).date().isoformat()})"
+    if entry.get("summary"):
+        item += f": {INLINE_MARKUP_PATTERN.sub('', entry['summary'])}"
+    return item
+
+def create_listing_markdown(section, page_entries, page_number, page_count):
+    title = get_section_title(section)
+    if page_count > 1:
+        title += f" (page {page_number} of {page_count})"
+    blocks = [f"# {title}"]
+    if page_entries:
+        blocks.append("\n".join(create_listing_item(entry) for entry in page_entries))
+    else:
+        blocks.append("Nothing has been published here yet.")
+    navigation = []
+    if page_number > 1:
+        navigation.append(f"[Newer posts]({get_listing_url(section, page_number - 1)})")
+    if page_number < page_count:
+        navigation.append(f"[Older posts]({get_listing_url(section, page_number + 1)})")
+    if navigation:
+        blocks.append(" | ".join(navigation))
+    return "\n\n".join(blocks) + "\n"
+
+def create_listing_pages(entries, section, page_size=DEFAULT_LISTING_PAGE_SIZE):
+    section = section.strip("/")
+    section_entries = find_section_entries(entries, section)
+    page_count = max(1, (len(section_entries) + page_size - 1) // page_size)
+    listing_pages = []
+    for page_number in range(1, page_count + 1):
+        page_entries = section_entries[(page_number - 1) * page_size:page_number * page_size]
+        listing_pages.append((get_listing_url(section, page_number), create_listing_markdown(section, page_entries, page_number, page_count)))
+    return listing_pages
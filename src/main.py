@@ -1,87 +1,341 @@
+import argparse
 import os
-import shutil
 import sys
-from textnode import TextNode, TextType
-from markdown_parser import *
+import threading
+import time
+from markdown_parser import DEFAULT_MEMO_SIZE, INLINE_PARSERS
+from manifest import remove_output
+from devserver import LiveReloadState, start_server
+from watcher import create_watcher
+from document_cache import DEFAULT_CACHE_SIZE, configure_document_cache, get_document_cache
+from profiler import Profiler, get_profiler
+from asset_sync import DEFAULT_ASSET_WORKERS, LINK_MODES, copy_asset
+from pipeline import DEFAULT_QUEUE_SIZE
+from discovery import IGNORE_FILE, get_page_destination, is_page_ignored, load_ignore_patterns
+from output_writer import write_change_list
+from search_index import DEFAULT_SEARCH_SHARDS, SEARCH_DIRECTORY
+from sharding import SHARDS_DIRECTORY, find_shard_directories, get_shard_name, merge_shards, parse_shard, remove_other_shard_counts
+from dependency_graph import find_broken_links, find_dependencies, find_dependents, load_dependency_graph
+from compression import DEFAULT_COMPRESSION_THRESHOLD, DEFAULT_COMPRESSION_WORKERS
+from feeds import DEFAULT_FEED_SIZE
+from images import DEFAULT_IMAGE_WIDTHS, is_image_path
+from listings import DEFAULT_LISTING_PAGE_SIZE
+from site_builder import (CHANGES_PATH, DEPENDENCY_GRAPH_PATH, DEFAULT_STREAMING_THRESHOLD, DOCUMENT_CACHE_DIRECTORY, FROM_OUTPUT_DIRECTORY, MANIFEST_PATH,
+    SITE_STATE_DIRECTORY, SiteBuilder, asset_sync_options, build_incremental, compression_options, generate_pages, generate_pages_recursive, get_asset_destination,
+    image_options, log, optimization_options, search_options, site_index_options)
+
+DEFAULT_OUTPUT_DIRECTORY = "docs"
 
 def main():
-    copy_source_contents()
-    basepath = get_base_path()
-    generate_pages_recursive("content", "template.html", "docs", basepath)
-
-def get_base_path():
-    if len(sys.argv) > 1:
-        return sys.argv[1]
-    return "/"
-
-def copy_source_contents():
-    source_directory = "static"
-    destination_directory = "docs"
-    clear_destination_directory(destination_directory)
-    copy_contents(source_directory, destination_directory)
-
-def clear_destination_directory(directory):
-    if os.path.isdir(directory):
-        shutil.rmtree(directory)
-        os.mkdir(directory, mode=0o777)
-    else:
-        os.mkdir(directory, mode=0o777)
-
-def copy_contents(source_directory, destination_directory):
-    paths_list = os.listdir(source_directory)
-    for path in paths_list:
-        source_path = os.path.join(source_directory, path)
-        destination_path = os.path.join(destination_directory, path)
-        if os.path.isfile(source_path):
-            shutil.copy(source_path, destination_path)
-        elif os.path.isdir(source_path):
-            os.mkdir(destination_path)
-            copy_contents(source_path, destination_path)
-
-def generate_page(from_path, template_path, dest_path, base_path):
-    print(f"Generating page from {from_path} to {dest_path} using {template_path}")
-    with(open(from_path, 'r') as markdown_file):
-        markdown_content = markdown_file.read()
-    with(open(template_path, 'r') as template_file):
-        template_content = template_file.read()
-    html_string = markdown_to_html_node(markdown_content).to_html()
-    title_string = extract_title(markdown_content)
-    template_content = template_content.replace(f"{{{{ Title }}}}", title_string)
-    template_content = template_content.replace(f"{{{{ Content }}}}", html_string)
-    template_content = template_content.replace("href=\"/", f"href=\"{base_path}")
-    template_content = template_content.replace("src=\"/", f"src=\"{base_path}")
-    create_directory_if_nonexistent(dest_path)
-    with(open(dest_path, 'w') as html_file):
-        html_file.write(template_content)
-
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, base_path):
-    found_html_paths = find_html_files(dir_path_content)
-    for html_file_path in found_html_paths:
-        destination_file_path = html_file_path.replace(dir_path_content, dest_dir_path).replace(".md", ".html")
-        generate_page(html_file_path, template_path, destination_file_path, base_path)
-
-def find_html_files(start_directory):
-    paths_list = os.listdir(start_directory)
-    html_paths = []
-    for path in paths_list:
-        full_path = os.path.join(start_directory, path)
-        if os.path.isfile(full_path) and full_path.endswith(".md"):
-            html_paths.append(full_path)
-        elif os.path.isdir(full_path):
-            html_paths.extend(find_html_files(full_path))
-    return html_paths
-
-def create_directory_if_nonexistent(path):
-    split_path = path.split("/")
-    if len(split_path) > 1:
-        split_path = split_path[:-1]
+    if sys.argv[1:2] == ["serve"]:
+        serve(parse_serve_arguments(sys.argv[2:]))
+        return
+    if sys.argv[1:2] == ["cache"]:
+        manage_cache(parse_cache_arguments(sys.argv[2:]))
+        return
+    if sys.argv[1:2] == ["merge"]:
+        merge(parse_merge_arguments(sys.argv[2:]))
+        return
+    if sys.argv[1:2] == ["deps"]:
+        query_dependencies(parse_dependency_arguments(sys.argv[2:]))
+        return
+    arguments = parse_arguments(sys.argv[1:])
+    if arguments.shard is not None and arguments.output is None:
+        remove_other_shard_counts(arguments.shard[1])
+    builder = create_site_builder(arguments)
+    with builder.configured():
+        builder.build(arguments.incremental)
+        report_profile(arguments)
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description="Generate the static site from content/ and static/ into docs/.")
+    parser.add_argument("base_path", nargs="?", default="/", help="base path prepended to root-relative links")
+    parser.add_argument("--incremental", action="store_true", help="only rebuild pages and assets that changed since the last build")
+    parser.add_argument("--jobs", "-j", type=positive_integer, default=1, metavar="N", help="render pages across N worker processes")
+    parser.add_argument("--changes-file", default=CHANGES_PATH, metavar="FILE", help="write the output files that changed or were removed as JSON")
+    parser.add_argument("--shard", type=shard_argument, metavar="i/N", help=f"build only the i-th of N size-balanced page subsets into {SHARDS_DIRECTORY}/i-of-N; shard 1 also copies static files")
+    add_build_arguments(parser)
+    return parser.parse_args(argv)
+
+def parse_merge_arguments(argv):
+    parser = argparse.ArgumentParser(prog="main.py merge", description="Combine the output trees of sharded builds into one site.")
+    parser.add_argument("shard_directories", nargs="*", metavar="SHARD_DIR", help=f"shard output trees (default: the complete i-of-N set in {SHARDS_DIRECTORY})")
+    parser.add_argument("--output", default="docs", metavar="DIR", help="directory the merged site is written to")
+    parser.add_argument("--changes-file", default=CHANGES_PATH, metavar="FILE", help="write the output files that changed or were removed as JSON")
+    return parser.parse_args(argv)
+
+def parse_serve_arguments(argv):
+    parser = argparse.ArgumentParser(prog="main.py serve", description="Build the site and serve docs/ over HTTP.")
+    parser.add_argument("base_path", nargs="?", default="/", help="base path prepended to root-relative links")
+    parser.add_argument("--watch", action="store_true", help="rebuild changed pages and live-reload browsers on edits")
+    parser.add_argument("--poll", action="store_true", help="poll for changes instead of using inotify")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8888)
+    parser.add_argument("--jobs", "-j", type=positive_integer, default=1, metavar="N", help="render pages across N worker processes")
+    add_build_arguments(parser)
+    return parser.parse_args(argv)
+
+def parse_cache_arguments(argv):
+    parser = argparse.ArgumentParser(prog="main.py cache", description="Inspect or clear the parsed-document cache.")
+    parser.add_argument("action", choices=["info", "clear"])
+    return parser.parse_args(argv)
+
+def parse_dependency_arguments(argv):
+    parser = argparse.ArgumentParser(prog="main.py deps", description="Query the dependency graph recorded by the last build.")
+    parser.add_argument("--graph", default=DEPENDENCY_GRAPH_PATH, metavar="FILE", help="dependency graph written by the build")
+    query = parser.add_mutually_exclusive_group(required=True)
+    query.add_argument("--referencing", metavar="PATH", help="list pages that depend on a page, static file or the template (source or output path)")
+    query.add_argument("--dependencies", metavar="PAGE", help="list the pages, static files and template a page depends on")
+    query.add_argument("--broken", action="store_true", help="list internal links and images that do not resolve to an output")
+    return parser.parse_args(argv)
+
+def add_build_arguments(parser):
+    parser.add_argument("--content", default="content", metavar="DIR", help="directory of markdown pages")
+    parser.add_argument("--template", default="template.html", metavar="FILE", help="HTML template with {{ Title }} and {{ Content }} placeholders")
+    parser.add_argument("--static", default="static", metavar="DIR", help="directory of static files copied as they are")
+    parser.add_argument("--output", metavar="DIR", help=f"directory the site is written to (default: {DEFAULT_OUTPUT_DIRECTORY}); other directories keep their build state in {SITE_STATE_DIRECTORY}/DIR next to them")
+    parser.add_argument("--manifest", metavar="FILE", help=f"build manifest used by incremental builds (default: {MANIFEST_PATH} for {DEFAULT_OUTPUT_DIRECTORY})")
+    parser.add_argument("--inline-parser", choices=sorted(INLINE_PARSERS), default="scanner", help="inline markdown parser implementation")
+    parser.add_argument("--no-cache", action="store_true", help="do not read or write the parsed-document cache")
+    parser.add_argument("--cache-size", type=positive_integer, default=DEFAULT_CACHE_SIZE // (1024 * 1024), metavar="MB", help="evict least recently used cache entries above this size")
+    parser.add_argument("--link-mode", choices=LINK_MODES, default="auto", help="how static files are placed in docs/: auto tries a reflink, then copy_file_range")
+    parser.add_argument("--asset-workers", type=positive_integer, default=DEFAULT_ASSET_WORKERS, metavar="N", help="threads used to sync static files")
+    parser.add_argument("--asset-hash", action="store_true", help="compare content hashes when a static file's size matches but its mtime differs")
+    parser.add_argument("--no-images", action="store_true", help="do not read image dimensions or generate resized variants of static images")
+    parser.add_argument("--image-widths", type=image_widths, default=DEFAULT_IMAGE_WIDTHS, metavar="W,W,...", help="widths of the resized variants generated for images wider than them (requires Pillow)")
+    parser.add_argument("--minify", action="store_true", help="minify generated HTML and static CSS")
+    parser.add_argument("--hash-assets", action="store_true", help="add a content hash to static file names, rewrite references to them and write asset-manifest.json")
+    parser.add_argument("--compress", action="store_true", help="write .gz (and .br when the brotli module is installed) files next to compressible outputs")
+    parser.add_argument("--compress-threshold", type=non_negative_integer, default=DEFAULT_COMPRESSION_THRESHOLD, metavar="BYTES", help="do not precompress outputs smaller than this")
+    parser.add_argument("--compress-workers", type=positive_integer, default=DEFAULT_COMPRESSION_WORKERS, metavar="N", help="threads used to precompress outputs")
+    parser.add_argument("--search-index", action="store_true", help=f"write a sharded inverted index of page titles, headings and text to {SEARCH_DIRECTORY}/ in the output")
+    parser.add_argument("--search-shards", type=positive_integer, default=DEFAULT_SEARCH_SHARDS, metavar="N", help="number of files the search index terms are spread over")
+    parser.add_argument("--site-url", metavar="URL", help="absolute URL of the site used in the sitemap and feeds (default: the base path when it is absolute)")
+    parser.add_argument("--sitemap", action="store_true", help="write sitemap.xml listing every page")
+    parser.add_argument("--feeds", action="store_true", help="write atom.xml and rss.xml with the newest pages that have a date in their front matter")
+    parser.add_argument("--feed-size", type=positive_integer, default=DEFAULT_FEED_SIZE, metavar="N", help="number of pages in the feeds")
+    parser.add_argument("--listing", action="append", default=[], metavar="SECTION", help="write paginated listing pages for the pages under content/SECTION (repeatable)")
+    parser.add_argument("--listing-page-size", type=positive_integer, default=DEFAULT_LISTING_PAGE_SIZE, metavar="N", help="pages linked from each listing page")
+    parser.add_argument("--stream-threshold", type=positive_integer, default=DEFAULT_STREAMING_THRESHOLD // (1024 * 1024), metavar="MB", help="render markdown files at least this large block by block instead of loading them whole")
+    parser.add_argument("--memo-size", type=non_negative_integer, default=DEFAULT_MEMO_SIZE, metavar="N", help="remember the parsed HTML of up to N repeated blocks and inline fragments (0 disables)")
+    parser.add_argument("--io-threads", type=non_negative_integer, default=0, metavar="N", help="overlap reading and writing pages with rendering using N reader and N writer threads (single process builds only)")
+    parser.add_argument("--queue-size", type=positive_integer, default=DEFAULT_QUEUE_SIZE, metavar="N", help="pages buffered between the read, render and write stages of --io-threads")
+    parser.add_argument("--quiet", "-q", action="store_true", help="do not print a line for every generated page")
+    parser.add_argument("--profile", action="store_true", help="record per-stage and per-page timings and print a report")
+    parser.add_argument("--profile-top", type=positive_integer, default=10, metavar="N", help="number of slowest pages in the profile report")
+    parser.add_argument("--profile-json", metavar="FILE", help="write the profile as JSON")
+    parser.add_argument("--profile-trace", metavar="FILE", help="write the profile in Chrome trace event format")
+
+def create_site_builder(arguments):
+    profiling = arguments.profile or arguments.profile_json is not None or arguments.profile_trace is not None
+    shard = getattr(arguments, "shard", None)
+    output_directory, manifest_path, dependency_graph_path = DEFAULT_OUTPUT_DIRECTORY, MANIFEST_PATH, DEPENDENCY_GRAPH_PATH
+    if shard is not None:
+        output_directory = os.path.join(SHARDS_DIRECTORY, get_shard_name(shard))
+        manifest_path, dependency_graph_path = f"{output_directory}.manifest.json", None
+    if arguments.output is not None and os.path.normpath(arguments.output) != os.path.normpath(output_directory):
+        output_directory = arguments.output
+        manifest_path = FROM_OUTPUT_DIRECTORY
+        dependency_graph_path = FROM_OUTPUT_DIRECTORY if shard is None else None
+    return SiteBuilder(
+        arguments.content,
+        arguments.template,
+        arguments.static,
+        output_directory,
+        arguments.base_path,
+        manifest_path=arguments.manifest or manifest_path,
+        changes_path=getattr(arguments, "changes_file", None) if shard is None else None,
+        dependency_graph_path=dependency_graph_path,
+        shard=shard,
+        jobs=arguments.jobs,
+        inline_parser=arguments.inline_parser,
+        cache_directory=None if arguments.no_cache else DOCUMENT_CACHE_DIRECTORY,
+        cache_size=arguments.cache_size * 1024 * 1024,
+        memo_size=arguments.memo_size,
+        streaming_threshold=arguments.stream_threshold * 1024 * 1024,
+        io_threads=arguments.io_threads,
+        queue_size=arguments.queue_size,
+        link_mode=arguments.link_mode,
+        asset_workers=arguments.asset_workers,
+        asset_hash=arguments.asset_hash,
+        images=not arguments.no_images,
+        image_widths=arguments.image_widths,
+        minify=arguments.minify,
+        hash_assets=arguments.hash_assets,
+        compress=arguments.compress,
+        compression_threshold=arguments.compress_threshold,
+        compression_workers=arguments.compress_workers,
+        search_index=arguments.search_index,
+        search_shards=arguments.search_shards,
+        site_url=arguments.site_url,
+        sitemap=arguments.sitemap,
+        feeds=arguments.feeds,
+        feed_size=arguments.feed_size,
+        listings=arguments.listing,
+        listing_page_size=arguments.listing_page_size,
+        quiet=arguments.quiet,
+        profiler=Profiler() if profiling else None,
+    )
+
+def report_profile(arguments):
+    profiler = get_profiler()
+    if profiler is None:
+        return
+    if arguments.profile:
+        profiler.print_report(arguments.profile_top)
+    if arguments.profile_json is not None:
+        profiler.write_json(arguments.profile_json)
+    if arguments.profile_trace is not None:
+        profiler.write_chrome_trace(arguments.profile_trace)
+
+def manage_cache(arguments):
+    configure_document_cache(DOCUMENT_CACHE_DIRECTORY)
+    document_cache = get_document_cache()
+    if arguments.action == "clear":
+        document_cache.clear()
+        print(f"Cleared {DOCUMENT_CACHE_DIRECTORY}")
+        return
+    entries, total_bytes = document_cache.get_stats()
+    print(f"{DOCUMENT_CACHE_DIRECTORY}: {entries} entries, {total_bytes / (1024 * 1024):.2f} MB")
+
+def merge(arguments):
+    shard_directories = arguments.shard_directories or find_shard_directories()
+    if not shard_directories:
+        raise ValueError(f"No shard output trees to merge in {SHARDS_DIRECTORY}.")
+    changed, removed = merge_shards(shard_directories, arguments.output)
+    write_change_list(arguments.changes_file, arguments.output, changed, removed)
+    print(f"Merged {len(shard_directories)} shards into {arguments.output}: {len(changed)} changed, {len(removed)} removed")
+
+def query_dependencies(arguments):
+    if not os.path.isfile(arguments.graph):
+        raise ValueError(f"No dependency graph at {arguments.graph}, run a build first.")
+    graph = load_dependency_graph(arguments.graph)
+    if arguments.referencing is not None:
+        results = find_dependents(graph, arguments.referencing)
+    elif arguments.dependencies is not None:
+        results = find_dependencies(graph, os.path.normpath(arguments.dependencies))
     else:
+        results = [f"{page_path}: {kind} {url}" for page_path, kind, url in find_broken_links(graph)]
+    for result in results:
+        print(result)
+
+def shard_argument(value):
+    try:
+        return parse_shard(value)
+    except ValueError as exception:
+        raise argparse.ArgumentTypeError(str(exception))
+
+def positive_integer(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {value}")
+    return number
+
+def image_widths(value):
+    try:
+        return tuple(sorted(set(positive_integer(width) for width in value.split(","))))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma separated positive widths, got {value}")
+
+def non_negative_integer(value):
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"expected a non-negative integer, got {value}")
+    return number
+
+def serve(arguments):
+    builder = create_site_builder(arguments)
+    with builder.configured():
+        watch_and_serve(builder, arguments)
+
+def watch_and_serve(builder, arguments):
+    builder.build(incremental=True)
+    live_reload_state = LiveReloadState() if arguments.watch else None
+    server = start_server(builder.output_directory, arguments.host, arguments.port, live_reload_state)
+    print(f"Serving {builder.output_directory} at http://{arguments.host}:{arguments.port}/")
+    try:
+        if not arguments.watch:
+            threading.Event().wait()
+        watcher = create_watcher([builder.content_directory, builder.static_directory], [builder.template_path], polling=arguments.poll)
+        print(f"Watching {builder.content_directory}, {builder.static_directory} and {builder.template_path} with {type(watcher).__name__}")
+        while True:
+            changed_paths = watcher.wait_for_changes()
+            if not changed_paths:
+                continue
+            start_time = time.perf_counter()
+            try:
+                rebuild_changed_paths(changed_paths, builder.content_directory, builder.template_path, builder.static_directory,
+                    builder.output_directory, builder.base_path, arguments.jobs, builder.manifest_path)
+            except Exception as exception:
+                print(f"Rebuild failed: {exception}")
+                continue
+            live_reload_state.notify_reload()
+            report_profile(arguments)
+            if get_profiler() is not None:
+                get_profiler().take_records()
+            print(f"Rebuilt {len(changed_paths)} changed path(s) in {(time.perf_counter() - start_time) * 1000:.0f} ms")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+def rebuild_changed_paths(changed_paths, dir_path_content, template_path, static_directory, dest_dir_path, base_path, jobs=1, manifest_path=MANIFEST_PATH):
+    if os.path.normpath(template_path) in changed_paths and not compression_options["enabled"] and not uses_page_metadata():
+        generate_pages_recursive(dir_path_content, template_path, dest_dir_path, base_path, jobs)
         return
-    current_path = ""
-    for section in split_path:
-        current_path = f"{current_path}{section}"
-        if not os.path.isdir(current_path):
-            os.mkdir(current_path, mode=0o777)
-        current_path = f"{current_path}/"
-
-main()
\ No newline at end of file
+    if needs_full_rescan(changed_paths, dir_path_content, static_directory, dest_dir_path):
+        build_incremental(dir_path_content, template_path, static_directory, dest_dir_path, base_path, manifest_path, jobs)
+        return
+    pages = []
+    for path in sorted(changed_paths):
+        destination_path = get_changed_destination(path, dir_path_content, static_directory, dest_dir_path)
+        if destination_path is None or os.path.isdir(path):
+            continue
+        if not os.path.exists(path):
+            log(f"Removing {destination_path}")
+            remove_output(destination_path, dest_dir_path)
+        elif is_inside_directory(path, dir_path_content):
+            pages.append((path, destination_path))
+        else:
+            log(f"Copying {path} to {destination_path}")
+            copy_asset(path, destination_path, asset_sync_options["link_mode"])
+    generate_pages(pages, template_path, base_path, jobs)
+
+def get_changed_destination(path, dir_path_content, static_directory, dest_dir_path):
+    if is_inside_directory(path, static_directory):
+        return get_asset_destination(path, static_directory, dest_dir_path)
+    if is_inside_directory(path, dir_path_content) and path.endswith(".md"):
+        if is_page_ignored(path, dir_path_content, load_ignore_patterns(dir_path_content)):
+            return None
+        return get_page_destination(path, dir_path_content, dest_dir_path)
+    return None
+
+def needs_full_rescan(changed_paths, dir_path_content, static_directory, dest_dir_path):
+    if compression_options["enabled"]:
+        return True
+    for path in changed_paths:
+        if not is_inside_directory(path, dir_path_content) and not is_inside_directory(path, static_directory):
+            return True
+        if os.path.basename(path) == IGNORE_FILE:
+            return True
+        if is_inside_directory(path, static_directory) and (optimization_options["minify"] or optimization_options["hash_assets"]):
+            return True
+        if image_options["enabled"] and is_image_path(path) and is_inside_directory(path, static_directory):
+            return True
+        if uses_page_metadata() and is_inside_directory(path, dir_path_content):
+            return True
+        if os.path.exists(path):
+            continue
+        destination_path = get_changed_destination(path, dir_path_content, static_directory, dest_dir_path)
+        if destination_path is None or os.path.isdir(destination_path):
+            return True
+    return False
+
+def uses_page_metadata():
+    return search_options["enabled"] or site_index_options["sitemap"] or site_index_options["feeds"] or bool(site_index_options["listings"])
+
+def is_inside_directory(path, directory):
+    return os.path.normpath(path).startswith(f"{os.path.normpath(directory)}{os.sep}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import hashlib
+import json
+import os
+
+MANIFEST_VERSION = 7
+
+def new_manifest():
+    return {
+        "version": MANIFEST_VERSION,
+        "base_path": None,
+        "template_hash": None,
+        "pages": {},
+        "assets": {},
+        "images": {"attributes": None, "variants": []},
+        "optimization": {"minify": False, "asset_urls": {}, "asset_manifest": None},
+        "compression": {"settings": None, "files": {}},
+        "search": [],
+        "site_index": [],
+    }
+
+def load_manifest(path):
+    if not os.path.isfile(path):
+        return new_manifest()
+    try:
+        with(open(path, 'r') as manifest_file):
+            manifest = json.load(manifest_file)
+    except (OSError, ValueError):
+        return new_manifest()
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return new_manifest()
+    return manifest
+
+def save_manifest(path, manifest):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temporary_path = f"{path}.tmp"
+    with(open(temporary_path, 'w') as manifest_file):
+        json.dump(manifest, manifest_file, indent=1, sort_keys=True)
+    os.replace(temporary_path, path)
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with(open(path, 'rb') as hashed_file):
+        for chunk in iter(lambda: hashed_file.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def create_entry(source_hash, output_path):
+    return {"hash": source_hash, "output": output_path, "output_hash": hash_file(output_path)}
+
+def is_entry_current(entry, source_hash, output_path):
+    if entry is None:
+        return False
+    if entry["hash"] != source_hash or entry["output"] != output_path:
+        return False
+    if not os.path.isfile(output_path):
+        return False
+    return hash_file(output_path) == entry["output_hash"]
+
+def find_outdated_sources(entries, sources, force=False):
+    outdated = []
+    for source_path in sorted(sources):
+        source_hash, output_path = sources[source_path]
+        if force or not is_entry_current(entries.get(source_path), source_hash, output_path):
+            outdated.append(source_path)
+    return outdated
+
+def is_output_path(path, output_directory):
+    path = os.path.realpath(path)
+    output_directory = os.path.realpath(output_directory)
+    return path != output_directory and os.path.commonpath([path, output_directory]) == output_directory
+
+def find_removed_outputs(entries, sources, output_directory):
+    removed = []
+    for source_path in sorted(entries):
+        if source_path not in sources and is_output_path(entries[source_path]["output"], output_directory):
+            removed.append(entries[source_path]["output"])
+    return removed
+
+def remove_output(path, root_directory):
+    if os.path.isfile(path):
+        os.remove(path)
+    directory = os.path.dirname(path)
+    root_directory = os.path.normpath(root_directory)
+    while directory and os.path.normpath(directory) != root_directory:
+        if not os.path.isdir(directory) or os.listdir(directory):
+            break
+        os.rmdir(directory)
+        directory = os.path.dirname(directory)
@@ -1,7 +1,16 @@
-import re
-from textnode import TextType, TextNode
+import hashlib
+import json
+from textnode import TextType, TextNode, get_image_attributes, set_image_attributes
 from htmlnode import LeafNode, ParentNode
 from enum import Enum
+from profiler import profile_stage
+from memo import LRUMemo
+from front_matter import read_front_matter
+from patterns import (CODE_BLOCK_PATTERN, EMPTY_HEADING_PATTERN, HEADING_PATTERN, IMAGE_PATTERN, INLINE_MARKUP_PATTERN, INLINE_REFERENCE_PATTERN,
+    LEGACY_CODE_BLOCK_PATTERN, LEGACY_HEADING_PATTERN, LEGACY_ORDERED_LINE_PATTERN, LINK_PATTERN, ORDERED_LINE_NUMBER_PATTERN,
+    ORDERED_LIST_ITEM_PATTERN, TITLE_PATTERN)
+
+PARSER_VERSION = "2"
 
 class BlockType(Enum):
     PARAGRAPH = "paragraph"
@@ -46,11 +55,11 @@ def remove_empty_strings(string_list):
     return result_strings
 
 def extract_markdown_images(text):
-    matches = re.findall(r"!\[(.*?)\]\((.*?)\)", text)
+    matches = IMAGE_PATTERN.findall(text)
     return matches
 
 def extract_markdown_links(text):
-    matches = re.findall(r"(?:^|[^!])\[(.*?)\]\((.*?)\)", text)
+    matches = LINK_PATTERN.findall(text)
     return matches
 
 def split_nodes_image(old_nodes):
@@ -99,7 +108,68 @@ def split_single_node_by_links(old_node):
     new_nodes.append(TextNode(current_text, TextType.TEXT))
     return new_nodes
 
+INLINE_DELIMITERS = [("**", TextType.BOLD), ("_", TextType.ITALIC), ("`", TextType.CODE)]
+
 def parse_inline_markdown_text(text):
+    with profile_stage("inline_parsing"):
+        if len(text) > MEMO_MAX_FRAGMENT_LENGTH:
+            return INLINE_PARSERS[inline_parser](text)
+        return list(inline_memo(text))
+
+def parse_inline_markdown_text_uncached(text):
+    return tuple(INLINE_PARSERS[inline_parser](text))
+
+def set_inline_parser(name):
+    global inline_parser
+    if name not in INLINE_PARSERS:
+        raise ValueError(f"Unknown inline parser {name}, expected one of {', '.join(INLINE_PARSERS)}.")
+    if name != inline_parser:
+        inline_memo.clear()
+        html_block_memo.clear()
+    inline_parser = name
+
+def get_inline_parser():
+    return inline_parser
+
+def scan_inline_markdown_text(text):
+    result_nodes = []
+    scan_delimited_text(text, 0, result_nodes)
+    return result_nodes
+
+def scan_delimited_text(text, level, result_nodes):
+    if level == len(INLINE_DELIMITERS):
+        scan_references(text, result_nodes)
+        return
+    delimiter, text_type = INLINE_DELIMITERS[level]
+    if delimiter not in text:
+        scan_delimited_text(text, level + 1, result_nodes)
+        return
+    parts = text.split(delimiter)
+    if len(parts) % 2 != 1:
+        raise ValueError(f"Invalid Markdown syntax: The text in this node has an odd number of {delimiter} delimiters.")
+    for i in range(0, len(parts), 2):
+        if len(parts[i]) > 0:
+            scan_delimited_text(parts[i], level + 1, result_nodes)
+        if i + 1 < len(parts) and len(parts[i + 1]) > 0:
+            result_nodes.append(TextNode(parts[i + 1], text_type))
+
+def scan_references(text, result_nodes):
+    if "[" not in text:
+        if len(text) > 0:
+            result_nodes.append(TextNode(text, TextType.TEXT))
+        return
+    position = 0
+    for match in INLINE_REFERENCE_PATTERN.finditer(text):
+        if match.start() > position:
+            result_nodes.append(TextNode(text[position:match.start()], TextType.TEXT))
+        if len(match.group(2)) > 0:
+            reference_type = TextType.IMAGE if match.group(1) else TextType.LINK
+            result_nodes.append(TextNode(match.group(2), reference_type, match.group(3)))
+        position = match.end()
+    if len(text) > position:
+        result_nodes.append(TextNode(text[position:], TextType.TEXT))
+
+def parse_inline_markdown_text_legacy(text):
 
     result_nodes = [TextNode(text, TextType.TEXT)]
     result_nodes = split_nodes_delimiter(result_nodes, "**", TextType.BOLD)
@@ -110,15 +180,122 @@ def parse_inline_markdown_text(text):
 
     return result_nodes
 
+INLINE_PARSERS = {
+    "scanner": scan_inline_markdown_text,
+    "legacy": parse_inline_markdown_text_legacy,
+}
+inline_parser = "scanner"
+DEFAULT_MEMO_SIZE = 4096
+MEMO_MAX_FRAGMENT_LENGTH = 4096
+
 def markdown_to_blocks(markdown):
+    chunks = markdown.split("\n\n")
+    blocks = []
+    fences_enabled = True
+    i = 0
+    while i < len(chunks):
+        block = chunks[i].strip()
+        i += 1
+        if fences_enabled and block.startswith("```"):
+            first_line, _, rest = chunks[i - 1].lstrip("\n").partition("\n")
+            if is_fence_opening(first_line) and not has_fence_closing(rest):
+                fence_end = i
+                while fence_end < len(chunks) and not has_fence_closing(chunks[fence_end]):
+                    fence_end += 1
+                if fence_end < len(chunks):
+                    block = "\n\n".join(chunks[i - 1:fence_end + 1]).strip()
+                    i = fence_end + 1
+                else:
+                    fences_enabled = False
+        if len(block) > 0:
+            blocks.append(block)
+    return blocks
+
+def has_fence_closing(text):
+    if "```" not in text:
+        return False
+    for line in text.split("\n"):
+        if line.strip() == "```":
+            return True
+    return False
+
+def iter_markdown_blocks(lines):
+    block_lines = []
+    fence_open = False
+    fences_enabled = True
+    pending_lines = iter(lines)
+    while True:
+        for line in pending_lines:
+            if line.endswith("\n"):
+                line = line[:-1]
+            if fence_open:
+                block_lines.append(line)
+                if line.strip() == "```":
+                    fence_open = False
+            elif len(line) == 0:
+                if block_lines:
+                    block = "\n".join(block_lines).strip()
+                    block_lines = []
+                    if len(block) > 0:
+                        yield block
+            else:
+                if fences_enabled and not block_lines and is_fence_opening(line):
+                    fence_open = True
+                block_lines.append(line)
+        if not fence_open:
+            break
+        fence_open = False
+        fences_enabled = False
+        pending_lines = iter(block_lines)
+        block_lines = []
+    block = "\n".join(block_lines).strip()
+    if len(block) > 0:
+        yield block
+
+def is_fence_opening(line):
+    stripped_line = line.strip()
+    return stripped_line.startswith("```") and "`" not in stripped_line[3:]
+
+def iter_classified_blocks(lines):
+    for block in iter_markdown_blocks(lines):
+        yield block, block_to_block_type(block)
+
+def block_to_block_type(markdown):
+    if HEADING_PATTERN.match(markdown):
+        return BlockType.HEADING
+    if markdown.startswith("```") and CODE_BLOCK_PATTERN.fullmatch(markdown):
+        return BlockType.CODE
+    is_quote = True
+    is_unordered_list = True
+    is_ordered_list = True
+    line_number = 0
+    for line in markdown.split("\n"):
+        line_number += 1
+        first_character = line[:1]
+        is_quote = is_quote and first_character == ">"
+        is_unordered_list = is_unordered_list and first_character == "-"
+        if is_ordered_list:
+            number_match = ORDERED_LINE_NUMBER_PATTERN.search(line)
+            is_ordered_list = number_match is not None and int(number_match.group()) == line_number
+        if not (is_quote or is_unordered_list or is_ordered_list):
+            return BlockType.PARAGRAPH
+    if is_quote:
+        return BlockType.QUOTE
+    if is_unordered_list:
+        return BlockType.UNORDERED_LIST
+    if is_ordered_list:
+        return BlockType.ORDERED_LIST
+    return BlockType.PARAGRAPH
+
+def markdown_to_blocks_legacy(markdown):
     block_strings = markdown.split("\n\n")
     block_strings = map(lambda x : x.strip(), block_strings)
     return remove_empty_strings(block_strings)
 
-def block_to_block_type(markdown):
-    if re.search('^#{1,6} .*', markdown):
+def block_to_block_type_legacy(markdown):
+    if LEGACY_HEADING_PATTERN.search(markdown):
         return BlockType.HEADING
-    if re.search('^```\n([^`])*\n```$', markdown):
+    if LEGACY_CODE_BLOCK_PATTERN.search(markdown):
         return BlockType.CODE
     if check_every_line_starts_with(markdown, '>'):
         return BlockType.QUOTE
@@ -139,7 +316,7 @@ def check_every_line_starts_with(text, character):
 def check_if_ordered_list(text):
     text_lines = text.split("\n")
     for i in range(0, len(text_lines)):
-        results = re.search(r"(\d+).*", text_lines[i])
+        results = LEGACY_ORDERED_LINE_PATTERN.search(text_lines[i])
         if results is None:
             return False
         if int(results.group(1)) != i + 1:
@@ -147,14 +324,73 @@ def check_if_ordered_list(text):
     return True
 
 def markdown_to_html_node(markdown):
-    blocks = markdown_to_blocks(markdown)
+    with profile_stage("block_splitting"):
+        blocks = markdown_to_blocks(markdown)
     return_nodes = []
     for block in blocks:
-        block_type = block_to_block_type(block)
-        html_node = create_html_node(block, block_type)
+        with profile_stage("classification"):
+            block_type = block_to_block_type(block)
+        with profile_stage("html_tree"):
+            html_node = create_html_node(block, block_type)
         return_nodes.append(html_node)
     return ParentNode(tag="div", children=return_nodes)
 
+def markdown_to_rendered_node(markdown):
+    with profile_stage("block_splitting"):
+        blocks = markdown_to_blocks(markdown)
+    return_nodes = []
+    for block in blocks:
+        with profile_stage("classification"):
+            block_type = block_to_block_type(block)
+        return_nodes.append(MarkdownBlock(block, block_type))
+    return ParentNode(tag="div", children=return_nodes)
+
+def iter_html_chunks(markdown_stream):
+    has_blocks = False
+    for block, block_type in iter_classified_blocks(markdown_stream):
+        if not has_blocks:
+            has_blocks = True
+            yield "<div>"
+        yield from MarkdownBlock(block, block_type).iter_html()
+    if not has_blocks:
+        raise ValueError("All parent nodes must have at least one child node.")
+    yield "</div>"
+
+class MarkdownFile:
+    def __init__(self, path):
+        self.path = path
+
+    def iter_html(self):
+        with(open(self.path, 'r') as markdown_file):
+            read_front_matter(markdown_file)
+            yield from iter_html_chunks(markdown_file)
+
+    def to_html(self):
+        return "".join(self.iter_html())
+
+class MarkdownBlock:
+    __slots__ = ("text", "type")
+
+    def __init__(self, text, type):
+        self.text = text
+        self.type = type
+
+    def iter_html(self):
+        if len(self.text) > MEMO_MAX_FRAGMENT_LENGTH:
+            yield from render_block_node(self.text, self.type).iter_html()
+        else:
+            yield html_block_memo(self.text, self.type, image_attributes_key)
+
+    def to_html(self):
+        return "".join(self.iter_html())
+
+def render_block_node(text, type):
+    with profile_stage("html_tree"):
+        return create_html_node(text, type)
+
+def render_block_html(text, type, attributes_key):
+    return render_block_node(text, type).to_html()
+
 def create_html_node(text, type):
     match type:
         case BlockType.HEADING:
@@ -176,6 +412,42 @@ def create_html_node(text, type):
             paragraph = parse_paragraph(text)
             return paragraph
 
+inline_memo = LRUMemo(parse_inline_markdown_text_uncached, DEFAULT_MEMO_SIZE)
+html_block_memo = LRUMemo(render_block_html, DEFAULT_MEMO_SIZE)
+
+def configure_memo(max_size):
+    inline_memo.resize(max_size)
+    html_block_memo.resize(max_size)
+
+def clear_memos():
+    inline_memo.clear()
+    html_block_memo.clear()
+
+def get_memo_size():
+    return inline_memo.max_size
+
+def take_memo_stats():
+    return {"inline": inline_memo.take_stats(), "html_block": html_block_memo.take_stats()}
+
+def add_memo_stats(stats):
+    inline_memo.add_stats(*stats["inline"])
+    html_block_memo.add_stats(*stats["html_block"])
+
+image_attributes_key = ""
+
+def configure_image_attributes(attributes):
+    global image_attributes_key
+    if attributes == get_image_attributes():
+        return
+    set_image_attributes(attributes)
+    if attributes is None:
+        image_attributes_key = ""
+    else:
+        image_attributes_key = hashlib.sha256(json.dumps(attributes, sort_keys=True).encode("utf-8")).hexdigest()
+
+def get_image_attributes_key():
+    return image_attributes_key
+
 def parse_paragraph(text):
     text_nodes = parse_inline_markdown_text(text)
     html_nodes = list(map(lambda x: TextNode.textnode_to_html_node(x), text_nodes))
@@ -198,7 +470,7 @@ def get_unordered_list_leaves(markdown):
     return unordered_list_nodes
 
 def get_ordered_list_leaves(markdown):
-    lines = remove_empty_strings(re.split(r"\n*\d+. ", markdown))
+    lines = remove_empty_strings(ORDERED_LIST_ITEM_PATTERN.split(markdown))
     ordered_list_nodes = []
     for line in lines:
         ordered_list_nodes.append(get_list_element(line))
@@ -209,12 +481,48 @@ def get_list_element(text):
     html_nodes = list(map(lambda x: TextNode.textnode_to_html_node(x), text_nodes))
     return ParentNode(tag="li", children=html_nodes)
 
+def markdown_to_text_blocks(markdown):
+    text_blocks = []
+    for block in markdown_to_blocks(markdown):
+        block_type = block_to_block_type(block)
+        text_blocks.append((block_type, block_to_text(block, block_type)))
+    return text_blocks
+
+def block_to_text(text, type):
+    match type:
+        case BlockType.HEADING:
+            return text[get_heading_level(text) + 1:]
+        case BlockType.CODE:
+            return text[4:-3]
+        case BlockType.QUOTE:
+            return get_quote_text(text)
+        case BlockType.UNORDERED_LIST:
+            items = text[2:].split("\n- ")
+        case BlockType.ORDERED_LIST:
+            items = remove_empty_strings(ORDERED_LIST_ITEM_PATTERN.split(text))
+        case _:
+            items = [text]
+    return "\n".join(get_inline_text(item) for item in items)
+
+def get_inline_text(text):
+    if not INLINE_MARKUP_PATTERN.search(text):
+        return text
+    return "".join(text_node.text for text_node in parse_inline_markdown_text(text))
+
 def extract_title(markdown):
-    title_match = re.findall(r"^#\s*(.*)\n", markdown)
+    title_match = TITLE_PATTERN.findall(markdown)
     if len(title_match) < 1:
         raise ValueError("The file submitted does not have a title.")
     return title_match[0].strip()
 
+def extract_stream_title(markdown_stream):
+    header = ""
+    for line in markdown_stream:
+        header += line
+        if not EMPTY_HEADING_PATTERN.fullmatch(header):
+            break
+    return extract_title(header)
+
 def get_nodes_string(text_nodes):
     return_string = ""
     for text_node in text_nodes:
@@ -0,0 +1,49 @@
+from collections import OrderedDict
+
+MISSING = object()
+
+class LRUMemo:
+    def __init__(self, function, max_size):
+        self.function = function
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, *key):
+        if self.max_size < 1:
+            self.misses += 1
+            return self.function(*key)
+        value = self.entries.get(key, MISSING)
+        if value is MISSING:
+            self.misses += 1
+            value = self.function(*key)
+            self.entries[key] = value
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+            return value
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def resize(self, max_size):
+        self.max_size = max_size
+        while len(self.entries) > max(max_size, 0):
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    def take_stats(self):
+        stats = (self.hits, self.misses)
+        self.hits, self.misses = 0, 0
+        return stats
+
+    def add_stats(self, hits, misses):
+        self.hits += hits
+        self.misses += misses
+
+def format_hit_rate(hits, misses):
+    lookups = hits + misses
+    hit_rate = hits / lookups if lookups > 0 else 0.0
+    return f"{hits} hits, {misses} misses ({hit_rate:.1%} hit rate)"
@@ -0,0 +1,71 @@
+import json
+import os
+import textwrap
+
+from discovery import get_page_url
+from document_cache import CACHE_DIRECTORY
+from front_matter import split_front_matter
+from markdown_parser import BlockType, block_to_block_type, extract_title, markdown_to_blocks, parse_inline_markdown_text
+from textnode import TextType
+
+METADATA_INDEX_VERSION = 1
+METADATA_INDEX_PATH = os.path.join(CACHE_DIRECTORY, "metadata.json")
+SUMMARY_LENGTH = 200
+
+def extract_summary(markdown):
+    for block in markdown_to_blocks(markdown):
+        if block_to_block_type(block) != BlockType.PARAGRAPH:
+            continue
+        text_nodes = parse_inline_markdown_text(block)
+        if all(text_node.text_type in (TextType.LINK, TextType.IMAGE) or len(text_node.text.strip()) == 0 for text_node in text_nodes):
+            continue
+        return textwrap.shorten("".join(text_node.text for text_node in text_nodes), SUMMARY_LENGTH, placeholder=" …")
+    return ""
+
+def read_page_metadata(source_path):
+    with(open(source_path, 'r') as markdown_file):
+        metadata, markdown = split_front_matter(markdown_file.read())
+    metadata["title"] = metadata.get("title") or extract_title(markdown)
+    if "summary" not in metadata:
+        metadata["summary"] = extract_summary(markdown)
+    return metadata
+
+def new_metadata_index():
+    return {"version": METADATA_INDEX_VERSION, "pages": {}}
+
+def load_metadata_index(path):
+    try:
+        with(open(path, 'r') as index_file):
+            index = json.load(index_file)
+    except (OSError, ValueError):
+        return new_metadata_index()
+    if not isinstance(index, dict) or index.get("version") != METADATA_INDEX_VERSION:
+        return new_metadata_index()
+    return index
+
+def save_metadata_index(path, index):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temporary_path = f"{path}.tmp"
+    with(open(temporary_path, 'w') as index_file):
+        json.dump(index, index_file, indent=1, sort_keys=True)
+    os.replace(temporary_path, path)
+
+def update_metadata_index(page_sources, output_directory, path=METADATA_INDEX_PATH):
+    previous_pages = load_metadata_index(path)["pages"]
+    index = new_metadata_index()
+    read = 0
+    for source_path in sorted(page_sources):
+        source_hash = page_sources[source_path][0]
+        entry = previous_pages.get(source_path)
+        if entry is None or entry["hash"] != source_hash:
+            try:
+                entry = {"hash": source_hash, "metadata": read_page_metadata(source_path)}
+            except Exception as exception:
+                raise ValueError(f"Failed to read the metadata of {source_path}: {exception}") from exception
+            read += 1
+        index["pages"][source_path] = entry
+    save_metadata_index(path, index)
+    entries = []
+    for source_path, entry in index["pages"].items():
+        entries.append(dict(entry["metadata"], url=get_page_url(page_sources[source_path][1], output_directory)))
+    return entries, read
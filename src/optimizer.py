@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import posixpath
+
+from asset_sync import find_assets
+from manifest import hash_file
+from patterns import (CSS_COLON_PATTERN, CSS_PUNCTUATION_PATTERN, CSS_STRING_OR_COMMENT_PATTERN, CSS_STRING_PATTERN, CSS_URL_PATTERN, HTML_BLOCK_TAG_PATTERN,
+    HTML_COMMENT_PATTERN, HTML_PRESERVED_PATTERN, WHITESPACE_PATTERN)
+
+ASSET_MANIFEST_NAME = "asset-manifest.json"
+HASHED_EXTENSIONS = (".css", ".js", ".mjs", ".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif", ".svg", ".woff", ".woff2", ".ttf", ".otf", ".eot")
+HASH_LENGTH = 8
+
+def minify_html(html_string):
+    parts = []
+    position = 0
+    for match in HTML_PRESERVED_PATTERN.finditer(html_string):
+        parts.append(minify_html_text(html_string[position:match.start()]))
+        parts.append(match.group(0))
+        position = match.end()
+    parts.append(minify_html_text(html_string[position:]))
+    return "".join(parts).strip()
+
+def minify_html_text(text):
+    text = HTML_COMMENT_PATTERN.sub("", text)
+    text = WHITESPACE_PATTERN.sub(" ", text)
+    return HTML_BLOCK_TAG_PATTERN.sub(r"\1", text)
+
+def minify_css(css):
+    css = CSS_STRING_OR_COMMENT_PATTERN.sub(lambda match: match.group(1) if match.group(1) is not None else " ", css)
+    parts = []
+    position = 0
+    for match in CSS_STRING_PATTERN.finditer(css):
+        parts.append(minify_css_code(css[position:match.start()]))
+        parts.append(match.group(0))
+        position = match.end()
+    parts.append(minify_css_code(css[position:]))
+    return "".join(parts).strip()
+
+def minify_css_code(code):
+    code = WHITESPACE_PATTERN.sub(" ", code)
+    code = CSS_PUNCTUATION_PATTERN.sub(r"\1", code)
+    return CSS_COLON_PATTERN.sub(":", code).replace(";}", "}")
+
+def is_hashed_asset(path):
+    return os.path.splitext(path)[1].lower() in HASHED_EXTENSIONS
+
+def get_hashed_path(path, digest):
+    stem, extension = os.path.splitext(path)
+    return f"{stem}.{digest[:HASH_LENGTH]}{extension}"
+
+def get_asset_url(source_path, static_directory):
+    return "/" + os.path.relpath(source_path, static_directory).replace(os.sep, "/")
+
+def split_url(url):
+    for index, character in enumerate(url):
+        if character in "?#":
+            return url[:index], url[index:]
+    return url, ""
+
+def rewrite_asset_url(url, asset_urls, page_url="/"):
+    path, suffix = split_url(url)
+    if path.startswith("/"):
+        return asset_urls.get(path, path) + suffix
+    if len(path) == 0 or "://" in path or path.startswith(("data:", "#")):
+        return url
+    target = posixpath.normpath(posixpath.join(posixpath.dirname(page_url), path))
+    if target not in asset_urls:
+        return url
+    return posixpath.join(posixpath.dirname(path), posixpath.basename(asset_urls[target])) + suffix
+
+def rewrite_css_urls(css, css_url, asset_urls):
+    return CSS_URL_PATTERN.sub(lambda match: f"url({match.group(1)}{rewrite_asset_url(match.group(2), asset_urls, css_url)}{match.group(1)})", css)
+
+def hash_asset(source_path, source_stat, previous_entry=None):
+    if previous_entry is not None and previous_entry.get("size") == source_stat.st_size and previous_entry.get("mtime_ns") == source_stat.st_mtime_ns:
+        return previous_entry["hash"]
+    return hash_file(source_path)
+
+def plan_assets(static_directory, output_directory, previous_entries=None, minify=False, hash_assets=False):
+    previous_entries = previous_entries or {}
+    copies = {}
+    transformed = {}
+    asset_urls = {}
+    entries = {}
+    assets = find_assets(static_directory, output_directory) if os.path.isdir(static_directory) else []
+    transform_css = minify or hash_assets
+    stylesheets = []
+    for source_path, destination_path, source_stat in assets:
+        if transform_css and source_path.lower().endswith(".css"):
+            stylesheets.append((source_path, destination_path))
+            continue
+        entries[source_path] = {"output": destination_path}
+        if hash_assets and is_hashed_asset(source_path):
+            digest = hash_asset(source_path, source_stat, previous_entries.get(source_path))
+            destination_path = get_hashed_path(destination_path, digest)
+            asset_urls[get_asset_url(source_path, static_directory)] = get_hashed_path(get_asset_url(source_path, static_directory), digest)
+            entries[source_path] = {"output": destination_path, "hash": digest, "size": source_stat.st_size, "mtime_ns": source_stat.st_mtime_ns}
+        copies[source_path] = destination_path
+    for source_path, destination_path in stylesheets:
+        with(open(source_path, 'r') as css_file):
+            css = css_file.read()
+        asset_url = get_asset_url(source_path, static_directory)
+        if hash_assets:
+            css = rewrite_css_urls(css, asset_url, asset_urls)
+        if minify:
+            css = minify_css(css)
+        if hash_assets:
+            digest = hashlib.sha256(css.encode("utf-8")).hexdigest()
+            destination_path = get_hashed_path(destination_path, digest)
+            asset_urls[asset_url] = get_hashed_path(asset_url, digest)
+        entries[source_path] = {"output": destination_path}
+        transformed[source_path] = (destination_path, css)
+    return copies, transformed, asset_urls, entries
+
+def create_asset_manifest(asset_urls):
+    return json.dumps({url.lstrip("/"): hashed_url.lstrip("/") for url, hashed_url in sorted(asset_urls.items())}, indent=1, sort_keys=True) + "\n"
@@ -0,0 +1,81 @@
+import json
+import os
+
+from manifest import remove_output
+
+COMPARE_CHUNK_SIZE = 1 << 16
+
+class OutputFile:
+    def __init__(self, path):
+        self.path = path
+        self.temporary_path = f"{path}.{os.getpid()}.tmp"
+        self.output_file = None
+        self.changed = None
+
+    def __enter__(self):
+        self.output_file = open(self.temporary_path, 'w')
+        return self.output_file
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.output_file.close()
+        if exception_type is not None:
+            os.remove(self.temporary_path)
+            return False
+        if files_equal(self.temporary_path, self.path):
+            os.remove(self.temporary_path)
+            self.changed = False
+        else:
+            os.replace(self.temporary_path, self.path)
+            self.changed = True
+        return False
+
+def write_output(path, content):
+    output = OutputFile(path)
+    with output as output_file:
+        output_file.write(content)
+    return output.changed
+
+def files_equal(first_path, second_path):
+    try:
+        if os.path.getsize(first_path) != os.path.getsize(second_path):
+            return False
+    except FileNotFoundError:
+        return False
+    with(open(first_path, 'rb') as first_file):
+        with(open(second_path, 'rb') as second_file):
+            while True:
+                first_chunk = first_file.read(COMPARE_CHUNK_SIZE)
+                if first_chunk != second_file.read(COMPARE_CHUNK_SIZE):
+                    return False
+                if not first_chunk:
+                    return True
+
+def find_outputs(output_directory):
+    outputs = []
+    directories = [output_directory]
+    while directories:
+        directory = directories.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.path)
+                else:
+                    outputs.append(entry.path)
+    return sorted(outputs)
+
+def prune_outputs(output_directory, expected_outputs):
+    expected_outputs = set(os.path.normpath(path) for path in expected_outputs)
+    removed = []
+    for path in find_outputs(output_directory):
+        if os.path.normpath(path) not in expected_outputs:
+            remove_output(path, output_directory)
+            removed.append(path)
+    return removed
+
+def write_change_list(path, output_directory, changed, removed):
+    change_list = {
+        "changed": sorted(set(os.path.relpath(output_path, output_directory) for output_path in changed)),
+        "removed": sorted(set(os.path.relpath(output_path, output_directory) for output_path in removed)),
+    }
+    with(open(path, 'w') as change_list_file):
+        json.dump(change_list, change_list_file, indent=1)
@@ -0,0 +1,30 @@
+import re
+
+IMAGE_PATTERN = re.compile(r"!\[(.*?)\]\((.*?)\)")
+LINK_PATTERN = re.compile(r"(?:^|[^!])\[(.*?)\]\((.*?)\)")
+INLINE_REFERENCE_PATTERN = re.compile(r"(!?)\[((?:(?!!\[).)*?)\]\((.*?)\)")
+HEADING_PATTERN = re.compile(r"#{1,6} ")
+CODE_BLOCK_PATTERN = re.compile(r"```\n[^`]*\n```")
+ORDERED_LINE_NUMBER_PATTERN = re.compile(r"\d+")
+ORDERED_LIST_ITEM_PATTERN = re.compile(r"\n*\d+. ")
+TITLE_PATTERN = re.compile(r"^#\s*(.*)\n")
+EMPTY_HEADING_PATTERN = re.compile(r"#\s*")
+LEGACY_HEADING_PATTERN = re.compile(r"^#{1,6} .*")
+LEGACY_CODE_BLOCK_PATTERN = re.compile(r"^```\n([^`])*\n```$")
+LEGACY_ORDERED_LINE_PATTERN = re.compile(r"(\d+).*")
+PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+SRCSET_PATTERN = re.compile(r'srcset="([^"]*)"')
+URL_ATTRIBUTE_PATTERN = re.compile(r'(href|src)="/([^"]*)"')
+CSS_URL_PATTERN = re.compile(r"""url\(\s*(['"]?)([^'")\s]+)\1\s*\)""")
+CSS_STRING_OR_COMMENT_PATTERN = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|/\*.*?\*/""", re.DOTALL)
+CSS_STRING_PATTERN = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')""")
+CSS_PUNCTUATION_PATTERN = re.compile(r"\s*([{};,>])\s*")
+CSS_COLON_PATTERN = re.compile(r":\s+")
+HTML_PRESERVED_PATTERN = re.compile(r"<(pre|textarea|script|style)\b.*?</\1\s*>", re.DOTALL | re.IGNORECASE)
+HTML_COMMENT_PATTERN = re.compile(r"<!--(?!\[if).*?-->", re.DOTALL)
+HTML_BLOCK_TAG_PATTERN = re.compile(r"\s*(</?(?:!doctype|html|head|body|meta|link|title|div|p|h[1-6]|ul|ol|li|article|section|nav|header|footer|main|aside|blockquote|figure|figcaption|table|thead|tbody|tfoot|tr|td|th|br|hr)\b[^>]*>)\s*", re.IGNORECASE)
+WHITESPACE_PATTERN = re.compile(r"\s+")
+TERM_PATTERN = re.compile(r"\w+")
+INLINE_MARKUP_PATTERN = re.compile(r"[*_`\[]")
+FRONT_MATTER_PATTERN = re.compile(r"---[ \t]*\r?\n(.*?)^---[ \t]*(?:\r?\n|\Z)", re.DOTALL | re.MULTILINE)
+FRONT_MATTER_LINE_PATTERN = re.compile(r"([A-Za-z_][\w-]*)\s*:\s*(.*)")
@@ -0,0 +1,111 @@
+import queue
+import threading
+
+DEFAULT_IO_THREADS = 4
+DEFAULT_QUEUE_SIZE = 16
+QUEUE_POLL_SECONDS = 0.1
+STOP = object()
+
+class Pipeline:
+    def __init__(self, read, render, write, io_threads=DEFAULT_IO_THREADS, queue_size=DEFAULT_QUEUE_SIZE):
+        self.read = read
+        self.render = render
+        self.write = write
+        self.io_threads = io_threads
+        self.pending_items = queue.Queue()
+        self.read_items = queue.Queue(maxsize=queue_size)
+        self.rendered_items = queue.Queue(maxsize=queue_size)
+        self.stopped = threading.Event()
+        self.errors = []
+        self.results = {}
+        self.lock = threading.Lock()
+
+    def run(self, items):
+        items = list(items)
+        for index, item in enumerate(items):
+            self.pending_items.put((index, item))
+        readers = [self.start_thread(self.run_reader) for _ in range(0, self.io_threads)]
+        writers = [self.start_thread(self.run_writer) for _ in range(0, self.io_threads)]
+        try:
+            self.run_renderer()
+        except BaseException as exception:
+            self.fail(exception)
+        for thread in readers + writers:
+            thread.join()
+        if self.errors:
+            raise self.errors[0]
+        return [self.results[index] for index in range(0, len(items))]
+
+    def start_thread(self, target):
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        return thread
+
+    def run_reader(self):
+        while not self.stopped.is_set():
+            try:
+                index, item = self.pending_items.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                data = self.read(item)
+            except Exception as exception:
+                self.fail(exception)
+                return
+            if not self.put(self.read_items, (index, item, data)):
+                return
+        self.put(self.read_items, STOP)
+
+    def run_renderer(self):
+        running_readers = self.io_threads
+        while running_readers > 0:
+            read_item = self.get(self.read_items)
+            if read_item is STOP:
+                running_readers -= 1
+                continue
+            if read_item is None:
+                return
+            index, item, data = read_item
+            if not self.put(self.rendered_items, (index, item, self.render(item, data))):
+                return
+        for _ in range(0, self.io_threads):
+            self.put(self.rendered_items, STOP)
+
+    def run_writer(self):
+        while True:
+            rendered_item = self.get(self.rendered_items)
+            if rendered_item is STOP or rendered_item is None:
+                return
+            index, item, output = rendered_item
+            try:
+                result = self.write(item, output)
+            except Exception as exception:
+                self.fail(exception)
+                return
+            with self.lock:
+                self.results[index] = result
+
+    def put(self, target_queue, value):
+        while not self.stopped.is_set():
+            try:
+                target_queue.put(value, timeout=QUEUE_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def get(self, source_queue):
+        while True:
+            try:
+                return source_queue.get(timeout=QUEUE_POLL_SECONDS)
+            except queue.Empty:
+                if self.stopped.is_set():
+                    return None
+
+    def fail(self, exception):
+        with self.lock:
+            self.errors.append(exception)
+        self.stopped.set()
+
+def run_pipeline(items, read, render, write, io_threads=DEFAULT_IO_THREADS, queue_size=DEFAULT_QUEUE_SIZE):
+    return Pipeline(read, render, write, io_threads, queue_size).run(items)
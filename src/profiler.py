@@ -0,0 +1,134 @@
+import contextlib
+import json
+import os
+import sys
+import time
+
+class Profiler:
+    def __init__(self):
+        self.records = []
+        self.page_records = []
+        self.stack = []
+        self.current_page = None
+
+    @contextlib.contextmanager
+    def page(self, page_path):
+        previous_page = self.current_page
+        self.current_page = page_path
+        start = time.perf_counter()
+        blocks_before = sys.getallocatedblocks()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self.page_records.append((page_path, start, duration, sys.getallocatedblocks() - blocks_before, os.getpid()))
+            self.current_page = previous_page
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        self.stack.append(0.0)
+        start = time.perf_counter()
+        blocks_before = sys.getallocatedblocks()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            allocated_blocks = sys.getallocatedblocks() - blocks_before
+            child_duration = self.stack.pop()
+            if self.stack:
+                self.stack[-1] += duration
+            self.records.append((self.current_page, name, start, duration, duration - child_duration, allocated_blocks, os.getpid()))
+
+    def take_records(self):
+        records, page_records = self.records, self.page_records
+        self.records, self.page_records = [], []
+        return records, page_records
+
+    def add_records(self, records, page_records):
+        self.records.extend(records)
+        self.page_records.extend(page_records)
+
+    def get_stage_summary(self):
+        summary = {}
+        for _, name, _, _, self_duration, allocated_blocks, _ in self.records:
+            stage_summary = summary.setdefault(name, {"calls": 0, "seconds": 0.0, "allocated_blocks": 0})
+            stage_summary["calls"] += 1
+            stage_summary["seconds"] += self_duration
+            stage_summary["allocated_blocks"] += allocated_blocks
+        return summary
+
+    def get_page_summary(self):
+        pages = {}
+        for page_path, _, duration, allocated_blocks, _ in self.page_records:
+            pages[page_path] = {"seconds": duration, "allocated_blocks": allocated_blocks, "stages": {}}
+        for page_path, name, _, _, self_duration, _, _ in self.records:
+            if page_path in pages:
+                stages = pages[page_path]["stages"]
+                stages[name] = stages.get(name, 0.0) + self_duration
+        return pages
+
+    def get_slowest_pages(self, count):
+        pages = self.get_page_summary()
+        return sorted(pages.items(), key=lambda item: item[1]["seconds"], reverse=True)[:count]
+
+    def print_report(self, slowest_count=10):
+        stage_summary = self.get_stage_summary()
+        total_seconds = sum(stage["seconds"] for stage in stage_summary.values())
+        print(f"{'stage':<18} {'calls':>8} {'seconds':>10} {'share':>7} {'alloc blocks':>13}")
+        for name, stage in sorted(stage_summary.items(), key=lambda item: item[1]["seconds"], reverse=True):
+            share = stage["seconds"] / total_seconds if total_seconds > 0 else 0.0
+            print(f"{name:<18} {stage['calls']:>8} {stage['seconds']:>10.4f} {share:>7.1%} {stage['allocated_blocks']:>13}")
+        print(f"Slowest {slowest_count} pages:")
+        for page_path, page in self.get_slowest_pages(slowest_count):
+            slowest_stage = max(page["stages"].items(), key=lambda item: item[1], default=("-", 0.0))[0]
+            print(f"{page['seconds'] * 1000:>9.2f} ms  {page_path} (mostly {slowest_stage})")
+
+    def write_json(self, path):
+        report = {
+            "stages": self.get_stage_summary(),
+            "pages": self.get_page_summary(),
+        }
+        with(open(path, 'w') as report_file):
+            json.dump(report, report_file, indent=1, sort_keys=True)
+
+    def write_chrome_trace(self, path):
+        origin = min([record[2] for record in self.records] + [record[1] for record in self.page_records], default=0.0)
+        events = []
+        for page_path, start, duration, allocated_blocks, pid in self.page_records:
+            events.append(create_trace_event(page_path, "page", start - origin, duration, pid, {"allocated_blocks": allocated_blocks}))
+        for page_path, name, start, duration, _, allocated_blocks, pid in self.records:
+            events.append(create_trace_event(name, "stage", start - origin, duration, pid, {"page": page_path, "allocated_blocks": allocated_blocks}))
+        with(open(path, 'w') as trace_file):
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, trace_file)
+
+def create_trace_event(name, category, start, duration, pid, arguments):
+    return {
+        "name": name,
+        "cat": category,
+        "ph": "X",
+        "ts": start * 1000000,
+        "dur": duration * 1000000,
+        "pid": pid,
+        "tid": pid,
+        "args": arguments,
+    }
+
+NULL_STAGE = contextlib.nullcontext()
+active_profiler = None
+
+def set_profiler(profiler):
+    global active_profiler
+    active_profiler = profiler
+
+def get_profiler():
+    return active_profiler
+
+def profile_stage(name):
+    if active_profiler is None:
+        return NULL_STAGE
+    return active_profiler.stage(name)
+
+def profile_page(page_path):
+    if active_profiler is None:
+        return NULL_STAGE
+    return active_profiler.page(page_path)
@@ -0,0 +1,178 @@
+import bisect
+import heapq
+import json
+import os
+
+from discovery import get_page_url
+from document_cache import CACHE_DIRECTORY
+from front_matter import split_front_matter
+from markdown_parser import BlockType, extract_title, markdown_to_text_blocks
+from output_writer import write_output
+from patterns import TERM_PATTERN
+
+SEARCH_INDEX_VERSION = 1
+SEARCH_STATE_VERSION = 2
+SEARCH_DIRECTORY = "search"
+SEARCH_STATE_PATH = os.path.join(CACHE_DIRECTORY, "search.json")
+DEFAULT_SEARCH_SHARDS = 64
+TITLE_FIELD = 1
+HEADING_FIELD = 2
+BODY_FIELD = 4
+MAX_TERM_LENGTH = 32
+FNV_OFFSET_BASIS = 0x811C9DC5
+FNV_PRIME = 0x01000193
+
+def tokenize(text):
+    return [term for term in TERM_PATTERN.findall(text.lower()) if len(term) <= MAX_TERM_LENGTH]
+
+def extract_search_document(markdown):
+    metadata, markdown = split_front_matter(markdown)
+    title = metadata.get("title") or extract_title(markdown)
+    fields = [(TITLE_FIELD, title)]
+    skipped_title = False
+    for block_type, text in markdown_to_text_blocks(markdown):
+        if block_type == BlockType.HEADING:
+            if not skipped_title and text.strip() == title:
+                skipped_title = True
+                continue
+            fields.append((HEADING_FIELD, text))
+        else:
+            fields.append((BODY_FIELD, text))
+    terms = {}
+    position = 0
+    for field, text in fields:
+        for term in tokenize(text):
+            occurrences = terms.setdefault(term, [0])
+            occurrences[0] |= field
+            occurrences.append(position)
+            position += 1
+    return title, terms
+
+def create_posting(document_id, occurrences):
+    positions = occurrences[1:]
+    return [document_id, occurrences[0], positions[0]] + [position - previous for previous, position in zip(positions, positions[1:])]
+
+def get_term_shard(term, shards):
+    digest = FNV_OFFSET_BASIS
+    for byte in term.encode("utf-8"):
+        digest = ((digest ^ byte) * FNV_PRIME) & 0xFFFFFFFF
+    return digest % shards
+
+def get_search_outputs(output_directory, shards):
+    search_directory = os.path.join(output_directory, SEARCH_DIRECTORY)
+    shard_paths = [os.path.join(search_directory, f"index-{shard}.json") for shard in range(shards)]
+    return shard_paths, os.path.join(search_directory, "documents.json"), os.path.join(search_directory, "meta.json")
+
+def dump_search_json(value):
+    return json.dumps(value, separators=(",", ":"), sort_keys=True, ensure_ascii=False)
+
+def new_search_state(output_directory, shards):
+    return {"version": SEARCH_STATE_VERSION, "output_directory": os.path.abspath(output_directory), "shards": shards, "documents": [], "free_ids": [], "pages": {}}
+
+def load_search_state(path, output_directory, shards):
+    shard_paths, documents_path, meta_path = get_search_outputs(output_directory, shards)
+    if not all(os.path.isfile(output_path) for output_path in shard_paths + [documents_path, meta_path]):
+        return None
+    try:
+        with(open(path, 'r') as state_file):
+            state = json.load(state_file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get("version") != SEARCH_STATE_VERSION or state.get("shards") != shards:
+        return None
+    if state.get("output_directory") != os.path.abspath(output_directory):
+        return None
+    return state
+
+def save_search_state(path, state):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temporary_path = f"{path}.tmp"
+    with(open(temporary_path, 'w') as state_file):
+        state_file.write(json.dumps(state, separators=(",", ":"), sort_keys=True))
+    os.replace(temporary_path, path)
+
+def load_search_shard(path):
+    with(open(path, 'r') as shard_file):
+        return json.load(shard_file)
+
+def remove_postings(shard, term, document_id):
+    postings = [posting for posting in shard.get(term, []) if posting[0] != document_id]
+    if postings:
+        shard[term] = postings
+    else:
+        shard.pop(term, None)
+
+def allocate_document_id(documents, free_ids):
+    if free_ids:
+        return heapq.heappop(free_ids)
+    documents.append(None)
+    return len(documents) - 1
+
+def release_document_id(documents, free_ids, document_id):
+    documents[document_id] = None
+    heapq.heappush(free_ids, document_id)
+
+def read_search_document(source_path):
+    with(open(source_path, 'r') as markdown_file):
+        return extract_search_document(markdown_file.read())
+
+def build_search_index(page_sources, output_directory, state_path=SEARCH_STATE_PATH, shards=DEFAULT_SEARCH_SHARDS):
+    shard_paths, documents_path, meta_path = get_search_outputs(output_directory, shards)
+    state = load_search_state(state_path, output_directory, shards)
+    rebuild = state is None
+    if rebuild:
+        state = new_search_state(output_directory, shards)
+    documents = state["documents"]
+    free_ids = state["free_ids"]
+    pages = state["pages"]
+    changed = []
+    for source_path in sorted(page_sources):
+        source_hash, destination_path = page_sources[source_path]
+        page = pages.get(source_path)
+        if page is None or page["hash"] != source_hash or documents[page["id"]]["url"] != get_page_url(destination_path, output_directory):
+            changed.append(source_path)
+    removed = sorted(set(pages) - set(page_sources))
+    extracted = {source_path: read_search_document(source_path) for source_path in changed}
+
+    touched = set(range(shards)) if rebuild else set()
+    for source_path in removed + changed:
+        if source_path in pages:
+            touched.update(get_term_shard(term, shards) for term in pages[source_path]["terms"])
+    for _, terms in extracted.values():
+        touched.update(get_term_shard(term, shards) for term in terms)
+    loaded = {shard: {} if rebuild else load_search_shard(shard_paths[shard]) for shard in touched}
+
+    document_ids = {}
+    for source_path in removed + changed:
+        page = pages.pop(source_path, None)
+        if page is None:
+            continue
+        for term in page["terms"]:
+            remove_postings(loaded[get_term_shard(term, shards)], term, page["id"])
+        if source_path in page_sources:
+            document_ids[source_path] = page["id"]
+        else:
+            release_document_id(documents, free_ids, page["id"])
+    for source_path in changed:
+        title, terms = extracted[source_path]
+        document_id = document_ids[source_path] if source_path in document_ids else allocate_document_id(documents, free_ids)
+        documents[document_id] = {"title": title, "url": get_page_url(page_sources[source_path][1], output_directory)}
+        pages[source_path] = {"hash": page_sources[source_path][0], "id": document_id, "terms": sorted(terms)}
+        for term, occurrences in terms.items():
+            bisect.insort(loaded[get_term_shard(term, shards)].setdefault(term, []), create_posting(document_id, occurrences))
+    if documents and documents[-1] is None:
+        while documents and documents[-1] is None:
+            documents.pop()
+        free_ids[:] = [document_id for document_id in free_ids if document_id < len(documents)]
+        heapq.heapify(free_ids)
+
+    written = []
+    os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+    meta = {"version": SEARCH_INDEX_VERSION, "shards": shards, "hash": "fnv1a-32", "positions": "delta",
+        "fields": {"title": TITLE_FIELD, "heading": HEADING_FIELD, "body": BODY_FIELD}}
+    outputs = [(shard_paths[shard], loaded[shard]) for shard in sorted(loaded)] + [(documents_path, documents), (meta_path, meta)]
+    for output_path, value in outputs:
+        if write_output(output_path, dump_search_json(value)):
+            written.append(output_path)
+    save_search_state(state_path, state)
+    return shard_paths + [documents_path, meta_path], written, len(changed), len(removed)
@@ -0,0 +1,107 @@
+import os
+import re
+import shutil
+
+from asset_sync import copy_asset
+from output_writer import files_equal, find_outputs, prune_outputs
+
+SHARDS_DIRECTORY = ".ssg-shards"
+SHARD_NAME_PATTERN = re.compile(r"^(\d+)-of-(\d+)(\.manifest\.json)?$")
+
+def parse_shard(value):
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard {value}, expected i/N such as 1/4.")
+    if count < 1 or index < 1 or index > count:
+        raise ValueError(f"Invalid shard {value}, expected 1 <= i <= N.")
+    return index, count
+
+def get_shard_name(shard):
+    index, count = shard
+    return f"{index}-of-{count}"
+
+def assign_shards(pages, count):
+    page_sizes = sorted(((os.path.getsize(page[0]), page) for page in pages), key=lambda item: (-item[0], item[1]))
+    shards = [[] for _ in range(0, count)]
+    shard_sizes = [0] * count
+    for size, page in page_sizes:
+        index = min(range(0, count), key=lambda shard_index: (shard_sizes[shard_index], shard_index))
+        shards[index].append(page)
+        shard_sizes[index] += size
+    return [sorted(shard) for shard in shards], shard_sizes
+
+def select_shard_pages(pages, shard):
+    if shard is None:
+        return pages
+    index, count = shard
+    shards, _ = assign_shards(pages, count)
+    return shards[index - 1]
+
+def copies_assets(shard):
+    return shard is None or shard[0] == 1
+
+def parse_shard_name(name):
+    match = SHARD_NAME_PATTERN.match(name)
+    if match is None:
+        return None
+    return int(match.group(1)), int(match.group(2))
+
+def find_shard_directories(shards_directory=SHARDS_DIRECTORY):
+    if not os.path.isdir(shards_directory):
+        return []
+    shard_directories = {}
+    for entry in os.scandir(shards_directory):
+        shard = parse_shard_name(entry.name)
+        if entry.is_dir() and shard is not None:
+            shard_directories[shard] = entry.path
+    counts = sorted(set(count for _, count in shard_directories))
+    if len(counts) > 1:
+        raise ValueError(f"Shard output trees in {shards_directory} were built with different shard counts ({', '.join(str(count) for count in counts)}), rebuild them with one count.")
+    if not counts:
+        return []
+    count = counts[0]
+    missing = [get_shard_name((index, count)) for index in range(1, count + 1) if (index, count) not in shard_directories]
+    if missing:
+        raise ValueError(f"Missing shard output trees in {shards_directory}: {', '.join(missing)}")
+    return [shard_directories[(index, count)] for index in range(1, count + 1)]
+
+def remove_other_shard_counts(count, shards_directory=SHARDS_DIRECTORY):
+    if not os.path.isdir(shards_directory):
+        return []
+    removed = []
+    for entry in os.scandir(shards_directory):
+        shard = parse_shard_name(entry.name)
+        if shard is None or shard[1] == count:
+            continue
+        if entry.is_dir():
+            shutil.rmtree(entry.path, ignore_errors=True)
+        else:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+        removed.append(entry.path)
+    return sorted(removed)
+
+def merge_shards(shard_directories, output_directory):
+    sources = {}
+    conflicts = []
+    for shard_directory in shard_directories:
+        for source_path in find_outputs(shard_directory):
+            relative_path = os.path.relpath(source_path, shard_directory)
+            if relative_path not in sources:
+                sources[relative_path] = source_path
+            elif not files_equal(sources[relative_path], source_path):
+                conflicts.append(f"{relative_path} ({sources[relative_path]} and {source_path})")
+    if conflicts:
+        raise ValueError(f"Shards produced different files for the same output: {', '.join(conflicts)}")
+    os.makedirs(output_directory, exist_ok=True)
+    changed = []
+    for relative_path, source_path in sorted(sources.items()):
+        destination_path = os.path.join(output_directory, relative_path)
+        if not files_equal(source_path, destination_path):
+            copy_asset(source_path, destination_path)
+            changed.append(destination_path)
+    removed = prune_outputs(output_directory, [os.path.join(output_directory, relative_path) for relative_path in sources])
+    return changed, removed
@@ -0,0 +1,621 @@
+import contextlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from compression import DEFAULT_COMPRESSION_THRESHOLD, DEFAULT_COMPRESSION_WORKERS, compress_outputs, find_compressed_outputs
+from dependency_graph import find_broken_links, find_referencing_pages, load_dependency_graph, save_dependency_graph, update_dependency_graph
+from asset_sync import DEFAULT_ASSET_WORKERS, sync_assets
+from discovery import create_output_directories, discover_pages
+from feeds import ATOM_FEED_NAME, DEFAULT_FEED_SIZE, RSS_FEED_NAME, SITEMAP_NAME, create_atom_feed, create_rss_feed, create_sitemap
+from front_matter import read_front_matter, split_front_matter
+from document_cache import CACHE_DIRECTORY, DEFAULT_CACHE_SIZE, configure_document_cache, get_document_cache, get_document_cache_settings
+from images import DEFAULT_IMAGE_WIDTHS, IMAGE_CACHE_DIRECTORY, process_images, supports_variants
+from listings import DEFAULT_LISTING_PAGE_SIZE, create_listing_pages
+from manifest import (create_entry, find_outdated_sources, find_removed_outputs, hash_file, is_output_path, load_manifest, new_manifest, remove_output,
+    save_manifest)
+from markdown_parser import (DEFAULT_MEMO_SIZE, MarkdownFile, add_memo_stats, configure_image_attributes, configure_memo, extract_stream_title,
+    extract_title, get_inline_parser, get_memo_size, markdown_to_rendered_node, set_inline_parser, take_memo_stats)
+from memo import format_hit_rate
+from metadata_index import METADATA_INDEX_PATH, update_metadata_index
+from optimizer import ASSET_MANIFEST_NAME, create_asset_manifest, minify_html, plan_assets
+from output_writer import OutputFile, prune_outputs, write_change_list, write_output
+from pipeline import DEFAULT_QUEUE_SIZE, run_pipeline
+from sharding import copies_assets, select_shard_pages
+from profiler import Profiler, get_profiler, profile_page, profile_stage, set_profiler
+from search_index import DEFAULT_SEARCH_SHARDS, SEARCH_STATE_PATH, build_search_index
+from template import get_asset_urls, load_template, set_asset_urls
+from textnode import get_image_attributes
+
+MANIFEST_PATH = ".ssg-manifest.json"
+CHANGES_PATH = ".ssg-changes.json"
+DOCUMENT_CACHE_DIRECTORY = os.path.join(CACHE_DIRECTORY, "documents")
+DEPENDENCY_GRAPH_PATH = os.path.join(CACHE_DIRECTORY, "dependencies.json")
+SITE_STATE_DIRECTORY = os.path.join(CACHE_DIRECTORY, "sites")
+FROM_OUTPUT_DIRECTORY = object()
+DEFAULT_STREAMING_THRESHOLD = 32 * 1024 * 1024
+quiet = False
+streaming_threshold = DEFAULT_STREAMING_THRESHOLD
+pipeline_options = {"io_threads": 0, "queue_size": DEFAULT_QUEUE_SIZE}
+asset_sync_options = {"link_mode": "auto", "workers": DEFAULT_ASSET_WORKERS, "compare_hash": False}
+image_options = {"enabled": True, "widths": DEFAULT_IMAGE_WIDTHS, "cache_directory": IMAGE_CACHE_DIRECTORY}
+optimization_options = {"minify": False, "hash_assets": False}
+compression_options = {"enabled": False, "threshold": DEFAULT_COMPRESSION_THRESHOLD, "workers": DEFAULT_COMPRESSION_WORKERS}
+search_options = {"enabled": False, "shards": DEFAULT_SEARCH_SHARDS, "state_path": SEARCH_STATE_PATH}
+site_index_options = {"site_url": None, "sitemap": False, "feeds": False, "feed_size": DEFAULT_FEED_SIZE, "listings": (), "listing_page_size": DEFAULT_LISTING_PAGE_SIZE,
+    "index_path": METADATA_INDEX_PATH}
+BUILD_OPTION_DICTS = (pipeline_options, asset_sync_options, image_options, optimization_options, compression_options, search_options, site_index_options)
+DEFAULT_BUILD_OPTIONS = {
+    "jobs": 1,
+    "inline_parser": "scanner",
+    "cache_directory": FROM_OUTPUT_DIRECTORY,
+    "cache_size": DEFAULT_CACHE_SIZE,
+    "memo_size": DEFAULT_MEMO_SIZE,
+    "streaming_threshold": DEFAULT_STREAMING_THRESHOLD,
+    "io_threads": 0,
+    "queue_size": DEFAULT_QUEUE_SIZE,
+    "link_mode": "auto",
+    "asset_workers": DEFAULT_ASSET_WORKERS,
+    "asset_hash": False,
+    "images": True,
+    "image_widths": DEFAULT_IMAGE_WIDTHS,
+    "image_cache_directory": IMAGE_CACHE_DIRECTORY,
+    "minify": False,
+    "hash_assets": False,
+    "compress": False,
+    "compression_threshold": DEFAULT_COMPRESSION_THRESHOLD,
+    "compression_workers": DEFAULT_COMPRESSION_WORKERS,
+    "search_index": False,
+    "search_shards": DEFAULT_SEARCH_SHARDS,
+    "search_state_path": FROM_OUTPUT_DIRECTORY,
+    "site_url": None,
+    "sitemap": False,
+    "feeds": False,
+    "feed_size": DEFAULT_FEED_SIZE,
+    "listings": (),
+    "listing_page_size": DEFAULT_LISTING_PAGE_SIZE,
+    "metadata_index_path": FROM_OUTPUT_DIRECTORY,
+    "quiet": False,
+    "profiler": None,
+    "shard": None,
+}
+
+class SiteBuilder:
+    def __init__(self, content_directory="content", template_path="template.html", static_directory="static", output_directory="docs",
+            base_path="/", manifest_path=FROM_OUTPUT_DIRECTORY, changes_path=None, dependency_graph_path=FROM_OUTPUT_DIRECTORY, **options):
+        unknown_options = sorted(set(options) - set(DEFAULT_BUILD_OPTIONS))
+        if unknown_options:
+            raise ValueError(f"Unknown build options {', '.join(unknown_options)}, expected some of {', '.join(DEFAULT_BUILD_OPTIONS)}.")
+        if options.get("shard") is not None and any(options.get(name) for name in ("search_index", "sitemap", "feeds", "listings")):
+            raise ValueError("The search index, sitemap, feeds and listings need every page, build them without a shard.")
+        self.content_directory = content_directory
+        self.template_path = template_path
+        self.static_directory = static_directory
+        self.output_directory = output_directory
+        self.base_path = base_path
+        self.manifest_path = self.get_state_path(manifest_path, "manifest.json")
+        self.changes_path = changes_path
+        self.dependency_graph_path = self.get_state_path(dependency_graph_path, "dependencies.json")
+        self.options = dict(DEFAULT_BUILD_OPTIONS, **options)
+        self.options["cache_directory"] = self.get_state_path(self.options["cache_directory"], "documents")
+        self.options["search_state_path"] = self.get_state_path(self.options["search_state_path"], "search.json")
+        self.options["metadata_index_path"] = self.get_state_path(self.options["metadata_index_path"], "metadata.json")
+
+    def get_state_path(self, path, name):
+        if path is FROM_OUTPUT_DIRECTORY:
+            return os.path.join(get_state_directory(self.output_directory), name)
+        return path
+
+    @contextlib.contextmanager
+    def configured(self):
+        build_settings = get_build_settings()
+        try:
+            self.configure()
+            yield self
+        finally:
+            restore_build_settings(build_settings)
+
+    def configure(self):
+        set_inline_parser(self.options["inline_parser"])
+        configure_memo(self.options["memo_size"])
+        configure_document_cache(self.options["cache_directory"], self.options["cache_size"])
+        set_quiet(self.options["quiet"])
+        set_streaming_threshold(self.options["streaming_threshold"])
+        pipeline_options["io_threads"] = self.options["io_threads"]
+        pipeline_options["queue_size"] = self.options["queue_size"]
+        asset_sync_options["link_mode"] = self.options["link_mode"]
+        asset_sync_options["workers"] = self.options["asset_workers"]
+        asset_sync_options["compare_hash"] = self.options["asset_hash"]
+        image_options["enabled"] = self.options["images"]
+        image_options["widths"] = tuple(self.options["image_widths"])
+        image_options["cache_directory"] = self.options["image_cache_directory"]
+        configure_image_attributes(None)
+        optimization_options["minify"] = self.options["minify"]
+        optimization_options["hash_assets"] = self.options["hash_assets"]
+        set_asset_urls({})
+        compression_options["enabled"] = self.options["compress"]
+        compression_options["threshold"] = self.options["compression_threshold"]
+        compression_options["workers"] = self.options["compression_workers"]
+        search_options["enabled"] = self.options["search_index"]
+        search_options["shards"] = self.options["search_shards"]
+        search_options["state_path"] = self.options["search_state_path"]
+        site_index_options["site_url"] = self.options["site_url"] or (self.base_path if "://" in self.base_path else None)
+        if (self.options["sitemap"] or self.options["feeds"]) and site_index_options["site_url"] is None:
+            raise ValueError("The sitemap and feeds need absolute URLs, use an absolute base path or set site_url.")
+        site_index_options["sitemap"] = self.options["sitemap"]
+        site_index_options["feeds"] = self.options["feeds"]
+        site_index_options["feed_size"] = self.options["feed_size"]
+        site_index_options["listings"] = tuple(self.options["listings"])
+        site_index_options["listing_page_size"] = self.options["listing_page_size"]
+        site_index_options["index_path"] = self.options["metadata_index_path"]
+        set_profiler(self.options["profiler"])
+
+    def build(self, incremental=False):
+        with self.configured():
+            build_site = build_incremental if incremental else build_full
+            changed, removed = build_site(self.content_directory, self.template_path, self.static_directory, self.output_directory,
+                self.base_path, self.manifest_path, self.options["jobs"], self.dependency_graph_path, self.options["shard"])
+            if self.changes_path is not None:
+                write_change_list(self.changes_path, self.output_directory, changed, removed)
+                log(f"Build finished: {len(changed)} changed, {len(removed)} removed, listed in {self.changes_path}")
+            report_memo_stats()
+        return changed, removed
+
+    def render_markdown(self, markdown_content, variables=None):
+        with self.configured():
+            template = load_template(self.template_path)
+            return render_page_html(template, create_page_variables(markdown_content, self.base_path, variables), self.base_path)
+
+    def build_pages(self, pages, variables=None):
+        changed = []
+        for relative_path, markdown_content in sorted(pages.items()):
+            destination_path = os.path.join(self.output_directory, relative_path)
+            try:
+                page_html = self.render_markdown(markdown_content, variables)
+            except Exception as exception:
+                raise ValueError(f"Failed to generate page {relative_path}: {exception}") from exception
+            os.makedirs(os.path.dirname(destination_path) or ".", mode=0o777, exist_ok=True)
+            if write_output(destination_path, page_html):
+                changed.append(destination_path)
+        return changed
+
+def get_state_directory(output_directory):
+    output_directory = os.path.abspath(output_directory)
+    return os.path.join(os.path.dirname(output_directory), SITE_STATE_DIRECTORY, os.path.basename(output_directory))
+
+def get_build_settings():
+    return {"worker": get_worker_settings(), "profiler": get_profiler(), "options": [dict(options) for options in BUILD_OPTION_DICTS]}
+
+def restore_build_settings(build_settings):
+    initialize_worker(build_settings["worker"])
+    set_profiler(build_settings["profiler"])
+    for options, saved_options in zip(BUILD_OPTION_DICTS, build_settings["options"]):
+        options.clear()
+        options.update(saved_options)
+
+def set_quiet(value):
+    global quiet
+    quiet = value
+
+def set_streaming_threshold(value):
+    global streaming_threshold
+    streaming_threshold = value
+
+def log(message):
+    if not quiet:
+        print(message)
+
+def get_worker_settings():
+    return {
+        "inline_parser": get_inline_parser(),
+        "memo_size": get_memo_size(),
+        "document_cache": get_document_cache_settings(),
+        "quiet": quiet,
+        "streaming_threshold": streaming_threshold,
+        "image_attributes": get_image_attributes(),
+        "minify": optimization_options["minify"],
+        "asset_urls": get_asset_urls(),
+        "profile": get_profiler() is not None,
+    }
+
+def initialize_worker(worker_settings):
+    set_inline_parser(worker_settings["inline_parser"])
+    configure_memo(worker_settings["memo_size"])
+    configure_document_cache(*worker_settings["document_cache"])
+    set_quiet(worker_settings["quiet"])
+    set_streaming_threshold(worker_settings["streaming_threshold"])
+    configure_image_attributes(worker_settings["image_attributes"])
+    optimization_options["minify"] = worker_settings["minify"]
+    set_asset_urls(worker_settings["asset_urls"])
+    set_profiler(Profiler() if worker_settings["profile"] else None)
+
+def report_memo_stats():
+    memo_stats = take_memo_stats()
+    log(f"Inline fragment memo: {format_hit_rate(*memo_stats['inline'])}")
+    log(f"Block HTML memo: {format_hit_rate(*memo_stats['html_block'])}")
+
+def plan_static_assets(source_directory, destination_directory, previous_entries=None):
+    copies, transformed, asset_urls, entries = plan_assets(source_directory, destination_directory, previous_entries,
+        optimization_options["minify"], optimization_options["hash_assets"])
+    set_asset_urls(asset_urls)
+    return copies, transformed, entries
+
+def sync_static_assets(source_directory, destination_directory, asset_plan, previous_entries=None):
+    copies, transformed, entries = asset_plan
+    _, copied, _ = sync_assets(source_directory, destination_directory, (), destinations=copies, **asset_sync_options)
+    changed = [destination_path for _, destination_path, _ in copied]
+    for destination_path, content in sorted(transformed.values()):
+        os.makedirs(os.path.dirname(destination_path) or ".", exist_ok=True)
+        if write_output(destination_path, content):
+            changed.append(destination_path)
+    previous_outputs = [entry["output"] for entry in (previous_entries or {}).values()]
+    removed = remove_stale_outputs(previous_outputs, [entry["output"] for entry in entries.values()], destination_directory)
+    log(f"Synced {source_directory} to {destination_directory}: {len(changed)} copied, {len(removed)} removed, {len(entries) - len(changed)} unchanged")
+    return entries, changed, removed
+
+def sync_shard_assets(source_directory, destination_directory, asset_plan, previous_entries=None, shard=None):
+    if copies_assets(shard):
+        return sync_static_assets(source_directory, destination_directory, asset_plan, previous_entries)
+    previous_outputs = [entry["output"] for entry in (previous_entries or {}).values()]
+    return {}, [], remove_stale_outputs(previous_outputs, (), destination_directory)
+
+def write_asset_manifest(destination_directory, previous_path=None, shard=None):
+    optimization = {"minify": optimization_options["minify"], "asset_urls": dict(get_asset_urls()), "asset_manifest": None}
+    written = []
+    if optimization_options["hash_assets"] and copies_assets(shard):
+        optimization["asset_manifest"] = os.path.join(destination_directory, ASSET_MANIFEST_NAME)
+        if write_output(optimization["asset_manifest"], create_asset_manifest(get_asset_urls())):
+            written.append(optimization["asset_manifest"])
+    removed = remove_stale_outputs([previous_path] if previous_path is not None else [], [optimization["asset_manifest"]], destination_directory)
+    return optimization, written, removed
+
+def compress_site_outputs(outputs, destination_directory, previous_record=None):
+    paths = outputs if compression_options["enabled"] else []
+    record, written, removed = compress_outputs(paths, destination_directory, previous_record, compression_options["threshold"], compression_options["workers"])
+    for removed_output in removed:
+        log(f"Removing {removed_output}")
+    if compression_options["enabled"]:
+        log(f"Precompressed {len(record['files'])} files: {len(written)} compressed files written, {len(record['files']) - len(set(os.path.splitext(path)[0] for path in written))} reused")
+    return record, written, removed
+
+def write_search_index(page_sources, destination_directory, previous_outputs=None):
+    outputs = []
+    written = []
+    if search_options["enabled"]:
+        outputs, written, indexed, removed = build_search_index(page_sources, destination_directory, search_options["state_path"], search_options["shards"])
+        log(f"Search index: {indexed} pages indexed, {removed} removed, {len(written)} of {len(outputs)} files written")
+    return outputs, written, remove_stale_outputs(previous_outputs or [], outputs, destination_directory)
+
+def write_site_index(page_sources, template_path, destination_directory, base_path, previous_outputs=None):
+    outputs = []
+    written = []
+    if site_index_options["sitemap"] or site_index_options["feeds"] or site_index_options["listings"]:
+        entries, read = update_metadata_index(page_sources, destination_directory, site_index_options["index_path"])
+        log(f"Metadata index: {read} of {len(entries)} pages read")
+        outputs, written, listing_entries = write_listing_pages(entries, page_sources, template_path, destination_directory, base_path)
+        site_url = site_index_options["site_url"]
+        documents = []
+        if site_index_options["sitemap"]:
+            documents.append((SITEMAP_NAME, create_sitemap(entries + listing_entries, site_url)))
+        if site_index_options["feeds"]:
+            documents.append((ATOM_FEED_NAME, create_atom_feed(entries, site_url, site_index_options["feed_size"])))
+            documents.append((RSS_FEED_NAME, create_rss_feed(entries, site_url, site_index_options["feed_size"])))
+        for name, content in documents:
+            output_path = os.path.join(destination_directory, name)
+            outputs.append(output_path)
+            if write_output(output_path, content):
+                written.append(output_path)
+    return outputs, written, remove_stale_outputs(previous_outputs or [], outputs, destination_directory)
+
+def write_listing_pages(entries, page_sources, template_path, destination_directory, base_path):
+    page_outputs = set(destination_path for _, destination_path in page_sources.values())
+    outputs = []
+    written = []
+    listing_entries = []
+    for section in site_index_options["listings"]:
+        for url, markdown_content in create_listing_pages(entries, section, site_index_options["listing_page_size"]):
+            output_path = os.path.join(destination_directory, *url.strip("/").split("/"), "index.html")
+            if output_path in page_outputs:
+                raise ValueError(f"The listing of {section} would overwrite the page {output_path}.")
+            page_variables = create_page_variables(markdown_content, base_path)
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            if write_output(output_path, render_page_html(load_template(template_path), page_variables, base_path)):
+                written.append(output_path)
+            outputs.append(output_path)
+            listing_entries.append({"url": url, "title": page_variables["Title"]})
+    return outputs, written, listing_entries
+
+def process_static_images(source_directory, destination_directory, asset_plan, shard=None, previous_entries=None):
+    if not image_options["enabled"]:
+        configure_image_attributes(None)
+        return None, [], []
+    destinations = {source_path: entry["output"] for source_path, entry in asset_plan[2].items()}
+    previous_entries = dict(previous_entries or {})
+    previous_entries.update({source_path: entry for source_path, entry in asset_plan[2].items() if "hash" in entry})
+    attributes, variant_outputs, written, source_entries = process_images(source_directory, destination_directory, image_options["widths"],
+        image_options["cache_directory"], copies_assets(shard), asset_sync_options["link_mode"], asset_sync_options["workers"], destinations, previous_entries)
+    for source_path, source_entry in source_entries.items():
+        if source_path in asset_plan[2]:
+            asset_plan[2][source_path].update(source_entry)
+    configure_image_attributes(attributes)
+    if not supports_variants():
+        log(f"Read the dimensions of {len(attributes)} images, install Pillow to also generate resized and WebP variants")
+    else:
+        log(f"Processed {len(attributes)} images: {len(written)} variants written, {len(variant_outputs) - len(written)} unchanged")
+    return attributes, variant_outputs, written
+
+def remove_stale_outputs(previous_outputs, outputs, destination_directory):
+    outputs = set(outputs)
+    removed = []
+    for output_path in sorted(set(previous_outputs)):
+        if output_path not in outputs and is_output_path(output_path, destination_directory) and os.path.isfile(output_path):
+            log(f"Removing {output_path}")
+            remove_output(output_path, destination_directory)
+            removed.append(output_path)
+    return removed
+
+def find_pages_with_changed_images(previous_attributes, attributes, manifest_pages, page_sources, dependency_graph_path=None):
+    previous_attributes = previous_attributes or {}
+    attributes = attributes or {}
+    changed_urls = set(url for url in set(previous_attributes) | set(attributes) if previous_attributes.get(url) != attributes.get(url))
+    if not changed_urls:
+        return []
+    if dependency_graph_path is None:
+        return sorted(page_sources)
+    graph = load_dependency_graph(dependency_graph_path)
+    if any(page_path not in graph["pages"] for page_path in manifest_pages):
+        return sorted(page_sources)
+    return [page_path for page_path in find_referencing_pages(graph, changed_urls) if page_path in page_sources]
+
+def generate_page(from_path, template_path, dest_path, base_path, variables=None):
+    log(f"Generating page from {from_path} to {dest_path} using {template_path}")
+    with profile_page(from_path):
+        if os.path.getsize(from_path) >= streaming_threshold:
+            return generate_streamed_page(from_path, template_path, dest_path, base_path, variables)
+        with profile_stage("reading"):
+            with(open(from_path, 'r') as markdown_file):
+                markdown_content = markdown_file.read()
+        template = load_template(template_path)
+        page_variables = create_page_variables(markdown_content, base_path, variables)
+        del markdown_content
+        output = OutputFile(dest_path)
+        if get_profiler() is None and not optimization_options["minify"]:
+            with output as html_file:
+                template.render(html_file, page_variables, base_path)
+            return output.changed
+        with profile_stage("serialization"):
+            page_variables["Content"] = page_variables["Content"].to_html()
+        page_html = render_page_html(template, page_variables, base_path)
+        with profile_stage("writing"):
+            with output as html_file:
+                html_file.write(page_html)
+        return output.changed
+
+def create_page_variables(markdown_content, base_path, variables=None):
+    page_variables = {"BasePath": base_path}
+    if variables is not None:
+        page_variables.update(variables)
+    metadata, markdown_content = split_front_matter(markdown_content)
+    page_variables["Title"] = metadata.get("title") or extract_title(markdown_content)
+    document_cache = get_document_cache()
+    if document_cache is None:
+        page_variables["Content"] = markdown_to_rendered_node(markdown_content)
+    else:
+        with profile_stage("document_cache"):
+            page_variables["Content"] = document_cache.get_or_render(markdown_content, markdown_to_rendered_node)
+    return page_variables
+
+def read_page_source(page_job):
+    from_path = page_job[0]
+    if os.path.getsize(from_path) >= streaming_threshold:
+        return None
+    with(open(from_path, 'r') as markdown_file):
+        return markdown_file.read()
+
+def render_page_source(page_job, markdown_content):
+    from_path, template_path, dest_path, base_path = page_job
+    if markdown_content is None:
+        return None, generate_page(from_path, template_path, dest_path, base_path)
+    log(f"Generating page from {from_path} to {dest_path} using {template_path}")
+    with profile_page(from_path):
+        template = load_template(template_path)
+        page_variables = create_page_variables(markdown_content, base_path)
+        return render_page_html(template, page_variables, base_path), None
+
+def render_page_html(template, page_variables, base_path):
+    with profile_stage("templating"):
+        page_html = template.render_string(page_variables, base_path)
+    if optimization_options["minify"]:
+        with profile_stage("minifying"):
+            page_html = minify_html(page_html)
+    return page_html
+
+def write_page_output(page_job, rendered_page):
+    page_html, changed = rendered_page
+    if page_html is None:
+        return changed
+    return write_output(page_job[2], page_html)
+
+def run_page_stage(stage, page_job, *arguments):
+    try:
+        return stage(page_job, *arguments)
+    except Exception as exception:
+        raise ValueError(f"Failed to generate page from {page_job[0]}: {exception}") from exception
+
+def generate_pages_pipelined(page_jobs):
+    return run_pipeline(
+        page_jobs,
+        lambda page_job: run_page_stage(read_page_source, page_job),
+        lambda page_job, markdown_content: run_page_stage(render_page_source, page_job, markdown_content),
+        lambda page_job, rendered_page: run_page_stage(write_page_output, page_job, rendered_page),
+        **pipeline_options,
+    )
+
+def generate_streamed_page(from_path, template_path, dest_path, base_path, variables=None):
+    template = load_template(template_path)
+    page_variables = {"BasePath": base_path}
+    if variables is not None:
+        page_variables.update(variables)
+    with profile_stage("reading"):
+        with(open(from_path, 'r') as markdown_file):
+            metadata = read_front_matter(markdown_file)
+            page_variables["Title"] = metadata.get("title") or extract_stream_title(markdown_file)
+    page_variables["Content"] = MarkdownFile(from_path)
+    output = OutputFile(dest_path)
+    with profile_stage("streaming"):
+        with output as html_file:
+            template.render(html_file, page_variables, base_path)
+    return output.changed
+
+def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, base_path, jobs=1):
+    return generate_pages(discover_pages(dir_path_content, dest_dir_path), template_path, base_path, jobs)
+
+def generate_pages(pages, template_path, base_path, jobs=1):
+    create_output_directories(pages)
+    page_jobs = [(from_path, template_path, dest_path, base_path) for from_path, dest_path in sorted(pages)]
+    changed = []
+    if jobs <= 1 and pipeline_options["io_threads"] > 0 and len(page_jobs) > 1:
+        for page_job, page_changed in zip(page_jobs, generate_pages_pipelined(page_jobs)):
+            if page_changed:
+                changed.append(page_job[2])
+    elif jobs <= 1 or len(page_jobs) <= 1:
+        for page_job in page_jobs:
+            if generate_page_job(page_job):
+                changed.append(page_job[2])
+    else:
+        chunk_size = max(1, len(page_jobs) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs, initializer=initialize_worker, initargs=(get_worker_settings(),)) as executor:
+            for page_job, (page_changed, memo_stats, profile_records) in zip(page_jobs, executor.map(generate_page_worker_job, page_jobs, chunksize=chunk_size)):
+                if page_changed:
+                    changed.append(page_job[2])
+                add_memo_stats(memo_stats)
+                if profile_records is not None:
+                    get_profiler().add_records(*profile_records)
+    if get_document_cache() is not None:
+        get_document_cache().evict()
+    return changed
+
+def generate_page_job(page_job):
+    from_path, template_path, dest_path, base_path = page_job
+    try:
+        return generate_page(from_path, template_path, dest_path, base_path)
+    except Exception as exception:
+        raise ValueError(f"Failed to generate page from {from_path}: {exception}") from exception
+
+def generate_page_worker_job(page_job):
+    page_changed = generate_page_job(page_job)
+    if get_profiler() is None:
+        return page_changed, take_memo_stats(), None
+    return page_changed, take_memo_stats(), get_profiler().take_records()
+
+def get_asset_destination(asset_path, source_directory, destination_directory):
+    return os.path.join(destination_directory, os.path.relpath(asset_path, source_directory))
+
+def hash_page_sources(dir_path_content, dest_dir_path, shard=None):
+    page_sources = {}
+    for html_file_path, destination_file_path in select_shard_pages(discover_pages(dir_path_content, dest_dir_path), shard):
+        page_sources[html_file_path] = (hash_file(html_file_path), destination_file_path)
+    return page_sources
+
+def build_incremental(dir_path_content, template_path, static_directory, dest_dir_path, base_path, manifest_path, jobs=1, dependency_graph_path=None, shard=None):
+    manifest = load_manifest(manifest_path)
+    if not os.path.isdir(dest_dir_path):
+        os.mkdir(dest_dir_path, mode=0o777)
+    template_hash = hash_file(template_path)
+    page_sources = hash_page_sources(dir_path_content, dest_dir_path, shard)
+
+    removed_pages = find_removed_outputs(manifest["pages"], page_sources, dest_dir_path)
+    for removed_output in removed_pages:
+        log(f"Removing {removed_output}")
+        remove_output(removed_output, dest_dir_path)
+
+    asset_plan = plan_static_assets(static_directory, dest_dir_path, manifest["assets"])
+    asset_entries, copied_assets, removed_assets = sync_shard_assets(static_directory, dest_dir_path, asset_plan, manifest["assets"], shard)
+    image_attributes, variant_outputs, written_variants = process_static_images(static_directory, dest_dir_path, asset_plan, shard, manifest["assets"])
+    removed_variants = remove_stale_outputs(manifest["images"]["variants"], variant_outputs, dest_dir_path)
+    optimization, written_asset_manifest, removed_asset_manifest = write_asset_manifest(dest_dir_path, manifest["optimization"]["asset_manifest"], shard)
+
+    force_pages = manifest["template_hash"] != template_hash or manifest["base_path"] != base_path
+    force_pages = force_pages or (manifest["images"]["attributes"] is None) != (image_attributes is None)
+    force_pages = force_pages or manifest["optimization"]["minify"] != optimization["minify"] or manifest["optimization"]["asset_urls"] != optimization["asset_urls"]
+    outdated_pages = find_outdated_sources(manifest["pages"], page_sources, force=force_pages)
+    if not force_pages:
+        image_pages = find_pages_with_changed_images(manifest["images"]["attributes"], image_attributes, manifest["pages"], page_sources, dependency_graph_path)
+        outdated_pages = sorted(set(outdated_pages) | set(image_pages))
+    changed_pages = generate_pages([(html_file_path, page_sources[html_file_path][1]) for html_file_path in outdated_pages], template_path, base_path, jobs)
+
+    search_outputs, written_search, removed_search = write_search_index(page_sources, dest_dir_path, manifest["search"])
+    site_index_outputs, written_site_index, removed_site_index = write_site_index(page_sources, template_path, dest_dir_path, base_path, manifest["site_index"])
+
+    outputs = [destination_path for _, destination_path in page_sources.values()] + [entry["output"] for entry in asset_entries.values()] + variant_outputs
+    outputs += search_outputs + site_index_outputs
+    if optimization["asset_manifest"] is not None:
+        outputs.append(optimization["asset_manifest"])
+    compression, written_compressed, removed_compressed = compress_site_outputs(outputs, dest_dir_path, manifest["compression"])
+
+    images = {"attributes": image_attributes, "variants": sorted(variant_outputs)}
+    save_build_manifest(manifest_path, base_path, template_hash, page_sources, asset_entries, images, optimization, compression, search_outputs,
+        site_index_outputs)
+    record_dependencies(dependency_graph_path, page_sources, asset_plan[2], template_path, dest_dir_path, static_directory, outputs)
+    changed = copied_assets + written_variants + written_asset_manifest + changed_pages + written_search + written_site_index + written_compressed
+    removed = removed_pages + removed_assets + removed_variants + removed_asset_manifest + removed_search + removed_site_index + removed_compressed
+    return changed, removed
+
+def build_full(dir_path_content, template_path, static_directory, dest_dir_path, base_path, manifest_path, jobs=1, dependency_graph_path=None, shard=None):
+    os.makedirs(dest_dir_path, mode=0o777, exist_ok=True)
+    asset_plan = plan_static_assets(static_directory, dest_dir_path)
+    asset_entries, copied_assets, _ = sync_shard_assets(static_directory, dest_dir_path, asset_plan, {}, shard)
+    image_attributes, variant_outputs, written_variants = process_static_images(static_directory, dest_dir_path, asset_plan, shard)
+    optimization, written_asset_manifest, _ = write_asset_manifest(dest_dir_path, None, shard)
+    pages = select_shard_pages(discover_pages(dir_path_content, dest_dir_path), shard)
+    changed_pages = generate_pages(pages, template_path, base_path, jobs)
+    page_sources = hash_page_sources(dir_path_content, dest_dir_path, shard)
+    search_outputs, written_search, _ = write_search_index(page_sources, dest_dir_path)
+    site_index_outputs, written_site_index, _ = write_site_index(page_sources, template_path, dest_dir_path, base_path)
+    expected_outputs = set(entry["output"] for entry in asset_entries.values()) | set(variant_outputs) | set(written_asset_manifest)
+    expected_outputs |= set(destination_path for _, destination_path in pages) | set(search_outputs) | set(site_index_outputs)
+    if optimization["asset_manifest"] is not None:
+        expected_outputs.add(optimization["asset_manifest"])
+    compression, written_compressed, _ = compress_site_outputs(expected_outputs, dest_dir_path, load_manifest(manifest_path)["compression"])
+    expected_outputs |= set(find_compressed_outputs(compression))
+    removed_outputs = prune_outputs(dest_dir_path, expected_outputs)
+    for removed_output in removed_outputs:
+        log(f"Removing {removed_output}")
+    images = {"attributes": image_attributes, "variants": sorted(variant_outputs)}
+    save_build_manifest(manifest_path, base_path, hash_file(template_path), page_sources, asset_entries, images, optimization, compression, search_outputs,
+        site_index_outputs)
+    record_dependencies(dependency_graph_path, page_sources, asset_plan[2], template_path, dest_dir_path, static_directory, expected_outputs)
+    changed = copied_assets + written_variants + written_asset_manifest + changed_pages + written_search + written_site_index + written_compressed
+    return changed, removed_outputs
+
+def save_build_manifest(manifest_path, base_path, template_hash, page_sources, asset_entries, images=None, optimization=None, compression=None,
+        search_outputs=None, site_index_outputs=None):
+    manifest = new_manifest()
+    manifest["base_path"] = base_path
+    manifest["template_hash"] = template_hash
+    if images is not None:
+        manifest["images"] = images
+    if optimization is not None:
+        manifest["optimization"] = optimization
+    if compression is not None:
+        manifest["compression"] = compression
+    if search_outputs is not None:
+        manifest["search"] = sorted(search_outputs)
+    if site_index_outputs is not None:
+        manifest["site_index"] = sorted(site_index_outputs)
+    for html_file_path, (source_hash, destination_path) in page_sources.items():
+        manifest["pages"][html_file_path] = create_entry(source_hash, destination_path)
+    manifest["assets"] = dict(asset_entries)
+    save_manifest(manifest_path, manifest)
+
+def record_dependencies(dependency_graph_path, page_sources, asset_entries, template_path, dest_dir_path, static_directory, generated_outputs=()):
+    if dependency_graph_path is None:
+        return None
+    asset_outputs = {asset_path: get_asset_destination(asset_path, static_directory, dest_dir_path) for asset_path in asset_entries}
+    graph = update_dependency_graph(load_dependency_graph(dependency_graph_path), page_sources, asset_outputs, template_path, dest_dir_path, generated_outputs)
+    save_dependency_graph(dependency_graph_path, graph)
+    for page_path, kind, url in find_broken_links(graph):
+        log(f"Broken {kind} in {page_path}: {url}")
+    return graph
+
+def find_html_files(start_directory):
+    return [html_file_path for html_file_path, _ in discover_pages(start_directory, start_directory)]
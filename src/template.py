@@ -0,0 +1,111 @@
+import os
+
+from optimizer import rewrite_asset_url
+from patterns import PLACEHOLDER_PATTERN, SRCSET_PATTERN, URL_ATTRIBUTE_PATTERN
+
+class Template:
+    def __init__(self, template_content):
+        self.segments = parse_template_segments(template_content)
+        self.base_path_segments = {}
+        self.asset_urls_version = asset_urls_version
+
+    def get_segments(self, base_path):
+        if asset_urls_version != self.asset_urls_version:
+            self.base_path_segments = {}
+            self.asset_urls_version = asset_urls_version
+        if base_path not in self.base_path_segments:
+            rewritten_segments = []
+            for is_variable, text in self.segments:
+                if is_variable:
+                    rewritten_segments.append((is_variable, text))
+                else:
+                    rewritten_segments.append((is_variable, apply_base_path(text, base_path)))
+            self.base_path_segments[base_path] = rewritten_segments
+        return self.base_path_segments[base_path]
+
+    def iter_render(self, variables, base_path="/"):
+        for is_variable, text in self.get_segments(base_path):
+            if not is_variable:
+                yield text
+            elif text not in variables:
+                yield f"{{{{ {text} }}}}"
+            else:
+                yield from iter_variable_chunks(variables[text], base_path)
+
+    def render(self, html_file, variables, base_path="/"):
+        html_file.writelines(self.iter_render(variables, base_path))
+
+    def render_string(self, variables, base_path="/"):
+        return "".join(self.iter_render(variables, base_path))
+
+def parse_template_segments(template_content):
+    segments = []
+    position = 0
+    for match in PLACEHOLDER_PATTERN.finditer(template_content):
+        if match.start() > position:
+            segments.append((False, template_content[position:match.start()]))
+        segments.append((True, match.group(1)))
+        position = match.end()
+    if position < len(template_content):
+        segments.append((False, template_content[position:]))
+    return segments
+
+def iter_variable_chunks(value, base_path):
+    if isinstance(value, str):
+        yield apply_base_path(value, base_path)
+    elif hasattr(value, "iter_html"):
+        if base_path == "/" and not asset_urls:
+            yield from value.iter_html()
+        else:
+            for chunk in value.iter_html():
+                yield apply_base_path(chunk, base_path)
+    else:
+        yield apply_base_path(str(value), base_path)
+
+asset_urls = {}
+asset_urls_version = 0
+
+def set_asset_urls(urls):
+    global asset_urls, asset_urls_version
+    if urls != asset_urls:
+        asset_urls = dict(urls)
+        asset_urls_version += 1
+
+def get_asset_urls():
+    return asset_urls
+
+def apply_base_path(html_string, base_path):
+    if asset_urls:
+        html_string = URL_ATTRIBUTE_PATTERN.sub(lambda match: f"{match.group(1)}=\"{base_path}{rewrite_asset_url('/' + match.group(2), asset_urls)[1:]}\"", html_string)
+    elif base_path == "/":
+        return html_string
+    else:
+        html_string = html_string.replace("href=\"/", f"href=\"{base_path}").replace("src=\"/", f"src=\"{base_path}")
+    if "srcset=\"" in html_string:
+        html_string = SRCSET_PATTERN.sub(lambda match: f"srcset=\"{apply_base_path_to_srcset(match.group(1), base_path)}\"", html_string)
+    return html_string
+
+def apply_base_path_to_srcset(srcset, base_path):
+    candidates = []
+    for candidate in srcset.split(", "):
+        if candidate.startswith("/"):
+            url, _, descriptor = candidate.partition(" ")
+            candidate = f"{base_path}{rewrite_asset_url(url, asset_urls)[1:]} {descriptor}".rstrip()
+        candidates.append(candidate)
+    return ", ".join(candidates)
+
+template_cache = {}
+
+def load_template(template_path):
+    template_stat = os.stat(template_path)
+    cache_key = (template_stat.st_mtime_ns, template_stat.st_size)
+    cached = template_cache.get(template_path)
+    if cached is not None and cached[0] == cache_key:
+        return cached[1]
+    with(open(template_path, 'r') as template_file):
+        template = Template(template_file.read())
+    template_cache[template_path] = (cache_key, template)
+    return template
+
+def clear_template_cache():
+    template_cache.clear()
@@ -0,0 +1,61 @@
+import os
+import unittest
+
+from asset_sync import *
+from fixtures import TemporaryDirectoryTestCase
+
+class TestAssetSync(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.static_directory = os.path.join(self.root, "static")
+        self.docs_directory = os.path.join(self.root, "docs")
+        self.write_file("static/index.css", "body { color: red; }")
+        self.write_file("static/images/tom.png", "not really a png")
+
+    def read_file(self, name):
+        with(open(os.path.join(self.root, name), 'r') as test_file):
+            return test_file.read()
+
+    def test_initial_sync_copies_everything(self):
+        outputs, copied, removed = sync_assets(self.static_directory, self.docs_directory)
+        self.assertEqual(len(outputs), 2)
+        self.assertEqual(len(copied), 2)
+        self.assertEqual(removed, [])
+        self.assertEqual(self.read_file("docs/images/tom.png"), "not really a png")
+
+    def test_unchanged_files_are_skipped(self):
+        sync_assets(self.static_directory, self.docs_directory)
+        _, copied, _ = sync_assets(self.static_directory, self.docs_directory)
+        self.assertEqual(copied, [])
+
+    def test_changed_file_is_copied(self):
+        sync_assets(self.static_directory, self.docs_directory)
+        self.write_file("static/index.css", "body { color: blue; }")
+        _, copied, _ = sync_assets(self.static_directory, self.docs_directory)
+        self.assertEqual([source_path for source_path, _, _ in copied], [os.path.join(self.static_directory, "index.css")])
+        self.assertEqual(self.read_file("docs/index.css"), "body { color: blue; }")
+
+    def test_touched_file_with_hash_comparison(self):
+        sync_assets(self.static_directory, self.docs_directory)
+        source_path = os.path.join(self.static_directory, "index.css")
+        os.utime(source_path, ns=(10 ** 9, 10 ** 9))
+        _, copied, _ = sync_assets(self.static_directory, self.docs_directory, compare_hash=True)
+        self.assertEqual(copied, [])
+        self.assertEqual(os.stat(os.path.join(self.docs_directory, "index.css")).st_mtime_ns, 10 ** 9)
+
+    def test_orphaned_outputs_are_removed(self):
+        outputs, _, _ = sync_assets(self.static_directory, self.docs_directory)
+        os.remove(os.path.join(self.static_directory, "images", "tom.png"))
+        _, _, removed = sync_assets(self.static_directory, self.docs_directory, outputs.values())
+        self.assertEqual(removed, [os.path.join(self.docs_directory, "images", "tom.png")])
+        self.assertFalse(os.path.exists(os.path.join(self.docs_directory, "images")))
+
+    def test_link_modes(self):
+        for link_mode in LINK_MODES:
+            destination_path = os.path.join(self.root, link_mode, "index.css")
+            method = copy_asset(os.path.join(self.static_directory, "index.css"), destination_path, link_mode)
+            self.assertIn(method, ["copy", "hardlink", "reflink"])
+            self.assertEqual(self.read_file(f"{link_mode}/index.css"), "body { color: red; }")
+
+if __name__ == "__main__":
+    unittest.main()
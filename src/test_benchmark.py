@@ -0,0 +1,50 @@
+import os
+import random
+import tempfile
+import unittest
+
+from benchmark import *
+from markdown_parser import take_memo_stats
+
+SETTINGS = {
+    "pages": 3,
+    "blocks": 40,
+    "link_density": 0.2,
+    "image_density": 0.1,
+    "list_length": 3,
+    "code_lines": 2,
+    "seed": 7,
+    "repeat": 1,
+    "base_path": "/site/",
+}
+
+class TestBenchmark(unittest.TestCase):
+    def test_generated_page_is_deterministic(self):
+        first = generate_markdown_page(random.Random(1), SETTINGS, 0)
+        second = generate_markdown_page(random.Random(1), SETTINGS, 0)
+        self.assertEqual(first, second)
+        self.assertEqual(extract_title(first), "Page 0: " + first.split(": ", 1)[1].split("\n", 1)[0])
+
+    def test_generated_page_covers_block_types(self):
+        markdown_content = generate_markdown_page(random.Random(3), SETTINGS, 0)
+        block_types = set(block_to_block_type(block) for block in markdown_to_blocks(markdown_content))
+        self.assertTrue({BlockType.HEADING, BlockType.PARAGRAPH, BlockType.CODE, BlockType.QUOTE, BlockType.UNORDERED_LIST}.issubset(block_types))
+
+    def test_html_tree_stage_does_not_reuse_inline_parsing(self):
+        with tempfile.TemporaryDirectory() as corpus_directory:
+            page_path = os.path.join(corpus_directory, "index.md")
+            with(open(page_path, 'w') as page_file):
+                page_file.write("# Title\n\nA [link](/a) and **bold** text.\n\n- one\n- two")
+            take_memo_stats()
+            benchmark_page(page_path, os.path.join(corpus_directory, "index.html"), Template(TEMPLATE), "/", {stage: 0.0 for stage in STAGES})
+        self.assertEqual(take_memo_stats()["inline"][0], 0)
+
+    def test_run_benchmark(self):
+        with tempfile.TemporaryDirectory() as corpus_directory:
+            results = run_benchmark(SETTINGS, corpus_directory)
+        self.assertEqual(list(results["stages"]), STAGES)
+        self.assertGreater(results["markdown_bytes"], 0)
+        self.assertAlmostEqual(results["total_seconds"], sum(stage["seconds"] for stage in results["stages"].values()))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import gzip
+import os
+import unittest
+
+from compression import *
+from fixtures import TemporaryDirectoryTestCase
+
+class TestCompression(TemporaryDirectoryTestCase):
+    def test_compresses_large_text_outputs(self):
+        page_path = self.write_file("index.html", "<p>hello</p>" * 200)
+        small_path = self.write_file("small.css", "a{}")
+        image_path = self.write_file("a.png", "x" * 4096)
+        record, written, removed = compress_outputs([page_path, small_path, image_path], self.root, threshold=1024, workers=2)
+        self.assertEqual(sorted(record["files"]), [page_path])
+        self.assertEqual(written, get_compressed_paths(page_path))
+        self.assertEqual(removed, [])
+        with(gzip.open(f"{page_path}.gz", 'rt') as compressed_file):
+            self.assertEqual(compressed_file.read(), "<p>hello</p>" * 200)
+        self.assertFalse(os.path.exists(f"{small_path}.gz"))
+        self.assertFalse(os.path.exists(f"{image_path}.gz"))
+
+    def test_unchanged_outputs_are_reused(self):
+        page_path = self.write_file("index.html", "<p>hello</p>" * 200)
+        record, _, _ = compress_outputs([page_path], self.root)
+        os.utime(f"{page_path}.gz", ns=(1000000000, 1000000000))
+        self.assertEqual(compress_outputs([page_path], self.root, record), (record, [], []))
+        self.assertEqual(os.stat(f"{page_path}.gz").st_mtime_ns, 1000000000)
+        self.write_file("index.html", "<p>world</p>" * 200)
+        _, written, _ = compress_outputs([page_path], self.root, record)
+        self.assertEqual(written, get_compressed_paths(page_path))
+
+    def test_stale_compressed_outputs_are_removed(self):
+        page_path = self.write_file("old/index.html", "<p>hello</p>" * 200)
+        record, _, _ = compress_outputs([page_path], self.root)
+        os.remove(page_path)
+        record, written, removed = compress_outputs([], self.root, record)
+        self.assertEqual((record["files"], written), ({}, []))
+        self.assertEqual(removed, [f"{page_path}.gz"])
+        self.assertFalse(os.path.exists(os.path.join(self.root, "old")))
+
+    def test_gzip_output_is_reproducible(self):
+        self.assertEqual(compress_data(b"same bytes", ".gz"), compress_data(b"same bytes", ".gz"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import unittest
+
+from dependency_graph import *
+from fixtures import TemporaryDirectoryTestCase
+
+class TestDependencyGraph(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.docs_directory = os.path.join(self.root, "docs")
+        self.index_path = self.write_file("content/index.md", "# Home\n\n![Tom](/images/tom.png) [Blog](/blog/tom) [Missing](/nowhere) [Ext](https://example.com)")
+        self.post_path = self.write_file("content/blog/tom/index.md", "# Tom\n\n[Home](/) [Image](../../images/tom.png#top) [Section](#intro)")
+        self.page_sources = {
+            self.index_path: ("hash-index", os.path.join(self.docs_directory, "index.html")),
+            self.post_path: ("hash-post", os.path.join(self.docs_directory, "blog", "tom", "index.html")),
+        }
+        self.image_path = os.path.join(self.root, "static", "images", "tom.png")
+        self.asset_outputs = {self.image_path: os.path.join(self.docs_directory, "images", "tom.png")}
+        self.graph = update_dependency_graph(new_dependency_graph(), self.page_sources, self.asset_outputs, "template.html", self.docs_directory)
+
+    def test_extract_page_references(self):
+        self.assertEqual(extract_page_references("[a](/x) ![b](/y.png) [c](/x)"), [("image", "/y.png"), ("link", "/x")])
+
+    def test_get_internal_url_path(self):
+        self.assertEqual(get_internal_url_path("/blog/tom?page=2#top"), "/blog/tom")
+        self.assertEqual(get_internal_url_path("images/a.png"), "images/a.png")
+        for url in ["https://example.com", "//cdn.example.com/a.js", "#intro", "mailto:me@example.com", ""]:
+            self.assertIsNone(get_internal_url_path(url), url)
+
+    def test_dependencies(self):
+        self.assertEqual(find_dependencies(self.graph, self.post_path), sorted([self.index_path, self.image_path, "template.html"]))
+
+    def test_dependents_by_source_or_output_path(self):
+        self.assertEqual(find_dependents(self.graph, self.image_path), sorted([self.index_path, self.post_path]))
+        self.assertEqual(find_dependents(self.graph, os.path.join(self.docs_directory, "blog", "tom", "index.html")), [self.index_path])
+        self.assertEqual(find_dependents(self.graph, "template.html"), sorted([self.index_path, self.post_path]))
+
+    def test_broken_links(self):
+        self.assertEqual(find_broken_links(self.graph), [(self.index_path, "link", "/nowhere")])
+
+    def test_generated_outputs_are_not_broken_links(self):
+        graph = update_dependency_graph(new_dependency_graph(), self.page_sources, self.asset_outputs, "template.html", self.docs_directory,
+            [os.path.join(self.docs_directory, "nowhere", "index.html")])
+        self.assertEqual(find_broken_links(graph), [])
+
+    def test_unchanged_pages_are_not_reread(self):
+        os.remove(self.index_path)
+        graph = update_dependency_graph(self.graph, self.page_sources, {}, "template.html", self.docs_directory)
+        self.assertEqual(find_broken_links(graph), sorted([
+            (self.index_path, "image", "/images/tom.png"),
+            (self.index_path, "link", "/nowhere"),
+            (self.post_path, "link", "../../images/tom.png#top"),
+        ]))
+
+    def test_save_and_load(self):
+        path = os.path.join(self.root, "cache", "dependencies.json")
+        save_dependency_graph(path, self.graph)
+        self.assertEqual(load_dependency_graph(path), self.graph)
+        self.assertEqual(load_dependency_graph(os.path.join(self.root, "missing.json")), new_dependency_graph())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,22 @@
+import threading
+import unittest
+
+from devserver import *
+
+class TestDevServer(unittest.TestCase):
+    def test_inject_live_reload(self):
+        html_bytes = inject_live_reload(b"<html><body><p>hi</p></body></html>")
+        self.assertEqual(html_bytes, b"<html><body><p>hi</p>" + LIVE_RELOAD_SCRIPT.encode("utf-8") + b"</body></html>")
+
+    def test_inject_live_reload_without_body(self):
+        html_bytes = inject_live_reload(b"<p>hi</p>")
+        self.assertTrue(html_bytes.endswith(LIVE_RELOAD_SCRIPT.encode("utf-8")))
+
+    def test_live_reload_state(self):
+        state = LiveReloadState()
+        self.assertEqual(state.wait_for_reload(0, timeout=0.01), 0)
+        threading.Timer(0.01, state.notify_reload).start()
+        self.assertEqual(state.wait_for_reload(0, timeout=2), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import unittest
+
+from discovery import *
+from fixtures import TemporaryDirectoryTestCase
+
+class TestDiscovery(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content_directory = os.path.join(self.root, "content")
+        self.docs_directory = os.path.join(self.root, "docs")
+        for name in ["index.md", "blog/tom/index.md", "blog/drafts/wip/index.md", "notes.txt", "blog/tom/scratch.md"]:
+            self.write_file(f"content/{name}", "# Title\n")
+
+    def relative_pages(self, pages):
+        return [(os.path.relpath(source, self.root), os.path.relpath(destination, self.root)) for source, destination in pages]
+
+    def test_discover_pages(self):
+        pages = self.relative_pages(discover_pages(self.content_directory, self.docs_directory))
+        expected_pages = [
+            ("content/blog/drafts/wip/index.md", "docs/blog/drafts/wip/index.html"),
+            ("content/blog/tom/index.md", "docs/blog/tom/index.html"),
+            ("content/blog/tom/scratch.md", "docs/blog/tom/scratch.html"),
+            ("content/index.md", "docs/index.html"),
+        ]
+        self.assertEqual(pages, expected_pages)
+
+    def test_ignore_rules(self):
+        self.write_file("content/.ssgignore", "# drafts are not published\ndrafts/\nscratch*.md\n")
+        pages = self.relative_pages(discover_pages(self.content_directory, self.docs_directory))
+        self.assertEqual(pages, [("content/blog/tom/index.md", "docs/blog/tom/index.html"), ("content/index.md", "docs/index.html")])
+
+    def test_anchored_and_negated_patterns(self):
+        patterns = [parse_ignore_pattern("/blog/*.md"), parse_ignore_pattern("*.md"), parse_ignore_pattern("!index.md")]
+        self.assertTrue(is_ignored("blog/post.md", False, patterns))
+        self.assertFalse(is_ignored("blog/index.md", False, patterns))
+        self.assertFalse(is_ignored("drafts", False, [parse_ignore_pattern("drafts/")]))
+        self.assertTrue(is_ignored("drafts", True, [parse_ignore_pattern("drafts/")]))
+
+    def test_is_page_ignored(self):
+        patterns = [parse_ignore_pattern("drafts/")]
+        self.assertTrue(is_page_ignored(os.path.join(self.content_directory, "blog", "drafts", "wip", "index.md"), self.content_directory, patterns))
+        self.assertFalse(is_page_ignored(os.path.join(self.content_directory, "blog", "tom", "index.md"), self.content_directory, patterns))
+
+    def test_symlinked_directory_is_walked_once(self):
+        os.symlink(self.content_directory, os.path.join(self.content_directory, "loop"))
+        pages = discover_pages(self.content_directory, self.docs_directory)
+        self.assertEqual(len(pages), 4)
+
+    def test_page_url(self):
+        self.assertEqual(get_page_url(os.path.join(self.docs_directory, "blog", "tom", "index.html"), self.docs_directory), "/blog/tom/")
+        self.assertEqual(get_page_url(os.path.join(self.docs_directory, "index.html"), self.docs_directory), "/")
+        self.assertEqual(get_page_url(os.path.join(self.docs_directory, "blog", "tom", "scratch.html"), self.docs_directory), "/blog/tom/scratch.html")
+
+    def test_create_output_directories(self):
+        pages = discover_pages(self.content_directory, self.docs_directory)
+        create_output_directories(pages)
+        for _, destination_path in pages:
+            self.assertTrue(os.path.isdir(os.path.dirname(destination_path)))
+
+if __name__ == "__main__":
+    unittest.main()
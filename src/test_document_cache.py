@@ -0,0 +1,65 @@
+import os
+import unittest
+
+from document_cache import *
+from fixtures import TemporaryDirectoryTestCase
+from htmlnode import LeafNode, ParentNode
+from markdown_parser import markdown_to_html_node
+from template import Template
+
+class TestDocumentCache(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache = DocumentCache(os.path.join(self.root, "documents"))
+        self.render_calls = 0
+
+    def render(self, markdown_content):
+        self.render_calls += 1
+        return markdown_to_html_node(markdown_content)
+
+    def test_get_or_render_reuses_fragment(self):
+        markdown_content = "# Title\n\nSome **bold** text."
+        first = self.cache.get_or_render(markdown_content, self.render)
+        second = self.cache.get_or_render(markdown_content, self.render)
+        self.assertEqual(self.render_calls, 1)
+        self.assertEqual(first.to_html(), markdown_to_html_node(markdown_content).to_html())
+        self.assertEqual("".join(second.iter_html()), first.to_html())
+
+    def test_large_fragment_chunks_keep_links_whole(self):
+        markdown_content = "# Title\n\n" + "\n\n".join(f"A [page {i}](/page{i}) link" for i in range(0, 5000))
+        fragment = self.cache.get_or_render(markdown_content, self.render)
+        self.assertGreater(os.path.getsize(fragment.path), FRAGMENT_CHUNK_SIZE)
+        self.assertTrue(all(chunk.endswith(">") for chunk in fragment.iter_html()))
+        template = Template("<main>{{ Content }}</main>")
+        page_html = template.render_string({"Content": fragment}, "/BASE/")
+        self.assertEqual(page_html, template.render_string({"Content": markdown_to_html_node(markdown_content).to_html()}, "/BASE/"))
+        self.assertNotIn('href="/page', page_html)
+
+    def test_key_depends_on_content(self):
+        self.assertEqual(self.cache.get_key("# A"), self.cache.get_key("# A"))
+        self.assertNotEqual(self.cache.get_key("# A"), self.cache.get_key("# B"))
+
+    def test_missing_entry(self):
+        self.assertIsNone(self.cache.get(self.cache.get_key("# Never stored")))
+
+    def test_evict_least_recently_used(self):
+        node = ParentNode(tag="p", children=[LeafNode(value="x" * 100)])
+        keys = [self.cache.get_key(f"# Page {i}") for i in range(0, 3)]
+        for i, key in enumerate(keys):
+            self.cache.store(key, node)
+            os.utime(self.cache.get_path(key), ns=(i * 10 ** 9, i * 10 ** 9))
+        self.cache.get(keys[0])
+        self.cache.max_bytes = 250
+        self.assertEqual(self.cache.evict(), 1)
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.assertIsNotNone(self.cache.get(keys[2]))
+
+    def test_stats_and_clear(self):
+        self.cache.store(self.cache.get_key("# A"), LeafNode(tag="p", value="a"))
+        self.assertEqual(self.cache.get_stats(), (1, len("<p>a</p>")))
+        self.cache.clear()
+        self.assertEqual(self.cache.get_stats(), (0, 0))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+from feeds import *
+
+ENTRIES = [
+    {"url": "/", "title": "Home", "summary": "Welcome"},
+    {"url": "/blog/tom/", "title": "Tom & Goldberry", "date": "2024-03-01", "tags": ["tolkien"], "summary": "A <merry> fellow"},
+    {"url": "/blog/ents/", "title": "Ents", "date": "2024-05-01T12:00:00+02:00", "updated": "2024-06-01"},
+    {"url": "/contact/", "title": "Contact"},
+]
+
+class TestFeeds(unittest.TestCase):
+    def test_sitemap(self):
+        sitemap = create_sitemap(ENTRIES, "https://example.com/site/")
+        self.assertIn("<url><loc>https://example.com/site/</loc></url>", sitemap)
+        self.assertIn("<url><loc>https://example.com/site/blog/ents/</loc><lastmod>2024-06-01T00:00:00Z</lastmod></url>", sitemap)
+        self.assertLess(sitemap.index("/blog/ents/"), sitemap.index("/blog/tom/"))
+
+    def test_feed_entries_are_dated_pages_newest_first(self):
+        self.assertEqual([entry["url"] for entry in find_feed_entries(ENTRIES)], ["/blog/ents/", "/blog/tom/"])
+        self.assertEqual([entry["url"] for entry in find_feed_entries(ENTRIES, 1)], ["/blog/ents/"])
+
+    def test_atom_feed(self):
+        feed = create_atom_feed(ENTRIES, "https://example.com/site/")
+        self.assertIn("<title>Home</title>", feed)
+        self.assertIn("<updated>2024-06-01T00:00:00Z</updated>", feed)
+        self.assertIn("<published>2024-05-01T10:00:00Z</published>", feed)
+        self.assertIn("<title>Tom &amp; Goldberry</title>", feed)
+        self.assertIn("<summary>A &lt;merry&gt; fellow</summary>", feed)
+        self.assertIn('<category term="tolkien" />', feed)
+        self.assertNotIn("/contact/", feed)
+
+    def test_empty_atom_feed(self):
+        self.assertIn("<updated>1970-01-01T00:00:00Z</updated>", create_atom_feed(ENTRIES[:1], "https://example.com"))
+
+    def test_rss_feed(self):
+        feed = create_rss_feed(ENTRIES, "https://example.com/site/")
+        self.assertIn("<link>https://example.com/site/blog/tom/</link>", feed)
+        self.assertIn("<pubDate>Fri, 01 Mar 2024 00:00:00 +0000</pubDate>", feed)
+        self.assertIn("<category>tolkien</category>", feed)
+
+if __name__ == "__main__":
+    unittest.main()
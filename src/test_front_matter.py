@@ -0,0 +1,34 @@
+import io
+import unittest
+
+from front_matter import *
+
+class TestFrontMatter(unittest.TestCase):
+    def test_split_front_matter(self):
+        markdown = "---\ntitle: \"Tom: a mistake\"\ndate: 2024-03-01\ntags: [tolkien, 'old forest']\n# a comment\n---\n# Tom\n\nText"
+        metadata, body = split_front_matter(markdown)
+        self.assertEqual(metadata, {"title": "Tom: a mistake", "date": "2024-03-01", "tags": ["tolkien", "old forest"]})
+        self.assertEqual(body, "# Tom\n\nText")
+
+    def test_markdown_without_front_matter(self):
+        self.assertEqual(split_front_matter("# Tom\n\n---\n"), ({}, "# Tom\n\n---\n"))
+        self.assertEqual(split_front_matter("---\ntitle: unclosed\n# Tom\n"), ({}, "---\ntitle: unclosed\n# Tom\n"))
+
+    def test_read_front_matter_from_stream(self):
+        markdown_stream = io.StringIO("---\nTags: a, b\n---\n# Tom\n")
+        self.assertEqual(read_front_matter(markdown_stream), {"tags": ["a", "b"]})
+        self.assertEqual(markdown_stream.read(), "# Tom\n")
+        markdown_stream = io.StringIO("# Tom\n")
+        self.assertEqual(read_front_matter(markdown_stream), {})
+        self.assertEqual(markdown_stream.read(), "# Tom\n")
+
+    def test_invalid_front_matter(self):
+        self.assertRaises(ValueError, split_front_matter, "---\njust text\n---\n# Tom\n")
+        self.assertRaises(ValueError, split_front_matter, "---\ndate: yesterday\n---\n# Tom\n")
+
+    def test_parse_date(self):
+        self.assertEqual(parse_date("2024-03-01").isoformat(), "2024-03-01T00:00:00+00:00")
+        self.assertEqual(parse_date("2024-03-01T10:00:00+02:00").isoformat(), "2024-03-01T10:00:00+02:00")
+
+if __name__ == "__main__":
+    unittest.main()
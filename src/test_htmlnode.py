@@ -1,3 +1,5 @@
+import io
+import pickle
 import unittest
 
 from htmlnode import HTMLNode, LeafNode, ParentNode
@@ -63,4 +65,30 @@ class TestParentNode(unittest.TestCase):
         self.assertEqual(
             parent_node.to_html(),
             "<div><span><b>grandchild</b></span></div>",
-        )
\ No newline at end of file
+        )
+    def test_iter_html_streams_chunks(self):
+        leaf_node = LeafNode(tag="a", value="link", props={"href": "/home"})
+        parent_node = ParentNode(tag="p", children=[LeafNode(value="text "), leaf_node])
+        chunks = list(parent_node.iter_html())
+        self.assertEqual(chunks, ["<p>", "text ", '<a href="/home">link</a>', "</p>"])
+        self.assertEqual("".join(chunks), parent_node.to_html())
+
+    def test_write_html(self):
+        grandchild_node = LeafNode(tag="b", value="grandchild")
+        parent_node = ParentNode(tag="div", children=[ParentNode(tag="span", children=[grandchild_node])])
+        html_file = io.StringIO()
+        parent_node.write_html(html_file)
+        self.assertEqual(html_file.getvalue(), "<div><span><b>grandchild</b></span></div>")
+
+    def test_iter_html_without_children(self):
+        parent_node = ParentNode(tag="div", children=[])
+        self.assertRaises(ValueError, parent_node.to_html)
+
+    def test_slots(self):
+        nodes = [HTMLNode(tag="p"), LeafNode(tag="b", value="bold"), ParentNode(tag="p", children=[LeafNode(value="x")])]
+        for node in nodes:
+            self.assertFalse(hasattr(node, "__dict__"))
+
+    def test_pickle_round_trip(self):
+        parent_node = ParentNode(tag="p", children=[LeafNode(tag="a", value="link", props={"href": "/"})])
+        self.assertEqual(pickle.loads(pickle.dumps(parent_node)).to_html(), parent_node.to_html())
@@ -0,0 +1,123 @@
+import os
+import struct
+import unittest
+
+from fixtures import TemporaryDirectoryTestCase
+from images import *
+
+def png_bytes(width, height):
+    return b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0) + b"\x00" * 16
+
+def jpeg_bytes(width, height):
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"
+    frame = b"\xff\xc0" + struct.pack(">HBHHB", 11, 8, height, width, 1) + b"\x01\x11\x00"
+    return b"\xff\xd8" + app0 + frame + b"\xff\xd9"
+
+class TestImages(TemporaryDirectoryTestCase):
+    def test_read_png_size(self):
+        self.assertEqual(read_image_size(self.write_file("a.png", png_bytes(1344, 896))), (1344, 896))
+
+    def test_read_gif_size(self):
+        self.assertEqual(read_image_size(self.write_file("a.gif", b"GIF89a" + struct.pack("<HH", 320, 200) + b"\x00" * 20)), (320, 200))
+
+    def test_read_jpeg_size(self):
+        self.assertEqual(read_image_size(self.write_file("a.jpg", jpeg_bytes(1026, 388))), (1026, 388))
+
+    def test_read_webp_sizes(self):
+        lossy = b"RIFF\x00\x00\x00\x00WEBPVP8 \x00\x00\x00\x00\x00\x00\x00\x9d\x01\x2a" + struct.pack("<HH", 640, 480) + b"\x00" * 4
+        lossless = b"RIFF\x00\x00\x00\x00WEBPVP8L\x00\x00\x00\x00\x2f" + struct.pack("<I", 639 | (479 << 14)) + b"\x00" * 8
+        extended = b"RIFF\x00\x00\x00\x00WEBPVP8X\x0a\x00\x00\x00\x00\x00\x00\x00" + (639).to_bytes(3, "little") + (479).to_bytes(3, "little") + b"\x00" * 4
+        for name, content in [("lossy.webp", lossy), ("lossless.webp", lossless), ("extended.webp", extended)]:
+            self.assertEqual(read_image_size(self.write_file(name, content)), (640, 480))
+
+    def test_unknown_format_has_no_size(self):
+        self.assertIsNone(read_image_size(self.write_file("a.png", b"not an image")))
+        self.assertIsNone(read_image_size(self.write_file("b.jpg", b"\xff\xd8\x00\x00")))
+
+    def test_image_attributes_without_variants(self):
+        self.assertEqual(create_image_attributes("/images/a.png", (800, 600), []), {"width": "800", "height": "600"})
+
+    def test_image_attributes_with_variants(self):
+        variants = [(480, "docs/images/a-480w.webp"), (800, "docs/images/a.webp")]
+        self.assertEqual(create_image_attributes("/images/a.png", (800, 600), variants), {
+            "width": "800",
+            "height": "600",
+            "srcset": "/images/a-480w.webp 480w, /images/a.webp 800w",
+            "sizes": "(max-width: 800px) 100vw, 800px",
+            "type": "image/webp",
+        })
+
+    def test_image_attributes_with_variants_in_the_original_format(self):
+        variants = [(480, "docs/images/a-480w.png")]
+        self.assertEqual(create_image_attributes("/images/a.png", (800, 600), variants), {
+            "width": "800",
+            "height": "600",
+            "srcset": "/images/a-480w.png 480w, /images/a.png 800w",
+            "sizes": "(max-width: 800px) 100vw, 800px",
+        })
+
+    def test_process_images_reads_static_images(self):
+        self.write_file("static/images/a.png", png_bytes(800, 600))
+        self.write_file("static/images/b.jpg", jpeg_bytes(40, 30))
+        self.write_file("static/index.css", b"body {}")
+        attributes, variant_outputs, written, _ = process_images(os.path.join(self.root, "static"), os.path.join(self.root, "docs"), write_variants=False)
+        self.assertEqual(sorted(attributes), ["/images/a.png", "/images/b.jpg"])
+        self.assertEqual((attributes["/images/a.png"]["width"], attributes["/images/a.png"]["height"]), ("800", "600"))
+        self.assertEqual(variant_outputs, [])
+        self.assertEqual(written, [])
+
+    def write_image(self, name, size):
+        path = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        Image.new("RGB", size, (200, 40, 40)).save(path)
+        return path
+
+    @unittest.skipUnless(Image, "Pillow is not installed")
+    def test_create_variant_resizes_the_source(self):
+        source_path = self.write_image("a.png", (800, 600))
+        variant_path = os.path.join(self.root, "variants", "a-400w.png")
+        create_variant(source_path, variant_path, 400)
+        with Image.open(variant_path) as variant:
+            self.assertEqual(variant.size, (400, 300))
+
+    @unittest.skipUnless(Image, "Pillow is not installed")
+    def test_write_image_variants_reuses_cached_variants(self):
+        source_path = self.write_image("a.png", (800, 600))
+        cache_directory = os.path.join(self.root, "cache")
+        variant_path = os.path.join(self.root, "docs", "a-400w.png")
+        source_hash = "0" * 64
+        self.assertEqual(write_image_variants(source_path, [(400, variant_path)], cache_directory, source_hash=source_hash), [variant_path])
+        self.assertTrue(os.path.isfile(get_cached_variant_path(cache_directory, source_hash, 400, ".png")))
+        self.assertEqual(write_image_variants(source_path, [(400, variant_path)], cache_directory, source_hash=source_hash), [])
+
+    @unittest.skipUnless(Image, "Pillow is not installed")
+    def test_process_images_reuses_stat_keyed_hashes(self):
+        source_path = self.write_image("static/images/a.png", (800, 600))
+        static_directory = os.path.join(self.root, "static")
+        output_directory = os.path.join(self.root, "docs")
+        cache_directory = os.path.join(self.root, "cache")
+        _, _, _, entries = process_images(static_directory, output_directory, (400,), cache_directory)
+        self.assertEqual(entries[source_path]["hash"], hash_file(source_path))
+        source_stat = os.stat(source_path)
+        previous_entries = {source_path: {"hash": "0" * 64, "size": source_stat.st_size, "mtime_ns": source_stat.st_mtime_ns}}
+        _, _, _, entries = process_images(static_directory, output_directory, (400,), cache_directory, previous_entries=previous_entries)
+        self.assertEqual(entries[source_path]["hash"], "0" * 64)
+        self.assertTrue(os.path.isfile(get_cached_variant_path(cache_directory, "0" * 64, 400, get_variant_extension(".png"))))
+
+    @unittest.skipUnless(Image, "Pillow is not installed")
+    def test_process_images_keeps_the_original_as_fallback(self):
+        self.write_image("static/images/a.png", (800, 600))
+        output_directory = os.path.join(self.root, "docs")
+        attributes, variant_outputs, written, _ = process_images(os.path.join(self.root, "static"), output_directory, (400,), os.path.join(self.root, "cache"))
+        image_attributes = attributes["/images/a.png"]
+        self.assertEqual(sorted(written), sorted(variant_outputs))
+        self.assertNotIn(os.path.join(output_directory, "images", "a.png"), variant_outputs)
+        if get_variant_extension(".png") == ".webp":
+            self.assertEqual(image_attributes["srcset"], "/images/a-400w.webp 400w, /images/a.webp 800w")
+            self.assertEqual(image_attributes["type"], "image/webp")
+        else:
+            self.assertEqual(image_attributes["srcset"], "/images/a-400w.png 400w, /images/a.png 800w")
+            self.assertNotIn("type", image_attributes)
+
+if __name__ == "__main__":
+    unittest.main()
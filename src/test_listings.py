@@ -0,0 +1,27 @@
+import unittest
+
+from listings import *
+
+def create_entries(count):
+    return [{"url": f"/blog/post-{i}/", "title": f"Post {i}", "date": f"2024-01-{i + 1:02d}", "summary": "A _short_ post"} for i in range(count)]
+
+class TestListings(unittest.TestCase):
+    def test_listing_pages_are_paginated_newest_first(self):
+        listing_pages = create_listing_pages(create_entries(5) + [{"url": "/about/", "title": "About"}], "blog", 2)
+        self.assertEqual([url for url, _ in listing_pages], ["/blog/", "/blog/page/2/", "/blog/page/3/"])
+        first_page = listing_pages[0][1]
+        self.assertTrue(first_page.startswith("# Blog (page 1 of 3)\n\n- [Post 4](/blog/post-4/) (2024-01-05): A short post\n- [Post 3]"))
+        self.assertIn("[Older posts](/blog/page/2/)", first_page)
+        self.assertNotIn("Newer posts", first_page)
+        self.assertIn("[Newer posts](/blog/page/2/)", listing_pages[2][1])
+        self.assertNotIn("About", "".join(markdown for _, markdown in listing_pages))
+
+    def test_undated_entries_follow_dated_ones(self):
+        entries = [{"url": "/blog/b/", "title": "B"}, {"url": "/blog/a/", "title": "A"}] + create_entries(1)
+        self.assertEqual([entry["url"] for entry in find_section_entries(entries, "blog")], ["/blog/post-0/", "/blog/a/", "/blog/b/"])
+
+    def test_empty_section(self):
+        self.assertEqual(create_listing_pages([], "/notes/"), [("/notes/", "# Notes\n\nNothing has been published here yet.\n")])
+
+if __name__ == "__main__":
+    unittest.main()
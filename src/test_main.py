@@ -0,0 +1,109 @@
+import gzip
+import os
+import unittest
+
+from fixtures import TemporaryDirectoryTestCase
+from main import *
+
+class TestMain(unittest.TestCase):
+    def test_default_paths(self):
+        builder = create_site_builder(parse_arguments([]))
+        self.assertEqual(
+            (builder.content_directory, builder.template_path, builder.static_directory, builder.output_directory, builder.base_path),
+            ("content", "template.html", "static", "docs", "/"),
+        )
+        self.assertEqual(builder.manifest_path, MANIFEST_PATH)
+        self.assertEqual(builder.changes_path, CHANGES_PATH)
+
+    def test_other_output_directories_keep_their_own_state(self):
+        builder = create_site_builder(parse_arguments(["--output", "out"]))
+        self.assertEqual(builder.manifest_path, os.path.join(os.path.abspath("."), SITE_STATE_DIRECTORY, "out", "manifest.json"))
+        self.assertEqual(builder.dependency_graph_path, os.path.join(os.path.abspath("."), SITE_STATE_DIRECTORY, "out", "dependencies.json"))
+        builder = create_site_builder(parse_arguments(["--output", "docs/"]))
+        self.assertEqual((builder.manifest_path, builder.dependency_graph_path), (MANIFEST_PATH, DEPENDENCY_GRAPH_PATH))
+
+    def test_build_arguments(self):
+        arguments = parse_arguments(["/blog/", "--content", "pages", "--output", "public", "--no-cache", "--cache-size", "8", "-j", "3", "-q"])
+        builder = create_site_builder(arguments)
+        self.assertEqual((builder.content_directory, builder.output_directory, builder.base_path), ("pages", "public", "/blog/"))
+        self.assertEqual(builder.options["cache_directory"], None)
+        self.assertEqual(builder.options["cache_size"], 8 * 1024 * 1024)
+        self.assertEqual(builder.options["jobs"], 3)
+        self.assertTrue(builder.options["quiet"])
+
+    def test_image_arguments(self):
+        builder = create_site_builder(parse_arguments(["--image-widths", "960,320,960"]))
+        self.assertEqual(builder.options["image_widths"], (320, 960))
+        self.assertTrue(builder.options["images"])
+        self.assertFalse(create_site_builder(parse_arguments(["--no-images"])).options["images"])
+        with self.assertRaises(SystemExit):
+            parse_arguments(["--image-widths", "wide"])
+
+    def test_optimization_arguments(self):
+        builder = create_site_builder(parse_arguments(["--minify", "--hash-assets"]))
+        self.assertTrue(builder.options["minify"])
+        self.assertTrue(builder.options["hash_assets"])
+        builder = create_site_builder(parse_arguments(["--compress", "--compress-threshold", "0", "--compress-workers", "2"]))
+        self.assertEqual((builder.options["compress"], builder.options["compression_threshold"], builder.options["compression_workers"]), (True, 0, 2))
+        builder = create_site_builder(parse_arguments(["--search-index", "--search-shards", "8"]))
+        self.assertEqual((builder.options["search_index"], builder.options["search_shards"]), (True, 8))
+        builder = create_site_builder(parse_arguments(["--sitemap", "--feeds", "--feed-size", "5", "--listing", "blog", "--listing", "notes", "--site-url", "https://example.com"]))
+        self.assertEqual((builder.options["sitemap"], builder.options["feeds"], builder.options["feed_size"]), (True, True, 5))
+        self.assertEqual((builder.options["listings"], builder.options["site_url"]), (["blog", "notes"], "https://example.com"))
+
+    def test_serve_does_not_write_change_list(self):
+        builder = create_site_builder(parse_serve_arguments(["--watch"]))
+        self.assertIsNone(builder.changes_path)
+
+    def test_shard_arguments(self):
+        builder = create_site_builder(parse_arguments(["--shard", "2/3"]))
+        self.assertEqual(builder.options["shard"], (2, 3))
+        self.assertEqual(builder.output_directory, os.path.join(SHARDS_DIRECTORY, "2-of-3"))
+        self.assertEqual(builder.manifest_path, os.path.join(SHARDS_DIRECTORY, "2-of-3.manifest.json"))
+        self.assertIsNone(builder.changes_path)
+        with self.assertRaises(SystemExit):
+            parse_arguments(["--shard", "4/3"])
+
+class TestRebuildChangedPaths(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.template_path = self.write_file("template.html", "<html><title>{{ Title }}</title><body>{{ Content }}</body></html>")
+        self.write_file("static/index.css", "body {}")
+        self.docs_directory = os.path.join(self.root, "docs")
+
+    def create_builder(self, **options):
+        return SiteBuilder(os.path.join(self.root, "content"), self.template_path, os.path.join(self.root, "static"), self.docs_directory,
+            manifest_path=os.path.join(self.root, "manifest.json"), changes_path=None, dependency_graph_path=None, cache_directory=None, quiet=True, **options)
+
+    def rebuild(self, builder, *paths):
+        with builder.configured():
+            rebuild_changed_paths(set(paths), builder.content_directory, builder.template_path, builder.static_directory,
+                builder.output_directory, builder.base_path, 1, builder.manifest_path)
+
+    def test_rebuild_recompresses_pages(self):
+        text = " ".join(["words"] * 200)
+        self.write_file("content/index.md", f"# Home\n\n{text}")
+        about_path = self.write_file("content/about.md", f"# About\n\n{text}")
+        builder = self.create_builder(compress=True, compression_threshold=0)
+        builder.build()
+        page_path = self.write_file("content/index.md", f"# Home\n\nChanged {text}")
+        os.remove(about_path)
+        self.rebuild(builder, page_path, about_path)
+        with(open(os.path.join(self.docs_directory, "index.html"), 'rb') as html_file):
+            html = html_file.read()
+        with(gzip.open(os.path.join(self.docs_directory, "index.html.gz"), 'rb') as compressed_file):
+            self.assertEqual(compressed_file.read(), html)
+        self.assertFalse(os.path.exists(os.path.join(self.docs_directory, "about.html.gz")))
+
+    def test_template_change_rebuilds_listings(self):
+        self.write_file("content/index.md", "# Home\n\nWelcome")
+        self.write_file("content/blog/first.md", "---\ndate: 2024-01-02\n---\n# First\n\nA post")
+        builder = self.create_builder(listings=["blog"], metadata_index_path=os.path.join(self.root, "metadata.json"))
+        builder.build()
+        template_path = self.write_file("template.html", "<html><title>{{ Title }}</title><body><main>{{ Content }}</main></body></html>")
+        self.rebuild(builder, template_path)
+        with(open(os.path.join(self.docs_directory, "blog", "index.html"), 'r') as html_file):
+            self.assertIn("<main>", html_file.read())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import unittest
+
+from fixtures import TemporaryDirectoryTestCase
+from manifest import *
+
+class TestManifest(TemporaryDirectoryTestCase):
+    def test_load_missing_manifest(self):
+        manifest = load_manifest(os.path.join(self.root, "missing.json"))
+        self.assertEqual(manifest, new_manifest())
+
+    def test_load_corrupt_manifest(self):
+        path = self.write_file("manifest.json", "{not json")
+        self.assertEqual(load_manifest(path), new_manifest())
+
+    def test_save_and_load(self):
+        path = os.path.join(self.root, "manifest.json")
+        manifest = new_manifest()
+        manifest["base_path"] = "/blog/"
+        save_manifest(path, manifest)
+        self.assertEqual(load_manifest(path), manifest)
+
+    def test_hash_file(self):
+        first = self.write_file("a.md", "# Title\n")
+        second = self.write_file("b.md", "# Title\n")
+        third = self.write_file("c.md", "# Other\n")
+        self.assertEqual(hash_file(first), hash_file(second))
+        self.assertNotEqual(hash_file(first), hash_file(third))
+
+    def test_find_outdated_sources(self):
+        source = self.write_file("content/index.md", "# Title\n")
+        output = self.write_file("docs/index.html", "<h1>Title</h1>")
+        sources = {source: (hash_file(source), output)}
+        entries = {source: create_entry(hash_file(source), output)}
+        self.assertEqual(find_outdated_sources(entries, sources), [])
+        self.assertEqual(find_outdated_sources(entries, sources, force=True), [source])
+        self.assertEqual(find_outdated_sources({}, sources), [source])
+
+    def test_modified_output_is_outdated(self):
+        source = self.write_file("content/index.md", "# Title\n")
+        output = self.write_file("docs/index.html", "<h1>Title</h1>")
+        sources = {source: (hash_file(source), output)}
+        entries = {source: create_entry(hash_file(source), output)}
+        self.write_file("docs/index.html", "<h1>Edited by hand</h1>")
+        self.assertEqual(find_outdated_sources(entries, sources), [source])
+        os.remove(output)
+        self.assertEqual(find_outdated_sources(entries, sources), [source])
+
+    def test_find_removed_outputs(self):
+        entries = {
+            "content/a.md": {"hash": "1", "output": "docs/a.html", "output_hash": "2"},
+            "content/b.md": {"hash": "3", "output": "docs/b.html", "output_hash": "4"},
+            "content/c.md": {"hash": "5", "output": "other/c.html", "output_hash": "6"},
+            "content/d.md": {"hash": "7", "output": "docs/../other/d.html", "output_hash": "8"},
+        }
+        sources = {"content/a.md": ("1", "docs/a.html")}
+        self.assertEqual(find_removed_outputs(entries, sources, "docs"), ["docs/b.html"])
+
+    def test_remove_output_prunes_empty_directories(self):
+        output = self.write_file("docs/blog/post/index.html", "<p>post</p>")
+        self.write_file("docs/index.html", "<p>home</p>")
+        remove_output(output, os.path.join(self.root, "docs"))
+        self.assertFalse(os.path.exists(os.path.join(self.root, "docs", "blog")))
+        self.assertTrue(os.path.isdir(os.path.join(self.root, "docs")))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import io
 import unittest
 
 from markdown_parser import *
@@ -162,6 +163,35 @@ class TestMarkdownParser(unittest.TestCase):
 
         self.assertEqual(expected_nodes, result_nodes)
 
+    def test_scanner_matches_legacy_parser(self):
+        texts = [
+            "This is **text** with an _italic_ word and a `code block` and an ![obi wan image](https://i.imgur.com/fJRm4Vk.jpeg) and a [link](https://boot.dev)",
+            "**bold [link](/a)** then _italic ![image](/b.png)_ then `code`",
+            "Empty ****delimiters and ![](/empty.png) references",
+            "[not a link] ![image](/c.png) trailing text",
+            "Line one [link](/d)\nline two",
+            "",
+        ]
+        for text in texts:
+            self.assertEqual(scan_inline_markdown_text(text), parse_inline_markdown_text_legacy(text))
+
+    def test_scanner_unclosed_delimiter(self):
+        self.assertRaises(ValueError, scan_inline_markdown_text, "This has **no closing delimiter")
+        self.assertRaises(ValueError, scan_inline_markdown_text, "**bold** and _unclosed italic")
+
+    def test_scanner_reports_the_same_delimiter_as_legacy(self):
+        for parser in [scan_inline_markdown_text, parse_inline_markdown_text_legacy]:
+            self.assertRaisesRegex(ValueError, r"odd number of \*\* delimiters", parser, "_a ******")
+
+    def test_set_inline_parser(self):
+        self.assertEqual(get_inline_parser(), "scanner")
+        set_inline_parser("legacy")
+        try:
+            self.assertEqual(parse_inline_markdown_text("a **b**"), [TextNode("a ", TextType.TEXT), TextNode("b", TextType.BOLD)])
+        finally:
+            set_inline_parser("scanner")
+        self.assertRaises(ValueError, set_inline_parser, "unknown")
+
     def test_markdown_to_blocks(self):
         md = """
 This is **bolded** paragraph
@@ -181,7 +211,79 @@ This is the same paragraph on a new line
                 "- This is a list\n- with items",
             ],
         )
-    
+
+    def test_markdown_to_blocks_keeps_code_block_together(self):
+        md = "Intro\n\n```\nfirst line\n\n\nsecond line\n```\n\nOutro"
+        blocks = markdown_to_blocks(md)
+        self.assertEqual(blocks, ["Intro", "```\nfirst line\n\n\nsecond line\n```", "Outro"])
+        self.assertEqual(block_to_block_type(blocks[1]), BlockType.CODE)
+
+    def test_markdown_to_blocks_unclosed_code_block(self):
+        md = "```\nnever closed\n\nParagraph\n\n- item"
+        self.assertEqual(markdown_to_blocks(md), markdown_to_blocks_legacy(md))
+
+    def test_iter_markdown_blocks_matches_markdown_to_blocks(self):
+        md = "# Title\n\n\n```\ncode\n\nmore code\n```\n\n> quote\n> more\n\n1. one\n2. two\n"
+        self.assertEqual(list(iter_markdown_blocks(md.splitlines(keepends=True))), markdown_to_blocks(md))
+
+    def test_iter_classified_blocks(self):
+        md = "# Title\n\n- a\n- b\n\n1. one\n2. two\n\nText"
+        self.assertEqual(
+            [block_type for _, block_type in iter_classified_blocks(md.split("\n"))],
+            [BlockType.HEADING, BlockType.UNORDERED_LIST, BlockType.ORDERED_LIST, BlockType.PARAGRAPH],
+        )
+
+    def test_iter_html_chunks_matches_html_node(self):
+        md = "# Title\n\nSome **bold** text\n\n```\ncode\n\nmore\n```\n\n1. one\n2. two\n"
+        self.assertEqual("".join(iter_html_chunks(io.StringIO(md))), markdown_to_html_node(md).to_html())
+
+    def test_iter_html_chunks_is_lazy(self):
+        chunks = iter_html_chunks(iter(["# Title\n", "\n", "Paragraph\n"]))
+        self.assertEqual(next(chunks), "<div>")
+        self.assertEqual(next(chunks), "<h1>Title</h1>")
+
+    def test_extract_stream_title(self):
+        self.assertEqual(extract_stream_title(io.StringIO("# Hello \n\nBody")), "Hello")
+        self.assertRaises(ValueError, extract_stream_title, io.StringIO("Body\n"))
+
+    def test_repeated_blocks_are_memoized(self):
+        take_memo_stats()
+        md = "- [Home](/)\n- [Blog](/blog)\n\nFirst page"
+        first_html = markdown_to_rendered_node(md).to_html()
+        second_html = markdown_to_rendered_node(md.replace("First", "Second")).to_html()
+        self.assertEqual(second_html, first_html.replace("First", "Second"))
+        self.assertEqual(first_html, markdown_to_html_node(md).to_html())
+        memo_stats = take_memo_stats()
+        self.assertEqual(memo_stats["html_block"], (1, 3))
+
+    def test_block_memo_depends_on_image_attributes(self):
+        md = "# Title\n\n![Ring](/ring.png)"
+        configure_image_attributes(None)
+        plain_html = markdown_to_rendered_node(md).to_html()
+        configure_image_attributes({"/ring.png": {"width": "10", "height": "20"}})
+        try:
+            sized_html = markdown_to_rendered_node(md).to_html()
+        finally:
+            configure_image_attributes(None)
+        self.assertIn('width="10"', sized_html)
+        self.assertEqual(markdown_to_rendered_node(md).to_html(), plain_html)
+
+    def test_create_html_node_returns_tree(self):
+        node = create_html_node("- [Home](/)\n- Blog", BlockType.UNORDERED_LIST)
+        self.assertEqual(node.tag, "ul")
+        self.assertEqual(node.children[0].children[0].tag, "a")
+
+    def test_memoized_inline_nodes_are_copies(self):
+        text_nodes = parse_inline_markdown_text("Some **bold** text")
+        text_nodes.append(TextNode("extra", TextType.TEXT))
+        self.assertEqual(len(parse_inline_markdown_text("Some **bold** text")), 3)
+
+    def test_block_to_block_type_matches_legacy(self):
+        blocks = ["## Heading", "#Heading", "```\ncode\n```", "```\nco`de\n```", "> a\n> b", "> a\nb",
+            "- a\n- b", "- a\nb", "1. a\n2. b", "1. a\n3. b", "text 1", "2. a", "-\n>"]
+        for block in blocks:
+            self.assertEqual(block_to_block_type(block), block_to_block_type_legacy(block), block)
+
     def test_block_to_block_heading(self):
         test_heading = "### This is a heading"
         return_type = block_to_block_type(test_heading)
@@ -0,0 +1,47 @@
+import unittest
+
+from memo import *
+
+class TestLRUMemo(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.memo = LRUMemo(self.double, 2)
+
+    def double(self, value):
+        self.calls.append(value)
+        return value * 2
+
+    def test_repeated_call_is_remembered(self):
+        self.assertEqual(self.memo(3), 6)
+        self.assertEqual(self.memo(3), 6)
+        self.assertEqual(self.calls, [3])
+        self.assertEqual(self.memo.take_stats(), (1, 1))
+        self.assertEqual(self.memo.take_stats(), (0, 0))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        self.memo(1)
+        self.memo(2)
+        self.memo(1)
+        self.memo(3)
+        self.memo(1)
+        self.memo(2)
+        self.assertEqual(self.calls, [1, 2, 3, 2])
+
+    def test_zero_size_disables_memo(self):
+        self.memo.resize(0)
+        self.memo(1)
+        self.memo(1)
+        self.assertEqual(self.calls, [1, 1])
+        self.assertEqual(len(self.memo.entries), 0)
+
+    def test_add_stats(self):
+        self.memo(1)
+        self.memo.add_stats(3, 4)
+        self.assertEqual(self.memo.take_stats(), (3, 5))
+
+    def test_format_hit_rate(self):
+        self.assertEqual(format_hit_rate(3, 1), "3 hits, 1 misses (75.0% hit rate)")
+        self.assertEqual(format_hit_rate(0, 0), "0 hits, 0 misses (0.0% hit rate)")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import os
+import unittest
+
+from fixtures import TemporaryDirectoryTestCase
+from manifest import hash_file
+from metadata_index import *
+
+class TestMetadataIndex(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.docs_directory = os.path.join(self.root, "docs")
+        self.index_path = os.path.join(self.root, "metadata.json")
+
+    def write_page(self, name, content):
+        source_path = self.write_file(os.path.join("content", name, "index.md"), content)
+        return source_path, (hash_file(source_path), os.path.join(self.docs_directory, name, "index.html"))
+
+    def test_extract_summary_skips_navigation(self):
+        markdown = "# Tom\n\n[< Back Home](/)\n\n![Tom](/tom.png)\n\nTom is **merry** and [bright](/blue).\n\nMore."
+        self.assertEqual(extract_summary(markdown), "Tom is merry and bright.")
+        summary = extract_summary("# Tom\n\n" + "word " * 100)
+        self.assertLessEqual(len(summary), SUMMARY_LENGTH)
+        self.assertTrue(summary.endswith("word …"))
+        self.assertEqual(extract_summary("# Tom\n\n- a list"), "")
+
+    def test_front_matter_overrides_title_and_summary(self):
+        source_path, _ = self.write_page("tom", "---\ntitle: Old Tom\nsummary: Merry.\ndate: 2024-03-01\n---\n# Tom\n\nText.")
+        self.assertEqual(read_page_metadata(source_path), {"title": "Old Tom", "summary": "Merry.", "date": "2024-03-01"})
+
+    def test_only_changed_pages_are_read(self):
+        page_sources = dict([self.write_page("tom", "# Tom\n\nTom text."), self.write_page("ents", "# Ents\n\nEnt text.")])
+        entries, read = update_metadata_index(page_sources, self.docs_directory, self.index_path)
+        self.assertEqual(read, 2)
+        self.assertEqual(sorted((entry["url"], entry["title"]) for entry in entries), [("/ents/", "Ents"), ("/tom/", "Tom")])
+        page_sources.update([self.write_page("elves", "# Elves\n\nElf text.")])
+        entries, read = update_metadata_index(page_sources, self.docs_directory, self.index_path)
+        self.assertEqual((read, len(entries)), (1, 3))
+        del page_sources[os.path.join(self.root, "content", "tom", "index.md")]
+        entries, read = update_metadata_index(page_sources, self.docs_directory, self.index_path)
+        self.assertEqual((read, sorted(entry["url"] for entry in entries)), (0, ["/elves/", "/ents/"]))
+
+    def test_metadata_errors_name_the_page(self):
+        page_sources = dict([self.write_page("tom", "Tom has no title.")])
+        with self.assertRaisesRegex(ValueError, "tom"):
+            update_metadata_index(page_sources, self.docs_directory, self.index_path)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import json
+import os
+import unittest
+
+from fixtures import TemporaryDirectoryTestCase
+from optimizer import *
+
+class TestOptimizer(TemporaryDirectoryTestCase):
+    def test_minify_html(self):
+        html_string = "<!doctype html>\n<html>\n  <head>\n    <title>Hi</title>\n  </head>\n  <!-- note -->\n  <body>\n    <p>Some  <b>bold</b>\n text</p>\n  </body>\n</html>\n"
+        self.assertEqual(minify_html(html_string), "<!doctype html><html><head><title>Hi</title></head><body><p>Some <b>bold</b> text</p></body></html>")
+
+    def test_minify_html_keeps_preformatted_text(self):
+        html_string = "<div>\n  <pre><code>if x:\n    return  1\n</code></pre>\n  <p>a  b</p>\n</div>"
+        self.assertEqual(minify_html(html_string), "<div><pre><code>if x:\n    return  1\n</code></pre><p>a b</p></div>")
+
+    def test_minify_css(self):
+        css = "/* theme */\nbody {\n  color: #fff;\n  font-family: \"A  B\", serif;\n}\n\na > b, i { margin: 0 auto; }\n"
+        self.assertEqual(minify_css(css), "body{color:#fff;font-family:\"A  B\",serif}a>b,i{margin:0 auto}")
+
+    def test_minify_css_keeps_comments_in_strings(self):
+        self.assertEqual(minify_css("a::after { content: \"/* x */\"; }"), "a::after{content:\"/* x */\"}")
+
+    def test_hashed_path(self):
+        self.assertEqual(get_hashed_path("docs/index.css", "3f9a1c2b7e"), "docs/index.3f9a1c2b.css")
+
+    def test_rewrite_asset_url(self):
+        asset_urls = {"/images/a.png": "/images/a.1234abcd.png"}
+        self.assertEqual(rewrite_asset_url("/images/a.png?v=1", asset_urls), "/images/a.1234abcd.png?v=1")
+        self.assertEqual(rewrite_asset_url("../images/a.png", asset_urls, "/css/site.css"), "../images/a.1234abcd.png")
+        self.assertEqual(rewrite_asset_url("/other.png", asset_urls), "/other.png")
+        self.assertEqual(rewrite_asset_url("https://example.com/images/a.png", asset_urls), "https://example.com/images/a.png")
+
+    def test_plan_assets_hashes_and_rewrites(self):
+        static_directory = os.path.join(self.root, "static")
+        docs_directory = os.path.join(self.root, "docs")
+        image_path = self.write_file("static/images/a.png", "png")
+        css_path = self.write_file("static/index.css", "body {\n  background: url('/images/a.png');\n}\n")
+        robots_path = self.write_file("static/robots.txt", "User-agent: *")
+        copies, transformed, asset_urls, entries = plan_assets(static_directory, docs_directory, minify=True, hash_assets=True)
+        hashed_image_url = asset_urls["/images/a.png"]
+        self.assertRegex(hashed_image_url, r"^/images/a\.[0-9a-f]{8}\.png$")
+        self.assertEqual(copies[robots_path], os.path.join(docs_directory, "robots.txt"))
+        self.assertEqual(copies[image_path], os.path.join(docs_directory, hashed_image_url.lstrip("/")))
+        css_output, css = transformed[css_path]
+        self.assertEqual(css, f"body{{background:url('{hashed_image_url}')}}")
+        self.assertEqual(css_output, os.path.join(docs_directory, asset_urls["/index.css"].lstrip("/")))
+        self.assertEqual(entries[image_path]["output"], copies[image_path])
+        self.assertEqual(json.loads(create_asset_manifest(asset_urls))["index.css"], asset_urls["/index.css"].lstrip("/"))
+
+    def test_plan_assets_reuses_recorded_hash(self):
+        static_directory = os.path.join(self.root, "static")
+        image_path = self.write_file("static/a.png", "png")
+        stat = os.stat(image_path)
+        previous_entries = {image_path: {"output": "docs/a.cafebabe.png", "hash": "cafebabe00", "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}}
+        _, _, asset_urls, _ = plan_assets(static_directory, os.path.join(self.root, "docs"), previous_entries, hash_assets=True)
+        self.assertEqual(asset_urls, {"/a.png": "/a.cafebabe.png"})
+
+    def test_plan_assets_without_optimization(self):
+        css_path = self.write_file("static/index.css", "body { color: red; }")
+        copies, transformed, asset_urls, _ = plan_assets(os.path.join(self.root, "static"), os.path.join(self.root, "docs"))
+        self.assertEqual(copies, {css_path: os.path.join(self.root, "docs", "index.css")})
+        self.assertEqual((transformed, asset_urls), ({}, {}))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import json
+import os
+import unittest
+
+from fixtures import TemporaryDirectoryTestCase
+from output_writer import *
+
+class TestOutputWriter(TemporaryDirectoryTestCase):
+    def read_file(self, path):
+        with(open(path, 'r') as test_file):
+            return test_file.read()
+
+    def test_new_file_is_written(self):
+        path = os.path.join(self.root, "index.html")
+        self.assertTrue(write_output(path, "<p>hello</p>"))
+        self.assertEqual(self.read_file(path), "<p>hello</p>")
+
+    def test_identical_file_is_left_untouched(self):
+        path = os.path.join(self.root, "index.html")
+        write_output(path, "<p>hello</p>")
+        os.utime(path, ns=(1000000000, 1000000000))
+        self.assertFalse(write_output(path, "<p>hello</p>"))
+        self.assertEqual(os.stat(path).st_mtime_ns, 1000000000)
+        self.assertEqual(os.listdir(self.root), ["index.html"])
+
+    def test_changed_file_is_replaced(self):
+        path = os.path.join(self.root, "index.html")
+        write_output(path, "<p>hello</p>")
+        self.assertTrue(write_output(path, "<p>world</p>"))
+        self.assertEqual(self.read_file(path), "<p>world</p>")
+
+    def test_failed_render_keeps_previous_output(self):
+        path = os.path.join(self.root, "index.html")
+        write_output(path, "<p>hello</p>")
+        with self.assertRaises(ValueError):
+            with OutputFile(path) as output_file:
+                output_file.write("<p>partial")
+                raise ValueError("render failed")
+        self.assertEqual(self.read_file(path), "<p>hello</p>")
+        self.assertEqual(os.listdir(self.root), ["index.html"])
+
+    def test_prune_outputs(self):
+        kept_path = os.path.join(self.root, "docs", "index.html")
+        stale_path = os.path.join(self.root, "docs", "old", "index.html")
+        os.makedirs(os.path.dirname(stale_path))
+        write_output(kept_path, "kept")
+        write_output(stale_path, "stale")
+        self.assertEqual(prune_outputs(os.path.join(self.root, "docs"), [kept_path]), [stale_path])
+        self.assertFalse(os.path.exists(os.path.dirname(stale_path)))
+        self.assertTrue(os.path.isfile(kept_path))
+
+    def test_write_change_list(self):
+        docs_directory = os.path.join(self.root, "docs")
+        change_list_path = os.path.join(self.root, "changes.json")
+        write_change_list(change_list_path, docs_directory, [os.path.join(docs_directory, "b.html"), os.path.join(docs_directory, "a.html")], [os.path.join(docs_directory, "old.html")])
+        with(open(change_list_path, 'r') as change_list_file):
+            self.assertEqual(json.load(change_list_file), {"changed": ["a.html", "b.html"], "removed": ["old.html"]})
+
+if __name__ == "__main__":
+    unittest.main()
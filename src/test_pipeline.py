@@ -0,0 +1,39 @@
+import threading
+import unittest
+
+from pipeline import *
+
+class TestPipeline(unittest.TestCase):
+    def test_results_keep_input_order(self):
+        written = []
+        results = run_pipeline(range(0, 50), lambda item: item * 2, lambda item, data: data + 1, lambda item, output: written.append(output) or output, io_threads=3, queue_size=2)
+        self.assertEqual(results, [item * 2 + 1 for item in range(0, 50)])
+        self.assertEqual(sorted(written), results)
+
+    def test_empty_input(self):
+        self.assertEqual(run_pipeline([], lambda item: item, lambda item, data: data, lambda item, output: output), [])
+
+    def test_render_runs_in_calling_thread(self):
+        render_threads = set()
+        def render(item, data):
+            render_threads.add(threading.current_thread())
+            return data
+        run_pipeline(range(0, 10), lambda item: item, render, lambda item, output: output, io_threads=2)
+        self.assertEqual(render_threads, {threading.current_thread()})
+
+    def test_errors_propagate_from_every_stage(self):
+        def fail_on_seven(item, *_):
+            if item == 7:
+                raise ValueError(f"bad item {item}")
+            return item
+        stages = [
+            (fail_on_seven, lambda item, data: data, lambda item, output: output),
+            (lambda item: item, fail_on_seven, lambda item, output: output),
+            (lambda item: item, lambda item, data: data, fail_on_seven),
+        ]
+        for read, render, write in stages:
+            with self.assertRaisesRegex(ValueError, "bad item 7"):
+                run_pipeline(range(0, 100), read, render, write, io_threads=2, queue_size=1)
+
+if __name__ == "__main__":
+    unittest.main()
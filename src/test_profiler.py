@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from markdown_parser import markdown_to_html_node
+from profiler import *
+
+class TestProfiler(unittest.TestCase):
+    def test_nested_stages_record_self_time(self):
+        profiler = Profiler()
+        with profiler.page("index.md"):
+            with profiler.stage("outer"):
+                time.sleep(0.01)
+                with profiler.stage("inner"):
+                    time.sleep(0.02)
+        summary = profiler.get_stage_summary()
+        self.assertEqual(summary["outer"]["calls"], 1)
+        self.assertLess(summary["outer"]["seconds"], 0.02)
+        self.assertGreaterEqual(summary["inner"]["seconds"], 0.02)
+        pages = profiler.get_page_summary()
+        self.assertGreaterEqual(pages["index.md"]["seconds"], 0.03)
+        self.assertEqual(set(pages["index.md"]["stages"]), {"outer", "inner"})
+
+    def test_parser_stages_are_recorded(self):
+        profiler = Profiler()
+        set_profiler(profiler)
+        try:
+            with profile_page("page.md"):
+                markdown_to_html_node("# Title\n\nSome **bold** text\n\n- a\n- b")
+        finally:
+            set_profiler(None)
+        self.assertEqual(set(profiler.get_stage_summary()), {"block_splitting", "classification", "html_tree", "inline_parsing"})
+
+    def test_disabled_profiler_is_a_no_op(self):
+        self.assertIsNone(get_profiler())
+        with profile_stage("anything"):
+            pass
+
+    def test_take_and_add_records(self):
+        worker_profiler = Profiler()
+        with worker_profiler.page("a.md"):
+            with worker_profiler.stage("reading"):
+                pass
+        records = worker_profiler.take_records()
+        self.assertEqual(worker_profiler.get_page_summary(), {})
+        parent_profiler = Profiler()
+        parent_profiler.add_records(*records)
+        self.assertEqual([page_path for page_path, _ in parent_profiler.get_slowest_pages(5)], ["a.md"])
+
+    def test_write_reports(self):
+        profiler = Profiler()
+        with profiler.page("a.md"):
+            with profiler.stage("writing"):
+                pass
+        with tempfile.TemporaryDirectory() as directory:
+            trace_path = os.path.join(directory, "trace.json")
+            json_path = os.path.join(directory, "profile.json")
+            profiler.write_chrome_trace(trace_path)
+            profiler.write_json(json_path)
+            with(open(trace_path, 'r') as trace_file):
+                events = json.load(trace_file)["traceEvents"]
+            with(open(json_path, 'r') as json_file):
+                report = json.load(json_file)
+        self.assertEqual([event["cat"] for event in events], ["page", "stage"])
+        self.assertTrue(all(event["ph"] == "X" for event in events))
+        self.assertIn("writing", report["stages"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import json
+import os
+import unittest
+
+from fixtures import TemporaryDirectoryTestCase
+from manifest import hash_file
+from search_index import *
+
+class TestSearchIndex(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.docs_directory = os.path.join(self.root, "docs")
+        self.state_path = os.path.join(self.root, "search.json")
+
+    def write_page(self, name, content):
+        source_path = self.write_file(os.path.join("content", name), content)
+        destination_path = os.path.join(self.docs_directory, name.replace(".md", ".html"))
+        return source_path, (hash_file(source_path), destination_path)
+
+    def build(self, pages, shards=4):
+        return build_search_index(pages, self.docs_directory, self.state_path, shards)
+
+    def read_index(self, shards=4):
+        with(open(os.path.join(self.docs_directory, SEARCH_DIRECTORY, "documents.json"), 'r') as documents_file):
+            documents = json.load(documents_file)
+        postings = {}
+        for shard in range(shards):
+            with(open(os.path.join(self.docs_directory, SEARCH_DIRECTORY, f"index-{shard}.json"), 'r') as shard_file):
+                for term, term_postings in json.load(shard_file).items():
+                    self.assertEqual(get_term_shard(term, shards), shard)
+                    for posting in term_postings:
+                        postings[(documents[posting[0]]["url"], term)] = posting[1:]
+        return postings
+
+    def test_extract_search_document(self):
+        title, terms = extract_search_document("# Ring Lore\n\nThe **one** [ring](/ring) rules.\n\n## Ring\n\n```\nring = forge()\n```")
+        self.assertEqual(title, "Ring Lore")
+        self.assertEqual(terms["ring"], [TITLE_FIELD | HEADING_FIELD | BODY_FIELD, 0, 4, 6, 7])
+        self.assertEqual(terms["one"], [BODY_FIELD, 3])
+        self.assertNotIn("lore", [term for term in terms if terms[term][0] & HEADING_FIELD])
+        self.assertNotIn("ring)", terms)
+
+    def test_create_posting_uses_position_deltas(self):
+        self.assertEqual(create_posting(3, [BODY_FIELD, 2, 5, 11]), [3, BODY_FIELD, 2, 3, 6])
+
+    def test_term_shard_is_fnv1a(self):
+        self.assertEqual(get_term_shard("a", 1 << 32), 0xE40C292C)
+
+    def test_incremental_update_matches_rebuild(self):
+        pages = dict([self.write_page("index.md", "# Home\n\nWelcome to the shire"), self.write_page("about.md", "# About\n\nThe shire and the river")])
+        outputs, written, indexed, removed = self.build(pages)
+        self.assertEqual((len(outputs), indexed, removed), (6, 2, 0))
+        self.assertEqual(sorted(written), sorted(outputs))
+        pages.update([self.write_page("about.md", "# About\n\nThe river only"), self.write_page("new.md", "# New\n\nA mountain road")])
+        del pages[os.path.join(self.root, "content", "index.md")]
+        _, _, indexed, removed = self.build(pages)
+        self.assertEqual((indexed, removed), (2, 1))
+        incremental = self.read_index()
+        os.remove(self.state_path)
+        self.build(pages)
+        self.assertEqual(incremental, self.read_index())
+        self.assertNotIn(("/about.html", "shire"), incremental)
+
+    def test_unchanged_pages_are_not_reindexed(self):
+        pages = dict([self.write_page("index.md", "# Home\n\nWelcome")])
+        self.build(pages)
+        _, written, indexed, _ = self.build(pages)
+        self.assertEqual((written, indexed), ([], 0))
+
+    def test_removed_document_ids_are_reused(self):
+        pages = dict([self.write_page("a.md", "# Page A\n\nText"), self.write_page("b.md", "# Page B\n\nText"), self.write_page("c.md", "# Page C\n\nText")])
+        self.build(pages)
+        del pages[os.path.join(self.root, "content", "a.md")]
+        del pages[os.path.join(self.root, "content", "c.md")]
+        self.build(pages)
+        pages.update([self.write_page("d.md", "# Page D\n\nText"), self.write_page("e.md", "# Page E\n\nText")])
+        self.build(pages)
+        with(open(self.state_path, 'r') as state_file):
+            state = json.load(state_file)
+        self.assertEqual(sorted(page["id"] for page in state["pages"].values()), [0, 1, 2])
+        self.assertEqual(state["free_ids"], [])
+
+    def test_state_is_discarded_for_another_site(self):
+        pages = dict([self.write_page("index.md", "# Home\n\nA banana")])
+        self.build(pages)
+        first_site = self.docs_directory
+        self.docs_directory = os.path.join(self.root, "other")
+        self.build(dict([self.write_page("other.md", "# Other\n\nA cherry")]))
+        self.docs_directory = first_site
+        _, _, indexed, removed = self.build(pages)
+        self.assertEqual((indexed, removed), (1, 0))
+        with(open(os.path.join(self.docs_directory, SEARCH_DIRECTORY, f"index-{get_term_shard('banana', 4)}.json"), 'r') as shard_file):
+            self.assertEqual(len(json.load(shard_file)["banana"]), 1)
+        self.assertNotIn(("/other.html", "cherry"), self.read_index())
+
+    def test_missing_shard_rebuilds_index(self):
+        pages = dict([self.write_page("index.md", "# Home\n\nWelcome")])
+        outputs, _, _, _ = self.build(pages)
+        os.remove(outputs[0])
+        _, written, indexed, _ = self.build(pages)
+        self.assertEqual((written, indexed), ([outputs[0]], 1))
+
+if __name__ == "__main__":
+    unittest.main()
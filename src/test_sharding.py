@@ -0,0 +1,87 @@
+import os
+import unittest
+
+from fixtures import TemporaryDirectoryTestCase
+from sharding import *
+from site_builder import SiteBuilder
+
+class TestSharding(TemporaryDirectoryTestCase):
+    def read_file(self, name):
+        with(open(os.path.join(self.root, name), 'r') as test_file):
+            return test_file.read()
+
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard("2/4"), (2, 4))
+        for value in ["0/4", "5/4", "1/0", "one/two", "1"]:
+            self.assertRaises(ValueError, parse_shard, value)
+
+    def test_shards_are_balanced_by_size(self):
+        pages = []
+        for i, size in enumerate([900, 500, 400, 300, 100, 100]):
+            pages.append((self.write_file(f"content/page{i}.md", "x" * size), f"docs/page{i}.html"))
+        shards, shard_sizes = assign_shards(pages, 2)
+        self.assertEqual(shard_sizes, [1200, 1100])
+        self.assertEqual(sorted(shards[0] + shards[1]), sorted(pages))
+        self.assertEqual(select_shard_pages(pages, (1, 2)), shards[0])
+        self.assertEqual(select_shard_pages(list(reversed(pages)), (1, 2)), shards[0])
+        self.assertEqual(select_shard_pages(pages, None), pages)
+
+    def test_only_first_shard_copies_assets(self):
+        self.assertTrue(copies_assets(None))
+        self.assertTrue(copies_assets((1, 3)))
+        self.assertFalse(copies_assets((2, 3)))
+
+    def test_merge_shards(self):
+        self.write_file("shards/1-of-2/index.html", "home")
+        self.write_file("shards/1-of-2/index.css", "css")
+        self.write_file("shards/2-of-2/blog/index.html", "blog")
+        self.write_file("shards/2-of-2/index.css", "css")
+        self.write_file("docs/stale.html", "stale")
+        shard_directories = find_shard_directories(os.path.join(self.root, "shards"))
+        changed, removed = merge_shards(shard_directories, os.path.join(self.root, "docs"))
+        self.assertEqual(len(changed), 3)
+        self.assertEqual(removed, [os.path.join(self.root, "docs", "stale.html")])
+        self.assertEqual(self.read_file("docs/blog/index.html"), "blog")
+        self.assertEqual(merge_shards(shard_directories, os.path.join(self.root, "docs")), ([], []))
+
+    def test_merge_conflict(self):
+        self.write_file("shards/1-of-2/index.html", "home")
+        self.write_file("shards/2-of-2/index.html", "other home")
+        with self.assertRaisesRegex(ValueError, "index.html"):
+            merge_shards(find_shard_directories(os.path.join(self.root, "shards")), os.path.join(self.root, "docs"))
+        self.assertFalse(os.path.exists(os.path.join(self.root, "docs")))
+
+    def test_merge_needs_one_complete_shard_count(self):
+        self.write_file("shards/1-of-2/index.html", "home")
+        self.write_file("shards/1-of-3/index.html", "home")
+        self.write_file("shards/other/index.html", "other")
+        shards_directory = os.path.join(self.root, "shards")
+        self.assertRaisesRegex(ValueError, "different shard counts", find_shard_directories, shards_directory)
+        self.assertEqual(remove_other_shard_counts(2, shards_directory), [os.path.join(shards_directory, "1-of-3")])
+        self.assertRaisesRegex(ValueError, "2-of-2", find_shard_directories, shards_directory)
+        self.write_file("shards/2-of-2/index.html", "home")
+        self.assertEqual(find_shard_directories(shards_directory), [os.path.join(shards_directory, "1-of-2"), os.path.join(shards_directory, "2-of-2")])
+
+    def test_reshard_after_removing_a_page(self):
+        template_path = self.write_file("template.html", "<html><title>{{ Title }}</title><body>{{ Content }}</body></html>")
+        self.write_file("static/index.css", "body {}")
+        for name in ["index", "about", "blog", "contact"]:
+            self.write_file(f"content/{name}.md", f"# {name.title()}\n\nThe {name} page.")
+        shards_directory = os.path.join(self.root, "shards")
+        docs_directory = os.path.join(self.root, "docs")
+        def build_shards(count):
+            remove_other_shard_counts(count, shards_directory)
+            for index in range(1, count + 1):
+                output_directory = os.path.join(shards_directory, get_shard_name((index, count)))
+                SiteBuilder(os.path.join(self.root, "content"), template_path, os.path.join(self.root, "static"), output_directory,
+                    manifest_path=f"{output_directory}.manifest.json", changes_path=None, dependency_graph_path=None, shard=(index, count), cache_directory=None, quiet=True).build()
+            return merge_shards(find_shard_directories(shards_directory), docs_directory)
+        build_shards(3)
+        self.assertTrue(os.path.isfile(os.path.join(docs_directory, "contact.html")))
+        os.remove(os.path.join(self.root, "content", "contact.md"))
+        _, removed = build_shards(2)
+        self.assertEqual(removed, [os.path.join(docs_directory, "contact.html")])
+        self.assertEqual(sorted(os.listdir(shards_directory)), ["1-of-2", "1-of-2.manifest.json", "2-of-2", "2-of-2.manifest.json"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,300 @@
+import contextlib
+import io
+import json
+import os
+import struct
+import unittest
+
+from fixtures import TemporaryDirectoryTestCase
+from search_index import get_term_shard
+from site_builder import *
+
+TEMPLATE = "<html><title>{{ Title }}</title><body>{{ Content }}</body></html>"
+
+class TestGeneratePages(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.template_path = self.write_file("template.html", TEMPLATE)
+        for i in range(0, 6):
+            self.write_file(f"content/post{i}/index.md", f"# Post {i}\n\nSome **bold** text and a [link](/post{i}).")
+
+    def read_tree(self, directory):
+        contents = {}
+        for current_directory, _, file_names in os.walk(directory):
+            for file_name in file_names:
+                html_path = os.path.join(current_directory, file_name)
+                with(open(html_path, 'r') as html_file):
+                    contents[os.path.relpath(html_path, directory)] = html_file.read()
+        return contents
+
+    def test_parallel_matches_serial(self):
+        content_directory = os.path.join(self.root, "content")
+        serial_directory = os.path.join(self.root, "serial")
+        parallel_directory = os.path.join(self.root, "parallel")
+        generate_pages_recursive(content_directory, self.template_path, serial_directory, "/base/")
+        generate_pages_recursive(content_directory, self.template_path, parallel_directory, "/base/", jobs=3)
+        serial_tree = self.read_tree(serial_directory)
+        self.assertEqual(len(serial_tree), 6)
+        self.assertEqual(serial_tree, self.read_tree(parallel_directory))
+
+    def test_parallel_error_names_source(self):
+        bad_path = self.write_file("content/bad/index.md", "no title here\n")
+        with self.assertRaises(ValueError) as context:
+            generate_pages_recursive(os.path.join(self.root, "content"), self.template_path, os.path.join(self.root, "out"), "/", jobs=2)
+        self.assertIn(bad_path, str(context.exception))
+
+    def test_pipelined_matches_serial(self):
+        content_directory = os.path.join(self.root, "content")
+        serial_directory = os.path.join(self.root, "serial")
+        pipelined_directory = os.path.join(self.root, "pipelined")
+        generate_pages_recursive(content_directory, self.template_path, serial_directory, "/base/")
+        pipeline_options.update(io_threads=2, queue_size=1)
+        try:
+            changed = generate_pages_recursive(content_directory, self.template_path, pipelined_directory, "/base/")
+            self.assertEqual(generate_pages_recursive(content_directory, self.template_path, pipelined_directory, "/base/"), [])
+        finally:
+            pipeline_options.update(io_threads=0, queue_size=DEFAULT_QUEUE_SIZE)
+        self.assertEqual(len(changed), 6)
+        self.assertEqual(self.read_tree(serial_directory), self.read_tree(pipelined_directory))
+
+    def test_pipelined_error_names_source(self):
+        bad_path = self.write_file("content/bad/index.md", "no title here\n")
+        pipeline_options.update(io_threads=2)
+        try:
+            with self.assertRaises(ValueError) as context:
+                generate_pages_recursive(os.path.join(self.root, "content"), self.template_path, os.path.join(self.root, "out"), "/")
+        finally:
+            pipeline_options.update(io_threads=0)
+        self.assertIn(bad_path, str(context.exception))
+
+    def test_streamed_page_matches_loaded_page(self):
+        source_path = self.write_file("content/large.md", "# Large\n\n```\ncode\n\nmore\n```\n\n- a [link](/x)\n- b\n")
+        loaded_path = os.path.join(self.root, "loaded.html")
+        streamed_path = os.path.join(self.root, "streamed.html")
+        generate_page(source_path, self.template_path, loaded_path, "/base/")
+        set_streaming_threshold(1)
+        try:
+            generate_page(source_path, self.template_path, streamed_path, "/base/")
+        finally:
+            set_streaming_threshold(DEFAULT_STREAMING_THRESHOLD)
+        with(open(loaded_path, 'r') as loaded_file):
+            with(open(streamed_path, 'r') as streamed_file):
+                self.assertEqual(loaded_file.read(), streamed_file.read())
+
+    def test_front_matter_is_not_rendered(self):
+        source_path = self.write_file("content/post.md", "---\ntitle: Front Title\ndate: 2024-03-01\n---\n# Post\n\nText\n")
+        loaded_path = os.path.join(self.root, "loaded.html")
+        streamed_path = os.path.join(self.root, "streamed.html")
+        generate_page(source_path, self.template_path, loaded_path, "/")
+        set_streaming_threshold(1)
+        try:
+            generate_page(source_path, self.template_path, streamed_path, "/")
+        finally:
+            set_streaming_threshold(DEFAULT_STREAMING_THRESHOLD)
+        with(open(loaded_path, 'r') as loaded_file):
+            loaded_html = loaded_file.read()
+        with(open(streamed_path, 'r') as streamed_file):
+            self.assertEqual(streamed_file.read(), loaded_html)
+        self.assertEqual(loaded_html, "<html><title>Front Title</title><body><div><h1>Post</h1><p>Text</p></div></body></html>")
+
+class TestSiteBuilder(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write_file("template.html", TEMPLATE)
+        self.write_file("content/index.md", "# Home\n\nWelcome [home](/about)")
+        self.write_file("content/about/index.md", "# About\n\nAbout us")
+        self.write_file("static/index.css", "body { color: red; }")
+        self.builder = SiteBuilder(
+            os.path.join(self.root, "content"),
+            os.path.join(self.root, "template.html"),
+            os.path.join(self.root, "static"),
+            os.path.join(self.root, "docs"),
+            "/site/",
+            manifest_path=os.path.join(self.root, "manifest.json"),
+            changes_path=os.path.join(self.root, "changes.json"),
+            dependency_graph_path=os.path.join(self.root, "dependencies.json"),
+            cache_directory=None,
+            quiet=True,
+        )
+
+    def test_build_uses_explicit_paths(self):
+        changed, removed = self.builder.build()
+        docs_directory = os.path.join(self.root, "docs")
+        self.assertEqual(sorted(os.path.relpath(path, docs_directory) for path in changed), ["about/index.html", "index.css", "index.html"])
+        self.assertEqual(removed, [])
+        with(open(os.path.join(docs_directory, "index.html"), 'r') as html_file):
+            self.assertIn('href="/site/about"', html_file.read())
+        self.assertTrue(os.path.isfile(os.path.join(self.root, "manifest.json")))
+        self.assertTrue(os.path.isfile(os.path.join(self.root, "dependencies.json")))
+        self.assertEqual(self.builder.build(incremental=True), ([], []))
+
+    def test_render_markdown(self):
+        page_html = self.builder.render_markdown("# Hello\n\nSome **bold** [text](/x)")
+        self.assertEqual(page_html, '<html><title>Hello</title><body><div><h1>Hello</h1><p>Some <b>bold</b> <a href="/site/x">text</a></p></div></body></html>')
+
+    def test_build_pages_from_memory(self):
+        pages = {"index.html": "# One\n\nFirst", "posts/two.html": "# Two\n\nSecond"}
+        changed = self.builder.build_pages(pages)
+        self.assertEqual(len(changed), 2)
+        self.assertEqual(self.builder.build_pages(pages), [])
+        with(open(os.path.join(self.root, "docs", "posts", "two.html"), 'r') as html_file):
+            self.assertIn("<title>Two</title>", html_file.read())
+
+    def test_build_pages_error_names_page(self):
+        with self.assertRaisesRegex(ValueError, "posts/bad.html"):
+            self.builder.build_pages({"posts/bad.html": "no title"})
+
+    def test_image_dimensions_and_incremental_rebuild(self):
+        image_path = os.path.join(self.root, "static", "images", "a.png")
+        self.write_png(image_path, 800, 600)
+        self.write_file("content/about/index.md", "# About\n\n![A picture](/images/a.png)")
+        self.builder.build()
+        about_path = os.path.join(self.root, "docs", "about", "index.html")
+        with(open(about_path, 'r') as html_file):
+            self.assertIn('<img src="/site/images/a.png" alt="A picture" width="800" height="600" loading="lazy"></img>', html_file.read())
+        self.write_png(image_path, 400, 300)
+        changed, _ = self.builder.build(incremental=True)
+        docs_directory = os.path.join(self.root, "docs")
+        self.assertEqual(sorted(os.path.relpath(path, docs_directory) for path in changed), ["about/index.html", os.path.join("images", "a.png")])
+        with(open(about_path, 'r') as html_file):
+            self.assertIn('width="400" height="300"', html_file.read())
+
+    def test_images_disabled(self):
+        self.write_png(os.path.join(self.root, "static", "images", "a.png"), 800, 600)
+        self.write_file("content/about/index.md", "# About\n\n![A picture](/images/a.png)")
+        self.builder.options["images"] = False
+        self.builder.build()
+        with(open(os.path.join(self.root, "docs", "about", "index.html"), 'r') as html_file):
+            self.assertIn('<img src="/site/images/a.png" alt="A picture"></img>', html_file.read())
+
+    def test_minified_build_with_hashed_assets(self):
+        self.write_file("template.html", '<html>\n  <head><link href="/index.css" rel="stylesheet" /></head>\n  <body>\n    {{ Content }}\n  </body>\n</html>')
+        self.builder.options.update(minify=True, hash_assets=True)
+        self.builder.build()
+        docs_directory = os.path.join(self.root, "docs")
+        with(open(os.path.join(docs_directory, "asset-manifest.json"), 'r') as manifest_file):
+            hashed_css = json.load(manifest_file)["index.css"]
+        self.assertRegex(hashed_css, r"^index\.[0-9a-f]{8}\.css$")
+        self.assertFalse(os.path.exists(os.path.join(docs_directory, "index.css")))
+        with(open(os.path.join(docs_directory, hashed_css), 'r') as css_file):
+            self.assertEqual(css_file.read(), "body{color:red}")
+        with(open(os.path.join(docs_directory, "index.html"), 'r') as html_file):
+            self.assertEqual(html_file.read(), f'<html><head><link href="/site/{hashed_css}" rel="stylesheet" /></head><body><div><h1>Home</h1><p>Welcome <a href="/site/about">home</a></p></div></body></html>')
+        self.assertEqual(self.builder.build(incremental=True), ([], []))
+        self.builder.options.update(minify=False, hash_assets=False)
+        changed, removed = self.builder.build(incremental=True)
+        self.assertEqual(sorted(os.path.relpath(path, docs_directory) for path in removed), ["asset-manifest.json", hashed_css])
+        self.assertIn(os.path.join(docs_directory, "index.css"), changed)
+
+    def test_precompressed_outputs(self):
+        self.write_file("content/about/index.md", "# About\n\n" + "Tolkien wrote a great many things. " * 100)
+        self.builder.options.update(compress=True, compression_threshold=1024)
+        changed, _ = self.builder.build()
+        about_path = os.path.join(self.root, "docs", "about", "index.html")
+        self.assertIn(f"{about_path}.gz", changed)
+        self.assertFalse(os.path.exists(os.path.join(self.root, "docs", "index.html.gz")))
+        self.assertEqual(self.builder.build(), ([], []))
+        self.assertEqual(self.builder.build(incremental=True), ([], []))
+        self.builder.options["compress"] = False
+        _, removed = self.builder.build(incremental=True)
+        self.assertIn(f"{about_path}.gz", removed)
+
+    def test_search_index(self):
+        search_directory = os.path.join(self.root, "docs", "search")
+        self.builder.options.update(search_index=True, search_shards=4, search_state_path=os.path.join(self.root, "search.json"))
+        changed, _ = self.builder.build()
+        self.assertIn(os.path.join(search_directory, "index-3.json"), changed)
+        with(open(os.path.join(search_directory, "documents.json"), 'r') as documents_file):
+            self.assertEqual(json.load(documents_file), [{"title": "About", "url": "/about/"}, {"title": "Home", "url": "/"}])
+        self.assertEqual(self.builder.build(incremental=True), ([], []))
+        self.write_file("content/about/index.md", "# About\n\nAbout them")
+        changed, _ = self.builder.build(incremental=True)
+        self.assertIn(os.path.join(search_directory, f"index-{get_term_shard('them', 4)}.json"), changed)
+        self.builder.options["search_index"] = False
+        _, removed = self.builder.build(incremental=True)
+        self.assertIn(os.path.join(search_directory, "meta.json"), removed)
+        self.assertFalse(os.path.exists(search_directory))
+
+    def test_builders_keep_their_own_options_and_state(self):
+        content_directory, template_path, static_directory = (os.path.join(self.root, name) for name in ("content", "template.html", "static"))
+        first = SiteBuilder(content_directory, template_path, static_directory, os.path.join(self.root, "first"), changes_path=None,
+            minify=True, compress=True, compression_threshold=0, search_index=True, quiet=True)
+        second = SiteBuilder(content_directory, template_path, static_directory, os.path.join(self.root, "second"), changes_path=None, quiet=True)
+        self.assertEqual(first.manifest_path, os.path.join(self.root, SITE_STATE_DIRECTORY, "first", "manifest.json"))
+        self.assertEqual(second.options["search_state_path"], os.path.join(self.root, SITE_STATE_DIRECTORY, "second", "search.json"))
+        first.build()
+        self.assertEqual((optimization_options["minify"], compression_options["enabled"], search_options["enabled"]), (False, False, False))
+        second.build()
+        self.assertTrue(os.path.isfile(os.path.join(self.root, "first", "index.html.gz")))
+        self.assertFalse(os.path.exists(os.path.join(self.root, "second", "index.html.gz")))
+        self.assertFalse(os.path.exists(os.path.join(self.root, "second", "search")))
+        self.assertEqual(first.build(incremental=True), ([], []))
+        self.assertEqual(second.build(incremental=True), ([], []))
+
+    def test_shared_manifest_never_removes_other_outputs(self):
+        self.builder.build()
+        self.builder.output_directory = os.path.join(self.root, "other")
+        changed, removed = self.builder.build(incremental=True)
+        self.assertEqual(removed, [])
+        self.assertTrue(os.path.isfile(os.path.join(self.root, "docs", "index.css")))
+        self.assertTrue(os.path.isfile(os.path.join(self.root, "docs", "about", "index.html")))
+
+    def test_library_builds_do_not_write_a_change_list(self):
+        builder = SiteBuilder(os.path.join(self.root, "content"), os.path.join(self.root, "template.html"), os.path.join(self.root, "static"),
+            os.path.join(self.root, "docs"), quiet=True)
+        self.assertIsNone(builder.changes_path)
+
+    def test_search_index_needs_every_page(self):
+        self.assertRaises(ValueError, SiteBuilder, search_index=True, shard=(1, 2))
+        self.assertRaises(ValueError, SiteBuilder, listings=["blog"], shard=(1, 2))
+
+    def test_sitemap_feeds_and_listings(self):
+        self.write_file("content/blog/tom/index.md", "---\ndate: 2024-03-01\n---\n# Tom\n\nA merry fellow.")
+        self.write_file("content/blog/ents/index.md", "# Ents\n\nSlow talkers.")
+        self.builder.options.update(site_url="https://example.com/site/", sitemap=True, feeds=True, listings=["blog"], listing_page_size=1,
+            metadata_index_path=os.path.join(self.root, "metadata.json"))
+        docs_directory = os.path.join(self.root, "docs")
+        changed, _ = self.builder.build()
+        for name in ["sitemap.xml", "atom.xml", "rss.xml", "blog/index.html", "blog/page/2/index.html"]:
+            self.assertIn(os.path.join(docs_directory, name), changed)
+        with(open(os.path.join(docs_directory, "blog", "index.html"), 'r') as listing_file):
+            self.assertIn('<a href="/site/blog/tom/">Tom</a> (2024-03-01): A merry fellow.', listing_file.read())
+        with(open(os.path.join(docs_directory, "sitemap.xml"), 'r') as sitemap_file):
+            self.assertIn("<loc>https://example.com/site/blog/page/2/</loc>", sitemap_file.read())
+        self.assertEqual(self.builder.build(incremental=True), ([], []))
+        self.builder.options.update(sitemap=False, feeds=False, listings=[])
+        _, removed = self.builder.build(incremental=True)
+        self.assertIn(os.path.join(docs_directory, "blog", "page", "2", "index.html"), removed)
+        self.assertFalse(os.path.exists(os.path.join(docs_directory, "atom.xml")))
+
+    def test_links_to_generated_pages_are_not_broken(self):
+        self.write_file("content/blog/tom/index.md", "# Tom\n\n[Blog](/blog/) [Next](/blog/page/2/) [Feed](/atom.xml) [Missing](/nowhere)")
+        self.write_file("content/blog/ents/index.md", "# Ents\n\nSlow talkers.")
+        self.builder.options.update(feeds=True, site_url="https://example.com/", listings=["blog"], listing_page_size=1,
+            metadata_index_path=os.path.join(self.root, "metadata.json"))
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.builder.build()
+        self.assertEqual(output.getvalue(), "")
+        graph = load_dependency_graph(os.path.join(self.root, "dependencies.json"))
+        self.assertEqual(find_broken_links(graph), [(os.path.join(self.root, "content", "blog", "tom", "index.md"), "link", "/nowhere")])
+
+    def test_listing_cannot_replace_a_page(self):
+        self.write_file("content/blog/index.md", "# Blog\n\nHand written")
+        self.builder.options.update(listings=["blog"], metadata_index_path=os.path.join(self.root, "metadata.json"))
+        self.assertRaises(ValueError, self.builder.build)
+
+    def test_sitemap_needs_absolute_urls(self):
+        self.builder.options["sitemap"] = True
+        self.assertRaises(ValueError, self.builder.build)
+
+    def write_png(self, path, width, height):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with(open(path, 'wb') as image_file):
+            image_file.write(b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0) + b"\x00" * 16)
+
+    def test_unknown_option(self):
+        self.assertRaises(ValueError, SiteBuilder, jobs=1, colour="blue")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import io
+import os
+import tempfile
+import unittest
+
+from htmlnode import LeafNode, ParentNode
+from template import *
+
+class TestTemplate(unittest.TestCase):
+    def test_parse_template_segments(self):
+        segments = parse_template_segments("<title>{{ Title }}</title><p>{{Content}}</p>")
+        expected_segments = [
+            (False, "<title>"),
+            (True, "Title"),
+            (False, "</title><p>"),
+            (True, "Content"),
+            (False, "</p>"),
+        ]
+        self.assertEqual(segments, expected_segments)
+
+    def test_render_string(self):
+        template = Template("<h1>{{ Title }}</h1>{{ Content }}<footer>{{ Author }}</footer>")
+        content_node = ParentNode(tag="div", children=[LeafNode(tag="b", value="body")])
+        variables = {"Title": "Hello", "Content": content_node, "Author": "Tolkien"}
+        self.assertEqual(template.render_string(variables), "<h1>Hello</h1><div><b>body</b></div><footer>Tolkien</footer>")
+
+    def test_unknown_variable_is_kept(self):
+        template = Template("<p>{{ Missing }}</p>")
+        self.assertEqual(template.render_string({}), "<p>{{ Missing }}</p>")
+
+    def test_base_path_applies_to_template_and_content(self):
+        template = Template('<link href="/index.css" />{{ Content }}')
+        content_node = ParentNode(tag="p", children=[
+            LeafNode(tag="a", value="home", props={"href": "/home"}),
+            LeafNode(tag="img", value="", props={"src": "/tom.png", "alt": "tom"}),
+        ])
+        expected_html = '<link href="/site/index.css" /><p><a href="/site/home">home</a><img src="/site/tom.png" alt="tom"></img></p>'
+        self.assertEqual(template.render_string({"Content": content_node}, "/site/"), expected_html)
+        self.assertEqual(template.render_string({"Content": content_node}), expected_html.replace("/site/", "/"))
+
+    def test_base_path_applies_to_srcset(self):
+        html_string = '<img src="/a.png" srcset="/a-480w.webp 480w, https://cdn.example.com/a.webp 800w">'
+        expected_html = '<img src="/site/a.png" srcset="/site/a-480w.webp 480w, https://cdn.example.com/a.webp 800w">'
+        self.assertEqual(apply_base_path(html_string, "/site/"), expected_html)
+
+    def test_asset_urls_are_rewritten_with_base_path(self):
+        template = Template('<link href="/index.css" />{{ Content }}')
+        content_node = LeafNode(tag="img", value="", props={"src": "/a.png", "srcset": "/a-480w.webp 480w, /a.png 800w"})
+        set_asset_urls({"/index.css": "/index.3f9a1c2b.css", "/a.png": "/a.1234abcd.png"})
+        try:
+            page_html = template.render_string({"Content": content_node}, "/site/")
+            root_html = template.render_string({"Content": content_node})
+        finally:
+            set_asset_urls({})
+        self.assertEqual(page_html, '<link href="/site/index.3f9a1c2b.css" /><img src="/site/a.1234abcd.png" srcset="/site/a-480w.webp 480w, /site/a.1234abcd.png 800w"></img>')
+        self.assertEqual(root_html, page_html.replace("/site/", "/"))
+        self.assertEqual(template.render_string({"Content": content_node}), '<link href="/index.css" /><img src="/a.png" srcset="/a-480w.webp 480w, /a.png 800w"></img>')
+
+    def test_content_rendered_twice(self):
+        template = Template("{{ Content }}|{{ Content }}")
+        content_node = ParentNode(tag="p", children=[LeafNode(value="x")])
+        html_file = io.StringIO()
+        template.render(html_file, {"Content": content_node})
+        self.assertEqual(html_file.getvalue(), "<p>x</p>|<p>x</p>")
+
+    def test_load_template_is_cached(self):
+        with tempfile.TemporaryDirectory() as directory:
+            template_path = os.path.join(directory, "template.html")
+            with(open(template_path, 'w') as template_file):
+                template_file.write("<p>{{ Title }}</p>")
+            first = load_template(template_path)
+            self.assertIs(load_template(template_path), first)
+            with(open(template_path, 'w') as template_file):
+                template_file.write("<h1>{{ Title }}</h1>!")
+            self.assertEqual(load_template(template_path).render_string({"Title": "x"}), "<h1>x</h1>!")
+            clear_template_cache()
+
+if __name__ == "__main__":
+    unittest.main()
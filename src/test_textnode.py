@@ -1,6 +1,7 @@
+import pickle
 import unittest
 
-from textnode import TextNode, TextType
+from textnode import TextNode, TextType, set_image_attributes
 
 
 class TestTextNode(unittest.TestCase):
@@ -24,6 +25,16 @@ class TestTextNode(unittest.TestCase):
         node2 = TextNode("This is a link", TextType.TEXT)
         self.assertNotEqual(node, node2)
 
+    def test_slots(self):
+        node = TextNode("This is a link", TextType.LINK, "url")
+        self.assertFalse(hasattr(node, "__dict__"))
+        with self.assertRaises(AttributeError):
+            node.extra = "value"
+
+    def test_pickle_round_trip(self):
+        node = TextNode("This is a link", TextType.LINK, "url")
+        self.assertEqual(pickle.loads(pickle.dumps(node)), node)
+
     def test_text_type(self):
         node = TextNode("This is a simple text node", TextType.TEXT)
         html_node = TextNode.textnode_to_html_node(node).to_html()
@@ -60,6 +71,28 @@ class TestTextNode(unittest.TestCase):
         expected_node = '<img src="pic.png" alt="image description"></img>'
         self.assertEqual(html_node, expected_node)
 
+    def test_image_attributes(self):
+        node = TextNode("image description", TextType.IMAGE, "/pic.png")
+        set_image_attributes({"/pic.png": {"width": "800", "height": "600"}})
+        try:
+            html_node = TextNode.textnode_to_html_node(node).to_html()
+            other_html_node = TextNode.textnode_to_html_node(TextNode("other", TextType.IMAGE, "/other.png")).to_html()
+        finally:
+            set_image_attributes(None)
+        self.assertEqual(html_node, '<img src="/pic.png" alt="image description" width="800" height="600" loading="lazy"></img>')
+        self.assertEqual(other_html_node, '<img src="/other.png" alt="other" loading="lazy"></img>')
+
+    def test_converted_variants_keep_a_fallback(self):
+        node = TextNode("image description", TextType.IMAGE, "/pic.png")
+        set_image_attributes({"/pic.png": {"width": "800", "height": "600", "srcset": "/pic-480w.webp 480w, /pic.webp 800w",
+            "sizes": "800px", "type": "image/webp"}})
+        try:
+            html_node = TextNode.textnode_to_html_node(node).to_html()
+        finally:
+            set_image_attributes(None)
+        self.assertEqual(html_node, '<picture><source type="image/webp" srcset="/pic-480w.webp 480w, /pic.webp 800w" sizes="800px"></source>'
+            '<img src="/pic.png" alt="image description" width="800" height="600" loading="lazy"></img></picture>')
+
     def test_invalid_type(self):
         with self.assertRaises(ValueError):
             node = TextNode("invalid node", "INVALID")
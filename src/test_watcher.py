@@ -0,0 +1,46 @@
+import os
+import unittest
+
+from fixtures import TemporaryDirectoryTestCase
+from watcher import *
+
+class TestWatcher(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content_directory = os.path.join(self.root, "content")
+        os.makedirs(os.path.join(self.content_directory, "blog"))
+        self.page_path = self.write_file("content/blog/index.md", "# Blog\n")
+        self.template_path = self.write_file("template.html", "{{ Content }}")
+
+    def check_watcher(self, watcher):
+        try:
+            self.assertEqual(watcher.wait_for_changes(timeout=0.3), set())
+            self.write_file("content/blog/index.md", "# Blog\n\nUpdated and longer.\n")
+            self.assertIn(os.path.normpath(self.page_path), watcher.wait_for_changes(timeout=2))
+            new_page_path = self.write_file("content/new/index.md", "# New\n")
+            changed_paths = watcher.wait_for_changes(timeout=2)
+            while os.path.normpath(new_page_path) not in changed_paths:
+                more_paths = watcher.wait_for_changes(timeout=2)
+                self.assertTrue(more_paths)
+                changed_paths.update(more_paths)
+            self.write_file("template.html", "<main>{{ Content }}</main>")
+            self.assertIn(os.path.normpath(self.template_path), watcher.wait_for_changes(timeout=2))
+        finally:
+            watcher.close()
+
+    def test_polling_watcher(self):
+        self.check_watcher(PollingWatcher([self.content_directory], [self.template_path], interval=0.05))
+
+    def test_inotify_watcher(self):
+        try:
+            watcher = InotifyWatcher([self.content_directory], [self.template_path])
+        except OSError:
+            self.skipTest("inotify is not available")
+        self.check_watcher(watcher)
+
+    def test_create_watcher_polling(self):
+        watcher = create_watcher([self.content_directory], [self.template_path], polling=True)
+        self.assertIsInstance(watcher, PollingWatcher)
+
+if __name__ == "__main__":
+    unittest.main()
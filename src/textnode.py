@@ -1,5 +1,5 @@
 from enum import Enum
-from htmlnode import LeafNode
+from htmlnode import LeafNode, ParentNode
 
 class TextType(Enum):
     TEXT = "text"
@@ -9,7 +9,17 @@ class TextType(Enum):
     LINK = "link"
     IMAGE = "image"
 
+image_attributes = None
+
+def set_image_attributes(attributes):
+    global image_attributes
+    image_attributes = attributes
+
+def get_image_attributes():
+    return image_attributes
+
 class TextNode():
+    __slots__ = ("text", "text_type", "url")
 
     def __init__(self, text, text_type, url=None):
         self.text = text
@@ -38,6 +48,16 @@ class TextNode():
                 return LeafNode(tag="a", value=text_node.text, props=link_prop)
             case TextType.IMAGE:
                 image_props = {"src": text_node.url, "alt": text_node.text}
-                return LeafNode(tag="img", value="", props=image_props)
+                if image_attributes is None:
+                    return LeafNode(tag="img", value="", props=image_props)
+                attributes = dict(image_attributes.get(text_node.url, ()))
+                source_type = attributes.pop("type", None)
+                source_props = {"type": source_type, "srcset": attributes.pop("srcset", None), "sizes": attributes.pop("sizes", None)}
+                image_props.update(attributes)
+                image_props["loading"] = "lazy"
+                image_node = LeafNode(tag="img", value="", props=image_props)
+                if source_type is None:
+                    return image_node
+                return ParentNode(tag="picture", children=[LeafNode(tag="source", value="", props=source_props), image_node])
             case _:
                 raise ValueError(f"Failed to convert a textnode of type {text_node.text_type} to html")
\ No newline at end of file
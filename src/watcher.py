@@ -0,0 +1,156 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+EVENT_HEADER = struct.Struct("iIII")
+DEBOUNCE_SECONDS = 0.05
+
+class InotifyWatcher:
+    def __init__(self, directories, files):
+        self.libc = load_libc()
+        self.file_descriptor = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.file_descriptor < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watched_paths = {}
+        self.watched_files = set(os.path.normpath(path) for path in files)
+        self.recursive_directories = set()
+        for directory in directories:
+            self.add_recursive_watch(directory)
+        for parent_directory in set(os.path.dirname(path) or "." for path in self.watched_files):
+            self.add_watch(parent_directory)
+
+    def add_watch(self, directory):
+        watch_descriptor = self.libc.inotify_add_watch(self.file_descriptor, os.fsencode(directory), WATCH_MASK)
+        if watch_descriptor < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self.watched_paths[watch_descriptor] = directory
+
+    def add_recursive_watch(self, directory):
+        directory = os.path.normpath(directory)
+        self.recursive_directories.add(directory)
+        for current_directory, _, _ in os.walk(directory):
+            self.add_watch(current_directory)
+
+    def is_relevant(self, path):
+        if os.path.normpath(path) in self.watched_files:
+            return True
+        for directory in self.recursive_directories:
+            if path == directory or path.startswith(f"{directory}{os.sep}"):
+                return True
+        return False
+
+    def read_events(self, timeout):
+        readable, _, _ = select.select([self.file_descriptor], [], [], timeout)
+        if not readable:
+            return set()
+        try:
+            buffer = os.read(self.file_descriptor, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        changed_paths = set()
+        offset = 0
+        while offset < len(buffer):
+            watch_descriptor, mask, _, name_length = EVENT_HEADER.unpack_from(buffer, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(buffer[offset:offset + name_length].rstrip(b"\0"))
+            offset += name_length
+            if mask & IN_Q_OVERFLOW:
+                changed_paths.update(self.recursive_directories)
+                continue
+            directory = self.watched_paths.get(watch_descriptor)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                del self.watched_paths[watch_descriptor]
+                continue
+            path = os.path.join(directory, name) if name else directory
+            if not self.is_relevant(path):
+                continue
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                for current_directory, _, file_names in os.walk(path):
+                    self.add_watch(current_directory)
+                    changed_paths.update(os.path.normpath(os.path.join(current_directory, file_name)) for file_name in file_names)
+            changed_paths.add(os.path.normpath(path))
+        return changed_paths
+
+    def wait_for_changes(self, timeout=None):
+        changed_paths = self.read_events(timeout)
+        while changed_paths:
+            more_paths = self.read_events(DEBOUNCE_SECONDS)
+            if not more_paths:
+                break
+            changed_paths.update(more_paths)
+        return changed_paths
+
+    def close(self):
+        os.close(self.file_descriptor)
+
+class PollingWatcher:
+    def __init__(self, directories, files, interval=0.25):
+        self.directories = list(directories)
+        self.files = list(files)
+        self.interval = interval
+        self.snapshot = self.take_snapshot()
+
+    def take_snapshot(self):
+        snapshot = {}
+        for directory in self.directories:
+            for current_directory, _, file_names in os.walk(directory):
+                for file_name in file_names:
+                    add_to_snapshot(snapshot, os.path.normpath(os.path.join(current_directory, file_name)))
+        for path in self.files:
+            add_to_snapshot(snapshot, os.path.normpath(path))
+        return snapshot
+
+    def wait_for_changes(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            time.sleep(self.interval)
+            snapshot = self.take_snapshot()
+            changed_paths = set(snapshot.keys() ^ self.snapshot.keys())
+            for path in snapshot.keys() & self.snapshot.keys():
+                if snapshot[path] != self.snapshot[path]:
+                    changed_paths.add(path)
+            self.snapshot = snapshot
+            if changed_paths or (deadline is not None and time.monotonic() >= deadline):
+                return changed_paths
+
+    def close(self):
+        pass
+
+def add_to_snapshot(snapshot, path):
+    try:
+        path_stat = os.stat(path)
+    except FileNotFoundError:
+        return
+    snapshot[path] = (path_stat.st_mtime_ns, path_stat.st_size)
+
+def load_libc():
+    libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    if not hasattr(libc, "inotify_init1"):
+        raise OSError("inotify is not available on this platform")
+    return libc
+
+def create_watcher(directories, files, polling=False):
+    if not polling:
+        try:
+            return InotifyWatcher(directories, files)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(directories, files)